@@ -4,10 +4,13 @@ from unittest import TestCase
 import xml.etree.ElementTree as ET
 
 from netCDF4 import Dataset
+import numpy as np
 
 from varinfo.attribute_container import (
     AttributeContainerFromDmr,
     AttributeContainerFromNetCDF4,
+    AttributeContainerFromZarr,
+    LazyAttributeDict,
 )
 from varinfo.cf_config import CFConfig
 
@@ -88,6 +91,130 @@ class TestAttributeContainerFromDmr(TestCase):
             expected_attributes,
         )
 
+    def test_instantiation_mixed_attribute_types(self):
+        """Ensure attributes with multiple values, nested containers, repeated
+        names and metadata overrides are all correctly extracted from a
+        single pass through the Attribute elements of the container.
+
+        """
+        dmr_variable = ET.fromstring(
+            f'<{self.namespace}Float64 name="variable">'
+            f'  <{self.namespace}Attribute name="group_override" type="String">'
+            f'    <{self.namespace}Value>granule value</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="flag_values" type="Int32">'
+            f'    <{self.namespace}Value>1</{self.namespace}Value>'
+            f'    <{self.namespace}Value>2</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="nested" type="Container">'
+            f'    <{self.namespace}Attribute name="valid_min" type="Float32">'
+            f'      <{self.namespace}Value>-90</{self.namespace}Value>'
+            f'    </{self.namespace}Attribute>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="units" type="String">'
+            f'    <{self.namespace}Value>m</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="units" type="String">'
+            f'    <{self.namespace}Value>km</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'</{self.namespace}Float64>'
+        )
+
+        container = AttributeContainerFromDmr(
+            dmr_variable,
+            self.fakesat_config,
+            self.namespace,
+            self.variable_path,
+        )
+
+        self.assertDictEqual(
+            container.attributes,
+            {
+                'collection_override': 'collection value',
+                'flag_values': [1, 2],
+                'group_override': 'group value',
+                'nested': {'valid_min': -90.0},
+                'units': 'm',
+                'variable_override': 'variable value',
+            },
+        )
+
+    def test_lazy_attributes(self):
+        """Ensure attribute values are only decoded from their Attribute
+        elements when first requested, except for CF-Convention attributes
+        referring to other variables and any values overridden by `CFConfig`.
+        Retrieving all values, comparing or copying the attributes should
+        behave as a standard dictionary of decoded values.
+
+        """
+        dmr_variable = ET.fromstring(
+            f'<{self.namespace}Float64 name="variable">'
+            f'  <{self.namespace}Attribute name="units" type="String">'
+            f'    <{self.namespace}Value>m</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="flag_values" type="Int32">'
+            f'    <{self.namespace}Value>1</{self.namespace}Value>'
+            f'    <{self.namespace}Value>2</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="coordinates" type="String">'
+            f'    <{self.namespace}Value>lat lon</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'  <{self.namespace}Attribute name="group_override" type="String">'
+            f'    <{self.namespace}Value>granule value</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+            f'</{self.namespace}Float64>'
+        )
+        expected_attributes = {
+            'collection_override': 'collection value',
+            'coordinates': 'lat lon',
+            'flag_values': [1, 2],
+            'group_override': 'group value',
+            'units': 'm',
+            'variable_override': 'variable value',
+        }
+
+        with self.subTest('Attributes are decoded on first access'):
+            container = AttributeContainerFromDmr(
+                dmr_variable, self.fakesat_config, self.namespace, self.variable_path
+            )
+
+            self.assertIsInstance(container.attributes, LazyAttributeDict)
+            self.assertFalse(container.attributes.is_decoded('units'))
+            self.assertFalse(container.attributes.is_decoded('flag_values'))
+            self.assertTrue(container.attributes.is_decoded('coordinates'))
+            self.assertTrue(container.attributes.is_decoded('group_override'))
+
+            self.assertEqual(container.get_attribute_value('units'), 'm')
+            self.assertTrue(container.attributes.is_decoded('units'))
+            self.assertFalse(container.attributes.is_decoded('flag_values'))
+
+        with self.subTest('Lazy attributes behave as a dictionary'):
+            container = AttributeContainerFromDmr(
+                dmr_variable, self.fakesat_config, self.namespace, self.variable_path
+            )
+
+            self.assertDictEqual(dict(container.attributes), expected_attributes)
+            self.assertEqual(container.attributes, expected_attributes)
+            self.assertDictEqual(container.attributes.copy(), expected_attributes)
+            self.assertDictEqual(
+                dict(zip(container.attributes.keys(), container.attributes.values())),
+                expected_attributes,
+            )
+            self.assertEqual(container.attributes.pop('flag_values'), [1, 2])
+            self.assertNotIn('flag_values', container.attributes)
+
+        with self.subTest('Attributes can be decoded eagerly'):
+
+            class EagerContainer(AttributeContainerFromDmr):
+                lazy_attributes = False
+
+            container = EagerContainer(
+                dmr_variable, self.fakesat_config, self.namespace, self.variable_path
+            )
+
+            self.assertNotIsInstance(container.attributes, LazyAttributeDict)
+            self.assertDictEqual(container.attributes, expected_attributes)
+
     def test_get_attribute_value(self):
         """Ensure attribute values can be correctly retrieved."""
         container = AttributeContainerFromDmr(
@@ -238,3 +365,121 @@ class TestAttributeContainerFromNetCDF4(TestCase):
                 container.get_attribute_value('collection_override'),
                 'collection value',
             )
+
+    def test_get_attributes_single_read(self):
+        """Ensure all attributes of a NetCDF-4 container are retrieved in a
+        single read of the container `__dict__`, with any overrides from the
+        `CFConfig` instance applied to the retrieved values.
+
+        """
+
+        class CountingContainer:
+            """A stand-in for a NetCDF-4 group that records each time the
+            full set of attributes is read.
+
+            """
+
+            def __init__(self):
+                self.attribute_reads = 0
+
+            @property
+            def __dict__(self):
+                self.attribute_reads += 1
+                return {
+                    'collection_override': 'file value',
+                    'description': 'A science variable for testing',
+                }
+
+            def ncattrs(self):
+                return ['collection_override', 'description']
+
+        container = CountingContainer()
+
+        attribute_container = AttributeContainerFromNetCDF4(
+            container, self.fakesat_config, self.namespace, '/group/science2'
+        )
+
+        self.assertEqual(container.attribute_reads, 1)
+        self.assertDictEqual(
+            attribute_container.attributes,
+            {
+                'collection_override': 'collection value',
+                'description': 'A science variable for testing',
+                'group_override': 'group value',
+            },
+        )
+
+
+class TestAttributeContainerFromZarr(TestCase):
+    """Tests to ensure the `AttributeContainerFromZarr` class instantiates
+    correctly. This is the superclass for `GroupFromZarr` and
+    `VariableFromZarr`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up properties of the class that do not need to reset between
+        tests.
+
+        """
+        cls.config_file = 'tests/unit/data/test_config.json'
+        cls.fakesat_config = CFConfig('FakeSat', 'FAKE99', config_file=cls.config_file)
+        cls.namespace = 'namespace string'
+
+    def test_instantiation_for_variable(self):
+        """Ensure an `AttributeContainerFromZarr` can be created from an array
+        in the consolidated metadata of a Zarr store. The "_ARRAY_DIMENSIONS"
+        attribute should be omitted, and the fill value from the `.zarray`
+        should be used for "_FillValue", unless that attribute is also in the
+        `.zattrs`.
+
+        """
+        zarr_array = {
+            'zarray': {'dtype': '<f4', 'fill_value': 'NaN', 'shape': [2]},
+            'attributes': {
+                '_ARRAY_DIMENSIONS': ['lat'],
+                'collection_override': 'file value',
+                'units': 'metres',
+            },
+        }
+
+        with self.subTest('Fill value from .zarray'):
+            container = AttributeContainerFromZarr(
+                zarr_array, self.fakesat_config, self.namespace, '/group/science2'
+            )
+
+            self.assertEqual(container.full_name_path, '/group/science2')
+            self.assertSetEqual(
+                set(container.attributes.keys()),
+                {'_FillValue', 'collection_override', 'group_override', 'units'},
+            )
+            self.assertIsInstance(container.attributes['_FillValue'], np.float32)
+            self.assertTrue(np.isnan(container.attributes['_FillValue']))
+            self.assertEqual(
+                container.get_attribute_value('collection_override'),
+                'collection value',
+            )
+            self.assertEqual(container.get_attribute_value('units'), 'metres')
+
+        with self.subTest('_FillValue in .zattrs takes precedence'):
+            zarr_array['attributes']['_FillValue'] = -9999.0
+            container = AttributeContainerFromZarr(
+                zarr_array, self.fakesat_config, self.namespace, '/group/science2'
+            )
+
+            self.assertEqual(container.attributes['_FillValue'], -9999.0)
+
+    def test_instantiation_for_group(self):
+        """Ensure an `AttributeContainerFromZarr` can be created from a group
+        without a `.zarray`, or any attributes.
+
+        """
+        container = AttributeContainerFromZarr(
+            {'variables': []}, self.fakesat_config, self.namespace, '/group'
+        )
+
+        self.assertDictEqual(
+            container.attributes,
+            {'collection_override': 'collection value'},
+        )
@@ -0,0 +1,309 @@
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from functools import partial
+from os.path import getsize
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import patch
+import re
+
+import requests
+
+from varinfo import VarInfoFromNetCDF4
+from varinfo.byte_range import ByteRangeCache, RemoteNetCDF4
+from varinfo.exceptions import ByteRangeRequestException
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """A handler for a local HTTP server that serves files from the test data
+    directory, supporting single HTTP byte-range requests. The headers of
+    each request are recorded.
+
+    """
+
+    requests_received = []
+
+    def send_head(self):
+        """Respond to a byte-range request with partial content."""
+        self.requests_received.append(dict(self.headers))
+        requested_range = re.match(
+            r'^bytes=(\d+)-(\d+)$', self.headers.get('Range', '')
+        )
+
+        if requested_range is None:
+            return super().send_head()
+
+        file_path = self.translate_path(self.path)
+        file_size = getsize(file_path)
+        start = int(requested_range.group(1))
+        end = min(int(requested_range.group(2)), file_size - 1)
+
+        self.send_response(206)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{file_size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+
+        file_handler = open(file_path, 'rb')  # pylint: disable=consider-using-with
+        file_handler.seek(start)
+        self.wfile.write(file_handler.read(end - start + 1))
+        file_handler.close()
+
+        return None
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress the logging of each request to stderr."""
+
+
+class NoRangeRequestHandler(RangeRequestHandler):
+    """A handler that ignores the Range header, returning the whole file."""
+
+    def send_head(self):
+        """Respond with the whole file."""
+        return SimpleHTTPRequestHandler.send_head(self)
+
+
+class TestByteRange(TestCase):
+    """Tests for reading a remote NetCDF-4 file with HTTP byte-range requests,
+    using a local HTTP server that serves the test data directory.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local HTTP servers, with and without byte-range support."""
+        cls.netcdf4_basename = 'f16_ssmis_20210426v7.nc'
+        cls.netcdf4_path = f'tests/unit/data/{cls.netcdf4_basename}'
+        cls.netcdf4_size = getsize(cls.netcdf4_path)
+        cls.servers = []
+
+        for handler in (RangeRequestHandler, NoRangeRequestHandler):
+            server = ThreadingHTTPServer(
+                ('127.0.0.1', 0), partial(handler, directory='tests/unit/data')
+            )
+            Thread(target=server.serve_forever, daemon=True).start()
+            cls.servers.append(server)
+
+        cls.netcdf4_url = (
+            f'http://127.0.0.1:{cls.servers[0].server_address[1]}/'
+            f'{cls.netcdf4_basename}'
+        )
+        cls.no_range_url = (
+            f'http://127.0.0.1:{cls.servers[1].server_address[1]}/'
+            f'{cls.netcdf4_basename}'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local HTTP servers."""
+        for server in cls.servers:
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        """Reset the requests recorded by the local HTTP servers."""
+        RangeRequestHandler.requests_received.clear()
+
+    def test_byte_range_cache_read(self):
+        """Ensure ranges spanning one or more blocks are retrieved correctly,
+        that only missing blocks are requested, and that the least-recently
+        used block is discarded when the cache is full.
+
+        """
+        with open(self.netcdf4_path, 'rb') as file_handler:
+            expected_content = file_handler.read()
+
+        cache = ByteRangeCache(self.netcdf4_url, block_size=1024, max_blocks=2)
+
+        with self.subTest('Range within a single block'):
+            self.assertEqual(cache.read(10, 20), expected_content[10:21])
+            self.assertEqual(cache.request_count, 1)
+            self.assertEqual(cache.bytes_transferred, 1024)
+            self.assertEqual(cache.content_length, self.netcdf4_size)
+
+        with self.subTest('Repeated read uses the cache'):
+            self.assertEqual(cache.read(0, 1023), expected_content[:1024])
+            self.assertEqual(cache.request_count, 1)
+
+        with self.subTest('Range spanning blocks only requests missing blocks'):
+            self.assertEqual(cache.read(1000, 1100), expected_content[1000:1101])
+            self.assertEqual(cache.request_count, 2)
+            self.assertListEqual(list(cache.blocks.keys()), [0, 1])
+
+        with self.subTest('Least-recently used block is discarded'):
+            self.assertEqual(cache.read(2048, 2050), expected_content[2048:2051])
+            self.assertListEqual(list(cache.blocks.keys()), [1, 2])
+
+        with self.subTest('Range beyond the end of the file is truncated'):
+            self.assertEqual(
+                cache.read(self.netcdf4_size - 5, self.netcdf4_size + 100),
+                expected_content[-5:],
+            )
+
+    def test_byte_range_cache_auth_header(self):
+        """Ensure the Authorization header is included in each request."""
+        cache = ByteRangeCache(self.netcdf4_url, auth_header='Bearer token')
+        cache.read(0, 10)
+
+        self.assertEqual(len(RangeRequestHandler.requests_received), 1)
+        self.assertEqual(
+            RangeRequestHandler.requests_received[0]['Authorization'], 'Bearer token'
+        )
+
+    def test_byte_range_cache_exceptions(self):
+        """Ensure an exception is raised if the remote file cannot be
+        retrieved, or the server does not support byte-range requests.
+
+        """
+        with self.subTest('Missing file'):
+            with self.assertRaises(ByteRangeRequestException):
+                ByteRangeCache(f'{self.netcdf4_url}.missing').read(0, 10)
+
+        with self.subTest('Byte-range requests not supported'):
+            with self.assertRaises(ByteRangeRequestException):
+                ByteRangeCache(self.no_range_url).read(0, 10)
+
+    def test_remote_netcdf4(self):
+        """Ensure a remote NetCDF-4 file can be parsed by `VarInfoFromNetCDF4`
+        with the same results as the local file, while only transferring a
+        fraction of the file.
+
+        """
+        expected = VarInfoFromNetCDF4(self.netcdf4_path)
+
+        with RemoteNetCDF4(
+            self.netcdf4_url, auth_header='Bearer token', block_size=2**14
+        ) as remote_granule:
+            var_info = VarInfoFromNetCDF4(remote_granule.dataset)
+            self.assertTrue(remote_granule.dataset.isopen())
+
+        self.assertIsNone(remote_granule.dataset)
+        self.assertIsNone(remote_granule.server)
+        self.assertSetEqual(
+            set(var_info.variables.keys()), set(expected.variables.keys())
+        )
+        self.assertDictEqual(
+            var_info.all_dimensions_sizes, expected.all_dimensions_sizes
+        )
+        self.assertEqual(
+            var_info.get_variable('/rainfall_rate').get_attribute_value('long_name'),
+            expected.get_variable('/rainfall_rate').get_attribute_value('long_name'),
+        )
+        self.assertEqual(remote_granule.content_length, self.netcdf4_size)
+        self.assertLess(remote_granule.bytes_transferred, self.netcdf4_size / 10)
+        self.assertEqual(
+            remote_granule.request_count, len(RangeRequestHandler.requests_received)
+        )
+        self.assertTrue(
+            all(
+                request['Authorization'] == 'Bearer token'
+                for request in RangeRequestHandler.requests_received
+            )
+        )
+
+    def test_remote_netcdf4_exception(self):
+        """Ensure the exception from retrieving the remote file is raised,
+        rather than the generic error from the netCDF-C library, and that the
+        local server is stopped.
+
+        """
+        remote_granule = RemoteNetCDF4(self.no_range_url)
+
+        with self.assertRaises(ByteRangeRequestException):
+            with remote_granule:
+                pass
+
+        self.assertIsNone(remote_granule.server)
+
+    def test_remote_netcdf4_local_server(self):
+        """Ensure the local server only responds to byte-range requests for
+        the path containing its token, and refuses ranges that cannot be
+        satisfied, without requesting the remote file.
+
+        """
+        with RemoteNetCDF4(self.netcdf4_url, auth_header='Bearer token') as remote:
+            server_url = f'http://127.0.0.1:{remote.server.server_address[1]}'
+            served_url = f'{server_url}{remote.server.served_path}'
+            request_count = remote.request_count
+
+            self.assertRegex(
+                remote.server.served_path, f'^/[\\w-]{{32,}}/{self.netcdf4_basename}$'
+            )
+
+            with self.subTest('Other paths are not found'):
+                for path in [f'/{self.netcdf4_basename}', '/', '/token/file.nc']:
+                    response = requests.get(
+                        f'{server_url}{path}', headers={'Range': 'bytes=0-9'}, timeout=5
+                    )
+                    self.assertEqual(response.status_code, 404)
+
+                self.assertEqual(requests.head(server_url, timeout=5).status_code, 404)
+
+            with self.subTest('Requests without a byte-range are refused'):
+                response = requests.get(served_url, timeout=5)
+                self.assertEqual(response.status_code, 400)
+                self.assertLess(len(response.content), 1024)
+
+            with self.subTest('Unsatisfiable ranges'):
+                for requested_range in [
+                    f'bytes={self.netcdf4_size}-',
+                    f'bytes={self.netcdf4_size + 10}-{self.netcdf4_size + 20}',
+                    'bytes=10-9',
+                ]:
+                    response = requests.get(
+                        served_url, headers={'Range': requested_range}, timeout=5
+                    )
+                    self.assertEqual(response.status_code, 416)
+                    self.assertEqual(
+                        response.headers['Content-Range'],
+                        f'bytes */{self.netcdf4_size}',
+                    )
+                    self.assertEqual(response.content, b'')
+
+            with self.subTest('Valid range'):
+                response = requests.get(
+                    served_url, headers={'Range': 'bytes=0-9'}, timeout=5
+                )
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(
+                    response.headers['Content-Range'], f'bytes 0-9/{self.netcdf4_size}'
+                )
+
+                with open(self.netcdf4_path, 'rb') as file_handler:
+                    self.assertEqual(response.content, file_handler.read(10))
+
+            self.assertEqual(remote.request_count, request_count)
+
+    @patch('varinfo.byte_range.Dataset')
+    def test_remote_netcdf4_local_server_exceptions(self, _):
+        """Ensure failures retrieving the remote file are reported with a
+        502 status, or 504 for a timeout, and that only the first exception
+        is retained by the local server, rather than one per failed request.
+
+        """
+        remote_exceptions = []
+
+        for cause in [requests.Timeout('timed out'), requests.HTTPError('403')]:
+            try:
+                raise ByteRangeRequestException(str(cause)) from cause
+            except ByteRangeRequestException as exception:
+                remote_exceptions.append(exception)
+
+        with RemoteNetCDF4(self.netcdf4_url) as remote_granule:
+            served_url = (
+                f'http://127.0.0.1:{remote_granule.server.server_address[1]}'
+                f'{remote_granule.server.served_path}'
+            )
+
+            with patch.object(
+                remote_granule.cache,
+                'get_content_length',
+                side_effect=remote_exceptions * 2,
+            ):
+                status_codes = [
+                    requests.get(
+                        served_url, headers={'Range': 'bytes=0-9'}, timeout=5
+                    ).status_code
+                    for _ in range(4)
+                ]
+
+            self.assertListEqual(status_codes, [504, 502, 504, 502])
+            self.assertIs(remote_granule.server.exception, remote_exceptions[0])
@@ -1,6 +1,18 @@
+from os import utime
+from os.path import join as join_path
+from shutil import copy, rmtree
+from tempfile import mkdtemp
 from unittest import TestCase
+from unittest.mock import patch
+import json
 
 from varinfo import CFConfig
+from varinfo.cf_config import (
+    ConfigRegistry,
+    get_applicability_patterns,
+    is_applicable,
+    partition_rules,
+)
 from varinfo.exceptions import (
     InvalidConfigFileFormatError,
     MissingConfigurationFileError,
@@ -178,3 +190,286 @@ class TestCFConfig(TestCase):
                     'test_string_length_same_depth': 'applies to /string_length/variable',
                 },
             )
+
+    def test_get_metadata_overrides_index(self):
+        """Ensure the variable patterns are compiled and sorted once, when the
+        configuration file is read, and that the combined overrides for each
+        path are only calculated once. Each request should return a separate
+        copy of the overrides. With enough patterns, only those with a literal
+        prefix matching the path are evaluated.
+
+        """
+        config = CFConfig(self.mission, self.short_name, self.test_config)
+
+        with self.subTest('Patterns are sorted by depth, then length'):
+            self.assertListEqual(
+                [pattern.pattern for pattern, _ in config.override_index],
+                [
+                    '.*',
+                    '/$',
+                    '/absent_variable',
+                    '/group/.*',
+                    '/group/variable',
+                    '/coordinates_group/.*',
+                ],
+            )
+
+        with self.subTest('Few patterns are evaluated without a trie'):
+            self.assertIsNone(config.override_trie)
+            self.assertDictEqual(
+                config.get_metadata_overrides('/group/variable'),
+                {
+                    'collection_override': 'collection value',
+                    'group_override': 'group value',
+                    'variable_override': 'variable value',
+                },
+            )
+
+        with patch('varinfo.cf_config.MINIMUM_TRIE_PATTERNS', 0):
+            config = CFConfig(self.mission, self.short_name, self.test_config)
+
+        with self.subTest('Overrides are only calculated once for each path'):
+            with patch.object(
+                config.override_trie,
+                'get_values',
+                wraps=config.override_trie.get_values,
+            ) as mock_get_values:
+                first_overrides = config.get_metadata_overrides('/group/variable')
+                second_overrides = config.get_metadata_overrides('/group/variable')
+
+            mock_get_values.assert_called_once_with('/group/variable')
+            self.assertDictEqual(
+                first_overrides,
+                {
+                    'collection_override': 'collection value',
+                    'group_override': 'group value',
+                    'variable_override': 'variable value',
+                },
+            )
+            self.assertDictEqual(first_overrides, second_overrides)
+            self.assertIsNot(first_overrides, second_overrides)
+
+        with self.subTest('Least recently requested paths are discarded'):
+            with patch('varinfo.cf_config.PATH_OVERRIDES_CACHE_SIZE', 2):
+                config.get_metadata_overrides('/group/other_variable')
+                config.get_metadata_overrides('/group/variable')
+                config.get_metadata_overrides('/coordinates_group/latitude')
+
+            self.assertListEqual(
+                list(config.path_overrides),
+                ['/group/variable', '/coordinates_group/latitude'],
+            )
+            self.assertDictEqual(
+                config.get_metadata_overrides('/group/other_variable'),
+                {
+                    'collection_override': 'collection value',
+                    'group_override': 'group value',
+                },
+            )
+
+        with self.subTest('Only patterns with a matching prefix are evaluated'):
+            self.assertListEqual(
+                sorted(config.override_trie.get_values('/group/variable')),
+                [0, 1, 3, 4],
+            )
+            self.assertListEqual(
+                sorted(config.override_trie.get_values('/other_group/variable')),
+                [0, 1],
+            )
+
+        with self.subTest('No mission has no index'):
+            config = CFConfig(None, self.short_name, self.test_config)
+            self.assertListEqual(config.override_index, [])
+            self.assertDictEqual(config.get_metadata_overrides('/group/variable'), {})
+
+    def test_config_registry(self):
+        """Ensure a `ConfigRegistry` only parses a configuration file once,
+        until that file is modified, and returns the same `CFConfig`
+        instance for each request for the same mission and short name.
+
+        """
+        output_dir = mkdtemp()
+        self.addCleanup(rmtree, output_dir)
+        config_file = join_path(output_dir, 'config.json')
+        copy(self.test_config, config_file)
+        registry = ConfigRegistry()
+
+        with self.subTest('The file is parsed once for all requests'):
+            with patch('varinfo.cf_config.json.load', wraps=json.load) as mock_load:
+                config = registry.get_config(config_file)
+                cf_config = registry.get_cf_config(
+                    self.mission, self.short_name, config_file
+                )
+                other_cf_config = registry.get_cf_config(
+                    'ICESat2', 'ATL03', config_file
+                )
+
+                self.assertIs(registry.get_config(config_file), config)
+                self.assertIs(
+                    registry.get_cf_config(self.mission, self.short_name, config_file),
+                    cf_config,
+                )
+
+            mock_load.assert_called_once()
+            self.assertIsNot(cf_config, other_cf_config)
+            self.assertDictEqual(
+                cf_config.metadata_overrides, self.expected_metadata_overrides
+            )
+            self.assertSetEqual(
+                cf_config.excluded_science_variables,
+                self.expected_excluded_science_variables,
+            )
+
+        with self.subTest('One MissionResolver is created for each file'):
+            mission_resolver = registry.get_mission_resolver(config_file)
+
+            self.assertIs(registry.get_mission_resolver(config_file), mission_resolver)
+            self.assertEqual(mission_resolver.resolve(self.short_name), self.mission)
+            self.assertEqual(mission_resolver.resolve('ATL03'), 'ICESat2')
+            self.assertIsNone(mission_resolver.resolve(None))
+            self.assertIsNone(registry.get_mission_resolver(None).resolve('ATL03'))
+
+        with self.subTest('Configuration and MissionResolver share one entry'):
+            registered_config = registry.get_registered_config(config_file)
+
+            self.assertIs(registered_config.config, registry.get_config(config_file))
+            self.assertIs(registered_config.mission_resolver, mission_resolver)
+            self.assertDictEqual(registry.get_registered_config(None).config, {})
+            self.assertIsNone(
+                registry.get_registered_config(None).mission_resolver.resolve('ATL03')
+            )
+
+        with self.subTest('A modified file is parsed again'):
+            config['CollectionShortNamePath'] = ['/updated_short_name']
+
+            with open(config_file, 'w', encoding='utf-8') as file_handler:
+                json.dump(config, file_handler)
+
+            utime(config_file, ns=(0, 0))
+
+            updated_config = registry.get_config(config_file)
+            self.assertIsNot(updated_config, config)
+            self.assertListEqual(
+                updated_config['CollectionShortNamePath'], ['/updated_short_name']
+            )
+            self.assertIsNot(
+                registry.get_cf_config(self.mission, self.short_name, config_file),
+                cf_config,
+            )
+            self.assertIsNot(
+                registry.get_mission_resolver(config_file), mission_resolver
+            )
+
+        with self.subTest('Least recently requested entries are discarded'):
+            other_config_file = join_path(output_dir, 'other_config.json')
+            copy(self.test_config, other_config_file)
+            limited_registry = ConfigRegistry(max_configs=1, max_cf_configs=1)
+
+            cf_config = limited_registry.get_cf_config(
+                self.mission, self.short_name, config_file
+            )
+            limited_registry.get_cf_config('ICESat2', 'ATL03', config_file)
+
+            self.assertListEqual(
+                list(limited_registry.registered_configs[config_file].cf_configs),
+                [('ICESat2', 'ATL03')],
+            )
+            self.assertIsNot(
+                limited_registry.get_cf_config(
+                    self.mission, self.short_name, config_file
+                ),
+                cf_config,
+            )
+
+            config = limited_registry.get_config(config_file)
+            limited_registry.get_config(other_config_file)
+
+            self.assertListEqual(
+                list(limited_registry.registered_configs), [other_config_file]
+            )
+            self.assertIsNot(limited_registry.get_config(config_file), config)
+
+        with self.subTest('All entries are discarded by clear'):
+            registry.get_config(config_file)
+            registry.clear()
+            self.assertDictEqual(registry.registered_configs, {})
+
+        with self.subTest('No configuration file returns a new instance'):
+            no_file_config = registry.get_cf_config(self.mission, self.short_name, None)
+            self.assertDictEqual(no_file_config.metadata_overrides, {})
+            self.assertIsNot(
+                registry.get_cf_config(self.mission, self.short_name, None),
+                no_file_config,
+            )
+
+        with self.subTest('Missing configuration file'):
+            with self.assertRaises(MissingConfigurationFileError):
+                registry.get_config('bad_file_path.json')
+
+        with self.subTest('Invalid configuration file format'):
+            with self.assertRaises(InvalidConfigFileFormatError):
+                registry.get_config('tests/unit/data/ATL03_example.dmr')
+
+    def test_partition_rules(self):
+        """Ensure the rules of a configuration file are grouped by the Mission
+        and ShortNamePath of their Applicability, retaining the position of
+        each rule within its section.
+
+        """
+        excluded_rule = {
+            'Applicability': {'Mission': 'FakeSat', 'ShortNamePath': 'FAKE99'},
+            'VariablePattern': ['/exclude/.*'],
+        }
+        mission_override = {
+            'Applicability': {'Mission': 'FakeSat'},
+            'Attributes': [{'Name': 'units', 'Value': 'm'}],
+        }
+        collection_override = {
+            'Applicability': {
+                'Mission': 'FakeSat',
+                'ShortNamePath': 'FAKE99',
+                'VariablePattern': '/variable',
+            },
+            'Attributes': [{'Name': 'units', 'Value': 'km'}],
+        }
+        no_mission_override = {
+            'Applicability': {'ShortNamePath': ''},
+            'Attributes': [{'Name': 'units', 'Value': 'cm'}],
+        }
+
+        self.assertDictEqual(
+            partition_rules(
+                {
+                    'ExcludedScienceVariables': [excluded_rule],
+                    'MetadataOverrides': [
+                        mission_override,
+                        collection_override,
+                        no_mission_override,
+                    ],
+                }
+            ),
+            {
+                ('FakeSat', 'FAKE99'): {
+                    'ExcludedScienceVariables': [(0, excluded_rule)],
+                    'MetadataOverrides': [(1, collection_override)],
+                },
+                ('FakeSat', None): {'MetadataOverrides': [(0, mission_override)]},
+                (None, None): {'MetadataOverrides': [(2, no_mission_override)]},
+            },
+        )
+
+    def test_is_applicable(self):
+        """Ensure the Mission and optional ShortNamePath of an Applicability
+        are matched against a mission and short name, with each pair of
+        patterns compiled once.
+
+        """
+        self.assertTrue(is_applicable('FakeSat', None, 'FakeSat', 'FAKE99'))
+        self.assertTrue(is_applicable('Fake.*', 'FAKE\\d{2}', 'FakeSat', 'FAKE99'))
+        self.assertFalse(is_applicable('FakeSat', 'FAKE98', 'FakeSat', 'FAKE99'))
+        self.assertFalse(is_applicable('ICESat2', None, 'FakeSat', 'FAKE99'))
+
+        self.assertIs(
+            get_applicability_patterns('FakeSat', 'FAKE99'),
+            get_applicability_patterns('FakeSat', 'FAKE99'),
+        )
@@ -1,5 +1,6 @@
 from shutil import rmtree
 from tempfile import mkdtemp
+from os import listdir
 from os.path import exists
 from unittest import TestCase
 from unittest.mock import patch, Mock
@@ -12,6 +13,7 @@ from varinfo.cmr_search import (
     get_granules,
     get_granule_link,
     download_granule,
+    get_granule_content,
     get_edl_token_from_launchpad,
     get_edl_token_header,
     urs_token_endpoints,
@@ -444,7 +446,70 @@ class TestQuery(TestCase):
         link = 'https://foo.gov/example.nc4'
         mock_requests_get.return_value.side_effect = HTTPError('Wrong HTTP')
         with self.assertRaises(GranuleDownloadException):
-            download_granule(link, auth_header=self.bearer_token_header)
+            download_granule(
+                link,
+                auth_header=self.bearer_token_header,
+                out_directory=self.output_dir,
+            )
+
+    @patch('requests.get')
+    def test_get_granule_content(self, mock_requests_get):
+        """Check if `get_granule_content` returns the content of the mocked
+        response.
+
+        """
+        link = 'https://foo.gov/example.nc4'
+        mock_content = b'Fake NetCDF-4 content'
+        mock_requests_get.return_value = self._mock_requests(content=mock_content)
+
+        granule_content = get_granule_content(
+            link, auth_header=self.bearer_token_header
+        )
+
+        mock_requests_get.assert_called_once_with(
+            link, headers={'Authorization': self.bearer_token_header}, timeout=10
+        )
+        self.assertEqual(granule_content, mock_content)
+
+    @patch('requests.get')
+    def test_get_granule_content_requests_error(self, mock_requests_get):
+        """Check if the GranuleDownloadException is raised when `requests.get`
+        raises an exception.
+
+        """
+        mock_requests_get.side_effect = Timeout('Request timed out')
+
+        with self.assertRaises(GranuleDownloadException):
+            get_granule_content(
+                'https://foo.gov/example.nc4', auth_header=self.bearer_token_header
+            )
+
+    @patch('requests.get')
+    def test_granule_http_error_status(self, mock_requests_get):
+        """Check if the GranuleDownloadException is raised when the response
+        has an HTTP error status, instead of returning the body of that
+        response as the granule content, and that no file is written.
+
+        """
+        mock_response = self._mock_requests(status=403, content=b'<html>Forbidden')
+        mock_response.raise_for_status.side_effect = HTTPError('403 Forbidden')
+        mock_requests_get.return_value = mock_response
+
+        with self.subTest('get_granule_content'):
+            with self.assertRaises(GranuleDownloadException):
+                get_granule_content(
+                    'https://foo.gov/example.nc4', auth_header=self.bearer_token_header
+                )
+
+        with self.subTest('download_granule'):
+            with self.assertRaises(GranuleDownloadException):
+                download_granule(
+                    'https://foo.gov/example.nc4',
+                    auth_header=self.bearer_token_header,
+                    out_directory=self.output_dir,
+                )
+
+            self.assertListEqual(listdir(self.output_dir), [])
 
     @patch('requests.post')
     def test_get_edl_token_from_launchpad(self, mock_requests_post):
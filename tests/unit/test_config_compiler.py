@@ -0,0 +1,223 @@
+from os.path import join as join_path
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+import json
+
+from varinfo import CFConfig, VarInfoFromDmr
+from varinfo.cf_config import ConfigRegistry
+from varinfo.config_compiler import (
+    compile_config,
+    find_shadowed_rules,
+    find_unreachable_rules,
+    write_compiled_config,
+)
+from varinfo.exceptions import InvalidCompiledConfigError
+
+
+class TestConfigCompiler(TestCase):
+    """Tests for the functions compiling a configuration file for a single
+    collection, and reporting unreachable or shadowed rules.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up properties of the class that do not need to be reset between
+        tests.
+
+        """
+        cls.test_config = 'tests/unit/data/test_config.json'
+        cls.sample_config = 'config/1.0.0/sample_config_1.0.0.json'
+        cls.mission = 'FakeSat'
+        cls.short_name = 'FAKE99'
+
+    def setUp(self):
+        self.output_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.output_dir)
+
+    def test_compile_config(self):
+        """Ensure only the rules applicable to the collection are retained,
+        with the MetadataOverrides in the order of `CFConfig.override_index`,
+        along with the sections needed to identify a collection.
+
+        """
+        compiled_config = compile_config(self.test_config, self.short_name)
+
+        with open(self.test_config, 'r', encoding='utf-8') as file_handler:
+            source_config = json.load(file_handler)
+
+        self.assertListEqual(
+            compiled_config['CollectionShortNamePath'],
+            source_config['CollectionShortNamePath'],
+        )
+        self.assertDictEqual(compiled_config['Mission'], source_config['Mission'])
+
+        self.assertDictEqual(
+            compiled_config['CompiledConfig'],
+            {
+                'Version': 1,
+                'Source': compiled_config['CompiledConfig']['Source'],
+                'SourceVersion': source_config['Version'],
+                'Mission': 'FakeSat',
+                'ShortName': 'FAKE99',
+                'ExcludedScienceVariables': [
+                    '/exclude_one/.*',
+                    '/exclude_three/.*',
+                    '/exclude_two/.*',
+                ],
+                'RequiredVariables': ['/required_group/.*'],
+                'MetadataOverrides': [
+                    ['.*', {'collection_override': 'collection value'}],
+                    ['/$', {'global_override': 'GLOBAL'}],
+                    ['/absent_variable', {'extra_override': 'overriding value'}],
+                    ['/group/.*', {'group_override': 'group value'}],
+                    ['/group/variable', {'variable_override': 'variable value'}],
+                    ['/coordinates_group/.*', {'coordinates': 'lat, lon'}],
+                ],
+                'Report': [
+                    'MetadataOverrides[7] is unreachable: Mission "FakeSat2" '
+                    'does not match any mission in the Mission section.'
+                ],
+            },
+        )
+
+        with self.subTest('Mission can be specified'):
+            self.assertIn(
+                ['/group3/.*', {'other_mission': 'sea_surface_temperature'}],
+                compile_config(self.test_config, 'FAKE99', 'FakeSat2')[
+                    'CompiledConfig'
+                ]['MetadataOverrides'],
+            )
+
+    def test_compiled_config_file(self):
+        """Ensure a saved compiled configuration file gives the same rules as
+        the source configuration file, for both `CFConfig` and a VarInfo
+        class, and that it can only be used for the compiled collection.
+
+        """
+        compiled_config_file = join_path(self.output_dir, 'compiled.json')
+        write_compiled_config(
+            compile_config(self.sample_config, 'ATL03'), compiled_config_file
+        )
+
+        with self.subTest('CFConfig rules match the source file'):
+            source_cf_config = CFConfig('ICESat2', 'ATL03', self.sample_config)
+            compiled_cf_config = CFConfig(
+                'ICESat2', 'ATL03', compiled_config_file, ConfigRegistry()
+            )
+
+            self.assertDictEqual(
+                compiled_cf_config.metadata_overrides,
+                source_cf_config.metadata_overrides,
+            )
+            self.assertListEqual(
+                [pattern for pattern, _ in compiled_cf_config.override_index],
+                [pattern for pattern, _ in source_cf_config.override_index],
+            )
+            self.assertSetEqual(
+                compiled_cf_config.excluded_science_variables,
+                source_cf_config.excluded_science_variables,
+            )
+            self.assertSetEqual(
+                compiled_cf_config.required_variables,
+                source_cf_config.required_variables,
+            )
+
+        with self.subTest('VarInfo instance matches the source file'):
+            source_var_info = VarInfoFromDmr(
+                'tests/unit/data/ATL03_example.dmr', config_file=self.sample_config
+            )
+            compiled_var_info = VarInfoFromDmr(
+                'tests/unit/data/ATL03_example.dmr',
+                config_file=compiled_config_file,
+            )
+
+            self.assertEqual(compiled_var_info.mission, 'ICESat2')
+            self.assertSetEqual(
+                compiled_var_info.get_science_variables(),
+                source_var_info.get_science_variables(),
+            )
+            self.assertDictEqual(
+                compiled_var_info.get_variable(
+                    '/gt1r/geolocation/ph_index_beg'
+                ).attributes.copy(),
+                source_var_info.get_variable(
+                    '/gt1r/geolocation/ph_index_beg'
+                ).attributes.copy(),
+            )
+
+        with self.subTest('A different collection raises an exception'):
+            with self.assertRaises(InvalidCompiledConfigError):
+                CFConfig('ICESat2', 'ATL08', compiled_config_file)
+
+        with self.subTest('An unsupported version raises an exception'):
+            compiled_config = compile_config(self.sample_config, 'ATL03')
+            compiled_config['CompiledConfig']['Version'] = 0
+            write_compiled_config(compiled_config, compiled_config_file)
+
+            with self.assertRaises(InvalidCompiledConfigError):
+                CFConfig('ICESat2', 'ATL03', compiled_config_file, ConfigRegistry())
+
+    def test_find_unreachable_rules(self):
+        """Ensure rules without a Mission, or with a Mission not in the
+        Mission section, are reported, along with literal Mission entries
+        matched by an earlier entry.
+
+        """
+        config = {
+            'Mission': {'ATL\\d{2}': 'ICESat2', 'ATL03': 'ICESat2', 'SPL.+': 'SMAP'},
+            'ExcludedScienceVariables': [
+                {'Applicability': {'Mission': 'ICESat2'}, 'VariablePattern': []},
+                {'Applicability': {'Mission': 'GEDI'}, 'VariablePattern': []},
+            ],
+            'MetadataOverrides': [
+                {'Applicability': {'Mission': 'SM.*'}},
+                {'Applicability': {'ShortNamePath': 'ATL03'}},
+            ],
+        }
+
+        self.assertListEqual(
+            find_unreachable_rules(config),
+            [
+                'ExcludedScienceVariables[1] is unreachable: Mission "GEDI" does '
+                'not match any mission in the Mission section.',
+                'MetadataOverrides[1] is unreachable: it has no Mission.',
+                'Mission entry "ATL03" is unreachable: it is matched by the '
+                'earlier entry "ATL\\d{2}".',
+            ],
+        )
+
+        with self.subTest('No Mission section'):
+            config.pop('Mission')
+            self.assertListEqual(
+                find_unreachable_rules(config),
+                ['MetadataOverrides[1] is unreachable: it has no Mission.'],
+            )
+
+    def test_find_shadowed_rules(self):
+        """Ensure an applicable MetadataOverrides rule is reported if a later
+        applicable rule has the same VariablePattern.
+
+        """
+        config = {
+            'MetadataOverrides': [
+                {'Applicability': {'Mission': 'ICESat2'}},
+                {'Applicability': {'Mission': 'ICESat2', 'VariablePattern': '/a'}},
+                {'Applicability': {'Mission': 'ICESat2', 'ShortNamePath': 'ATL08'}},
+                {'Applicability': {'Mission': 'ICESat2', 'ShortNamePath': 'ATL03'}},
+                {'Applicability': {'Mission': 'ICESat2', 'VariablePattern': '/b'}},
+            ]
+        }
+
+        self.assertListEqual(
+            find_shadowed_rules(config, 'ICESat2', 'ATL03'),
+            [
+                'MetadataOverrides[0] is shadowed: MetadataOverrides[3] has the '
+                'same VariablePattern ".*".'
+            ],
+        )
+        self.assertListEqual(find_shadowed_rules(config, 'ICESat2', 'ATL06'), [])
+        self.assertListEqual(find_shadowed_rules(config, None, 'ATL03'), [])
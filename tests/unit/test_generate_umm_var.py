@@ -1,7 +1,8 @@
-from shutil import copy
 from unittest import TestCase
 from unittest.mock import ANY, patch
 
+from netCDF4 import Dataset
+
 from varinfo.generate_umm_var import generate_collection_umm_var, is_variable_concept_id
 
 
@@ -42,34 +43,36 @@ class TestGenerateUmmVar(TestCase):
         ]
 
     @staticmethod
-    def download_granule_side_effect(granule_link, auth_header, out_directory):
-        """A helper method that will copy the test file to the temporary
-        directory being used for a specific test.
+    def get_granule_content_side_effect(granule_link, auth_header):
+        """A helper method that will return the content of the test file,
+        simulating the retrieval of a granule into memory.
 
         Static methods do not have access to class attributes, so the test
         file path is defined in this method as well as setUpClass.
 
         """
         netcdf4_file_path = 'tests/unit/data/f16_ssmis_20210426v7.nc'
-        return copy(netcdf4_file_path, out_directory)
+
+        with open(netcdf4_file_path, 'rb') as file_handler:
+            return file_handler.read()
 
     @patch('varinfo.umm_var.publish_umm_var')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_generate_collection_umm_var_no_publication(
-        self, mock_download_granule, mock_granule_query, mock_publish_umm_var
+        self, mock_get_granule_content, mock_granule_query, mock_publish_umm_var
     ):
         """A request with all the necessary information should succeed.
         This test is moderately end-to-end, but mocks the full
-        download_granule function for simplicity. That function is tested
+        get_granule_content function for simplicity. That function is tested
         in detail in test_cmr_search.py.
 
         """
         mock_granule_query.return_value.get.return_value = self.query_granule_return
 
-        # Add side effect that will copy test file to the temporary directory,
+        # Add side effect that will return the content of the test file,
         # simulating a download.
-        mock_download_granule.side_effect = self.download_granule_side_effect
+        mock_get_granule_content.side_effect = self.get_granule_content_side_effect
 
         # Run the test:
         generated_umm_var = generate_collection_umm_var(
@@ -84,8 +87,8 @@ class TestGenerateUmmVar(TestCase):
         )
 
         # Ensure the call to download the granule had correct parameters
-        mock_download_granule.assert_called_once_with(
-            self.netcdf4_url, self.bearer_token_header, out_directory=ANY
+        mock_get_granule_content.assert_called_once_with(
+            self.netcdf4_url, self.bearer_token_header
         )
 
         # Ensure the output looks as expected - full record comparison is
@@ -101,9 +104,46 @@ class TestGenerateUmmVar(TestCase):
 
     @patch('varinfo.umm_var.publish_umm_var')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
+    @patch('varinfo.generate_umm_var.RemoteNetCDF4')
+    def test_generate_collection_umm_var_remote(
+        self,
+        mock_remote_netcdf4,
+        mock_get_granule_content,
+        mock_granule_query,
+        mock_publish_umm_var,
+    ):
+        """A request for a remote granule should open the granule with
+        `RemoteNetCDF4`, reading only the metadata using HTTP byte-range
+        requests, and should not retrieve the whole granule. The
+        `RemoteNetCDF4` context manager is mocked to open the local test
+        file. That class is tested in detail in test_byte_range.py.
+
+        """
+        mock_granule_query.return_value.get.return_value = self.query_granule_return
+
+        with Dataset('tests/unit/data/f16_ssmis_20210426v7.nc') as dataset:
+            mock_remote_netcdf4.return_value.__enter__.return_value.dataset = dataset
+
+            generated_umm_var = generate_collection_umm_var(
+                self.collection_concept_id, self.bearer_token_header, remote=True
+            )
+
+        mock_remote_netcdf4.assert_called_once_with(
+            self.netcdf4_url, self.bearer_token_header
+        )
+        mock_remote_netcdf4.return_value.__exit__.assert_called_once()
+        mock_get_granule_content.assert_not_called()
+
+        actual_variables = set([record['Name'] for record in generated_umm_var])
+        self.assertSetEqual(actual_variables, set(self.rssmif16d_variables))
+        mock_publish_umm_var.assert_not_called()
+
+    @patch('varinfo.umm_var.publish_umm_var')
+    @patch('varinfo.cmr_search.GranuleQuery')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_generate_collection_umm_var_with_publication(
-        self, mock_download_granule, mock_granule_query, mock_publish_umm_var
+        self, mock_get_granule_content, mock_granule_query, mock_publish_umm_var
     ):
         """A request with all the necessary information should succeed."""
         expected_concept_ids = [
@@ -118,9 +158,9 @@ class TestGenerateUmmVar(TestCase):
         ]
         mock_granule_query.return_value.get.return_value = self.query_granule_return
 
-        # Add side effect that will copy test file to the temporary directory,
+        # Add side effect that will return the content of the test file,
         # simulating a download.
-        mock_download_granule.side_effect = self.download_granule_side_effect
+        mock_get_granule_content.side_effect = self.get_granule_content_side_effect
 
         mock_publish_umm_var.side_effect = expected_concept_ids
 
@@ -137,8 +177,8 @@ class TestGenerateUmmVar(TestCase):
         )
 
         # Ensure the call to download the granule had correct parameters
-        mock_download_granule.assert_called_once_with(
-            self.netcdf4_url, self.bearer_token_header, out_directory=ANY
+        mock_get_granule_content.assert_called_once_with(
+            self.netcdf4_url, self.bearer_token_header
         )
 
         # Ensure the output looks as expected
@@ -146,9 +186,9 @@ class TestGenerateUmmVar(TestCase):
 
     @patch('varinfo.umm_var.publish_umm_var')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_error_from_search_is_raised(
-        self, mock_download_granule, mock_granule_query, mock_publish_umm_var
+        self, mock_get_granule_content, mock_granule_query, mock_publish_umm_var
     ):
         """Ensure an error raised during search is propagated out to the
         user.
@@ -176,16 +216,16 @@ class TestGenerateUmmVar(TestCase):
         )
 
         # Ensure no attempt was made to download the granule after failure:
-        mock_download_granule.assert_not_called()
+        mock_get_granule_content.assert_not_called()
 
         # Ensure no attempt was made to publish UMM-Var after the failure:
         mock_publish_umm_var.assert_not_called()
 
     @patch('varinfo.umm_var.publish_umm_var')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_publishing_errors(
-        self, mock_download_granule, mock_granule_query, mock_publish_umm_var
+        self, mock_get_granule_content, mock_granule_query, mock_publish_umm_var
     ):
         """Show the output list from publication will correctly handle a
         response with an error.
@@ -208,9 +248,9 @@ class TestGenerateUmmVar(TestCase):
 
         mock_granule_query.return_value.get.return_value = self.query_granule_return
 
-        # Add side effect that will copy test file to the temporary directory,
+        # Add side effect that will return the content of the test file,
         # simulating a download.
-        mock_download_granule.side_effect = self.download_granule_side_effect
+        mock_get_granule_content.side_effect = self.get_granule_content_side_effect
 
         mock_publish_umm_var.side_effect = concept_ids_and_error
 
@@ -227,8 +267,8 @@ class TestGenerateUmmVar(TestCase):
         )
 
         # Ensure the call to download the granule had correct parameters
-        mock_download_granule.assert_called_once_with(
-            self.netcdf4_url, self.bearer_token_header, out_directory=ANY
+        mock_get_granule_content.assert_called_once_with(
+            self.netcdf4_url, self.bearer_token_header
         )
 
         # Ensure the output looks as expected
@@ -280,9 +320,9 @@ class TestGenerateUmmVar(TestCase):
 
     @patch('varinfo.generate_umm_var.VarInfoFromNetCDF4')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_generate_collection_umm_var_config_file(
-        self, mock_download_granule, mock_granule_query, mock_varinfo_from_netcdf4
+        self, mock_get_granule_content, mock_granule_query, mock_varinfo_from_netcdf4
     ):
         """This test just verifies the config file that is passed in to the
         generate_collection_umm_var method is picked up by VarInfoFromNetCDF4 that
@@ -291,9 +331,9 @@ class TestGenerateUmmVar(TestCase):
         """
         mock_granule_query.return_value.get.return_value = self.query_granule_return
 
-        # Add side effect that will copy test file to the temporary directory,
+        # Add side effect that will return the content of the test file,
         # simulating a download.
-        mock_download_granule.side_effect = self.download_granule_side_effect
+        mock_get_granule_content.side_effect = self.get_granule_content_side_effect
 
         # Run the test:
         generate_collection_umm_var(
@@ -310,9 +350,9 @@ class TestGenerateUmmVar(TestCase):
 
     @patch('varinfo.generate_umm_var.VarInfoFromNetCDF4')
     @patch('varinfo.cmr_search.GranuleQuery')
-    @patch('varinfo.generate_umm_var.download_granule')
+    @patch('varinfo.generate_umm_var.get_granule_content')
     def test_generate_collection_umm_var_with_no_config_file(
-        self, mock_download_granule, mock_granule_query, mock_varinfo_from_netcdf4
+        self, mock_get_granule_content, mock_granule_query, mock_varinfo_from_netcdf4
     ):
         """This test just verifies if the config file is 'None' in the
         generate_collection_umm_var method, the VarInfoFromNetCDF4 would still succeed
@@ -321,9 +361,9 @@ class TestGenerateUmmVar(TestCase):
         """
         mock_granule_query.return_value.get.return_value = self.query_granule_return
 
-        # Add side effect that will copy test file to the temporary directory,
+        # Add side effect that will return the content of the test file,
         # simulating a download.
-        mock_download_granule.side_effect = self.download_granule_side_effect
+        mock_get_granule_content.side_effect = self.get_granule_content_side_effect
 
         # Run the test:
         generate_collection_umm_var(
@@ -6,7 +6,7 @@ import xml.etree.ElementTree as ET
 from netCDF4 import Dataset
 
 from varinfo.cf_config import CFConfig
-from varinfo.group import GroupFromDmr, GroupFromNetCDF4
+from varinfo.group import GroupFromDmr, GroupFromNetCDF4, GroupFromZarr
 
 from tests.utilities import netcdf4_global_attributes, write_skeleton_netcdf4
 
@@ -69,6 +69,27 @@ class TestGroupFromDmr(TestCase):
             {'/science_group/variable_one', '/science_group/variable_two'},
         )
 
+    def test_group_instantiation_with_child_variables(self):
+        """Ensure that, if the child variables of a group have already been
+        identified, these are used instead of re-parsing the group element.
+
+        """
+        child_variables = {'/science_group/variable_one'}
+
+        group = GroupFromDmr(
+            self.dmr_group,
+            self.fakesat_config,
+            self.namespace,
+            self.group_path,
+            child_variables=child_variables,
+        )
+
+        self.assertIs(group.variables, child_variables)
+        self.assertDictEqual(
+            group.attributes,
+            {'collection_override': 'collection value', 'coordinates': 'lat lon'},
+        )
+
 
 class TestGroupFromNetCDF4(TestCase):
     """Tests for the `Group` class using NetCDF-4 input."""
@@ -119,3 +140,43 @@ class TestGroupFromNetCDF4(TestCase):
             group.variables,
             {'/lat', '/lon', '/time', '/science1', '/scalar1'},
         )
+
+
+class TestGroupFromZarr(TestCase):
+    """Tests for the `Group` class using the consolidated metadata of a Zarr
+    store as input.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up properties of the class that do not need to be reset between
+        tests.
+
+        """
+        cls.config_file = 'tests/unit/data/test_config.json'
+        cls.fakesat_config = CFConfig('FakeSat', 'FAKE99', config_file=cls.config_file)
+        cls.namespace = 'namespace string'
+
+    def test_group_instantiation(self):
+        """Ensure a group can be created from a Zarr group."""
+        group = GroupFromZarr(
+            {
+                'attributes': {'history': 'Test data'},
+                'variables': ['science2', 'scalar2'],
+            },
+            self.fakesat_config,
+            self.namespace,
+            '/group',
+        )
+
+        self.assertEqual(group.namespace, self.namespace)
+        self.assertEqual(group.full_name_path, '/group')
+        self.assertDictEqual(
+            group.attributes,
+            {
+                'collection_override': 'collection value',
+                'history': 'Test data',
+            },
+        )
+        self.assertSetEqual(group.variables, {'/group/science2', '/group/scalar2'})
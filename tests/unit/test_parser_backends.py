@@ -0,0 +1,301 @@
+from unittest import TestCase
+from unittest.mock import patch
+import xml.etree.ElementTree as ET
+
+from varinfo.exceptions import InvalidParserBackendError
+from varinfo.parser_backends import (
+    DMRPP_NAMESPACE,
+    get_dmrpp_chunk_summary,
+    get_element_tree_module,
+    get_qualified_name,
+    iterparse_with_expat,
+    lxml_etree,
+    strip_namespace_elements,
+)
+from varinfo.utilities import read_binary_chunks
+
+
+class TestParserBackends(TestCase):
+    """Tests for the XML parser backends used by `VarInfoFromDmr`."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up properties of the class that do not need to be reset between
+        tests.
+
+        """
+        cls.namespace = '{http://xml.opendap.org/ns/DAP/4.0#}'
+        cls.dmr_content = (
+            b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+            b'<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" '
+            b'xml:base="file:///granule.h5" name="granule.h5">\n'
+            b'  <Dimension name="dim" size="2"/>\n'
+            b'  <Attribute name="title" type="String">'
+            b'<Value>Example</Value></Attribute>\n'
+            b'  <Group name="science">\n'
+            b'    <Attribute name="units" type="String">'
+            b'<Value>\xb0C</Value></Attribute>\n'
+            b'    <Float64 name="temperature">\n'
+            b'      <Dim name="/dim"/>\n'
+            b'      <Attribute name="valid_range" type="Float64">'
+            b'<Value>-50</Value><Value>50</Value></Attribute>\n'
+            b'    </Float64>\n'
+            b'  </Group>\n'
+            b'</Dataset>'
+        )
+
+    def test_get_element_tree_module(self):
+        """Ensure the correct module is returned for each parser backend, and
+        that an exception is raised for an unrecognised backend, or if `lxml`
+        is requested but not installed.
+
+        """
+        with self.subTest('etree'):
+            self.assertIs(get_element_tree_module('etree'), ET)
+
+        with self.subTest('expat'):
+            self.assertIs(get_element_tree_module('expat'), ET)
+
+        if lxml_etree is not None:
+            with self.subTest('lxml'):
+                self.assertIs(get_element_tree_module('lxml'), lxml_etree)
+
+        with self.subTest('lxml not installed'):
+            with patch('varinfo.parser_backends.lxml_etree', None):
+                with self.assertRaises(InvalidParserBackendError):
+                    get_element_tree_module('lxml')
+
+        with self.subTest('Unrecognised backend'):
+            with self.assertRaises(InvalidParserBackendError):
+                get_element_tree_module('minidom')
+
+    def test_iterparse_with_expat(self):
+        """Ensure the events from the expat backend match those from an
+        `xml.etree.ElementTree.XMLPullParser`, including when the document is
+        split into chunks that do not align with element boundaries. Groups
+        and the root element should only retain their metadata attributes,
+        while variables retain their full subtree.
+
+        """
+        pull_parser = ET.XMLPullParser(events=('start', 'end'))
+        pull_parser.feed(self.dmr_content)
+        pull_parser.close()
+        expected_events = [
+            (event, element.tag, element.attrib)
+            for event, element in pull_parser.read_events()
+        ]
+
+        expat_events = list(
+            iterparse_with_expat(read_binary_chunks(self.dmr_content, chunk_size=7))
+        )
+
+        self.assertListEqual(
+            [(event, element.tag, element.attrib) for event, element in expat_events],
+            expected_events,
+        )
+
+        root_element = expat_events[0][1]
+        self.assertEqual(
+            root_element.get('{http://www.w3.org/XML/1998/namespace}base'),
+            'file:///granule.h5',
+        )
+        self.assertListEqual(
+            [child.tag for child in root_element], [f'{self.namespace}Attribute']
+        )
+
+        elements = {
+            element.get('name'): element
+            for event, element in expat_events
+            if event == 'end'
+        }
+
+        self.assertListEqual(
+            [child.get('name') for child in elements['science']], ['units']
+        )
+        self.assertEqual(elements['units'].find(f'{self.namespace}Value').text, '°C')
+        self.assertListEqual(
+            [child.tag for child in elements['temperature']],
+            [f'{self.namespace}Dim', f'{self.namespace}Attribute'],
+        )
+        self.assertListEqual(
+            [
+                value.text
+                for value in elements['temperature'].iter(f'{self.namespace}Value')
+            ],
+            ['-50', '50'],
+        )
+
+    def test_iterparse_with_expat_events(self):
+        """Ensure only the requested events are yielded."""
+        expat_events = list(
+            iterparse_with_expat(
+                read_binary_chunks(self.dmr_content), events=('start',)
+            )
+        )
+
+        self.assertEqual(len(expat_events), 12)
+        self.assertTrue(all(event == 'start' for event, _ in expat_events))
+
+    def test_get_qualified_name(self):
+        """Ensure a namespace separated by expat is qualified in the same way
+        as an `xml.etree.ElementTree` tag, and unqualified names are
+        unchanged.
+
+        """
+        self.assertEqual(
+            get_qualified_name('http://xml.opendap.org/ns/DAP/4.0#}Group'),
+            f'{self.namespace}Group',
+        )
+        self.assertEqual(get_qualified_name('name'), 'name')
+
+    def test_strip_namespace_elements(self):
+        """Ensure all elements in the specified namespace, and their content,
+        are removed from the raw bytes of a document, including when the
+        document is split into chunks that do not align with element
+        boundaries. Elements should be replaced by the output of the optional
+        `get_replacement` function, and a document that does not declare the
+        namespace should be unchanged.
+
+        """
+        dmrpp_content = (
+            b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+            b'<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" '
+            b'xmlns:dmrpp="http://xml.opendap.org/dap/dmrpp/1.0.0#" '
+            b'dmrpp:href="https://example.com/granule.h5">'
+            b'<Float64 name="temperature"><Dim name="/dim"/>'
+            b'<dmrpp:chunks compressionType="deflate" fillValue=">">'
+            b'<dmrpp:chunkDimensionSizes>2</dmrpp:chunkDimensionSizes>'
+            b'<dmrpp:chunk offset="10" nBytes="8"/>'
+            b'<dmrpp:chunk offset="18" nBytes="8"/>'
+            b'</dmrpp:chunks>'
+            b'</Float64>'
+            b'<Float64 name="time"><dmrpp:compact>AAAA</dmrpp:compact>'
+            b'<dmrpp:missingdata/></Float64>'
+            b'</Dataset>'
+        )
+        expected_content = (
+            b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+            b'<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" '
+            b'xmlns:dmrpp="http://xml.opendap.org/dap/dmrpp/1.0.0#" '
+            b'dmrpp:href="https://example.com/granule.h5">'
+            b'<Float64 name="temperature"><Dim name="/dim"/>%b</Float64>'
+            b'<Float64 name="time">%b%b</Float64>'
+            b'</Dataset>'
+        )
+
+        for chunk_size in [7, 2**16]:
+            with self.subTest(f'Elements removed, chunk size {chunk_size}'):
+                self.assertEqual(
+                    b''.join(
+                        strip_namespace_elements(
+                            read_binary_chunks(dmrpp_content, chunk_size),
+                            DMRPP_NAMESPACE,
+                        )
+                    ),
+                    expected_content % (b'', b'', b''),
+                )
+
+            with self.subTest(f'Elements replaced, chunk size {chunk_size}'):
+                self.assertEqual(
+                    b''.join(
+                        strip_namespace_elements(
+                            read_binary_chunks(dmrpp_content, chunk_size),
+                            DMRPP_NAMESPACE,
+                            lambda prefix, name, content: b'<%b:%b/>' % (prefix, name),
+                        )
+                    ),
+                    expected_content
+                    % (
+                        b'<dmrpp:chunks/>',
+                        b'<dmrpp:compact/>',
+                        b'<dmrpp:missingdata/>',
+                    ),
+                )
+
+        with self.subTest('Namespace not declared'):
+            self.assertEqual(
+                b''.join(
+                    strip_namespace_elements(
+                        read_binary_chunks(self.dmr_content, chunk_size=7),
+                        DMRPP_NAMESPACE,
+                    )
+                ),
+                self.dmr_content,
+            )
+
+        with self.subTest('Comments and CDATA sections are not elements'):
+            dmrpp_content = (
+                b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+                b'<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" '
+                b'xmlns:dmrpp="http://xml.opendap.org/dap/dmrpp/1.0.0#">'
+                b'<!-- <dmrpp:chunks> -->'
+                b'<Float64 name="temperature" note="&lt;dmrpp:chunks">'
+                b'<dmrpp:chunks compressionType="deflate">'
+                b'<!-- </dmrpp:chunks> <dmrpp:chunk nBytes="100"/> -->'
+                b'<![CDATA[</dmrpp:chunks>]]>'
+                b'<dmrpp:chunk offset="10" nBytes="8"/>'
+                b'</dmrpp:chunks >'
+                b'</Float64>'
+                b'</Dataset>'
+            )
+
+            for chunk_size in [3, 7, 2**16]:
+                self.assertEqual(
+                    b''.join(
+                        strip_namespace_elements(
+                            read_binary_chunks(dmrpp_content, chunk_size),
+                            DMRPP_NAMESPACE,
+                            get_dmrpp_chunk_summary,
+                        )
+                    ),
+                    b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+                    b'<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" '
+                    b'xmlns:dmrpp="http://xml.opendap.org/dap/dmrpp/1.0.0#">'
+                    b'<!-- <dmrpp:chunks> -->'
+                    b'<Float64 name="temperature" note="&lt;dmrpp:chunks">'
+                    b'<dmrpp:chunkSummary chunkCount="1" byteTotal="8" '
+                    b'filters="deflate"/>'
+                    b'</Float64>'
+                    b'</Dataset>',
+                )
+
+    def test_get_dmrpp_chunk_summary(self):
+        """Ensure a `chunks` element is replaced by a summary of the number of
+        chunks, their total size and the compression filters, ignoring any
+        comments or CDATA sections, and that all other elements in the DMR++
+        namespace are removed.
+
+        """
+        self.assertEqual(
+            get_dmrpp_chunk_summary(
+                b'dmrpp',
+                b'chunks',
+                b'<dmrpp:chunks compressionType="shuffle deflate">'
+                b'<dmrpp:chunkDimensionSizes>2</dmrpp:chunkDimensionSizes>'
+                b'<!-- <dmrpp:chunk nBytes="100"/> -->'
+                b'<![CDATA[<dmrpp:chunk nBytes="100"/>]]>'
+                b'<dmrpp:chunk offset="10" nBytes="8"/>'
+                b'<dmrpp:chunk offset="18" nBytes="12"/>'
+                b'</dmrpp:chunks>',
+            ),
+            b'<dmrpp:chunkSummary chunkCount="2" byteTotal="20" '
+            b'filters="shuffle deflate"/>',
+        )
+
+        with self.subTest('No compression filters'):
+            self.assertEqual(
+                get_dmrpp_chunk_summary(
+                    b'dmrpp',
+                    b'chunks',
+                    b'<dmrpp:chunks><dmrpp:chunk nBytes="8"/></dmrpp:chunks>',
+                ),
+                b'<dmrpp:chunkSummary chunkCount="1" byteTotal="8" filters=""/>',
+            )
+
+        with self.subTest('Other elements are removed'):
+            self.assertEqual(
+                get_dmrpp_chunk_summary(
+                    b'dmrpp', b'compact', b'<dmrpp:compact>AAAA</dmrpp:compact>'
+                ),
+                b'',
+            )
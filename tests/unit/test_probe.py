@@ -0,0 +1,310 @@
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import patch
+import xml.etree.ElementTree as ET
+
+from netCDF4 import Dataset
+
+from varinfo import VarInfoFromDmr
+from varinfo.probe import get_first_dmr_attribute, probe_dmr, probe_netcdf4
+from varinfo.utilities import (
+    get_first_full_path_xml_attribute,
+    get_full_path_xml_attribute,
+    read_binary_chunks,
+)
+from tests.utilities import write_dmr, write_skeleton_netcdf4
+
+
+class TestProbe(TestCase):
+    """Tests for the functions determining the collection short name and
+    mission of a granule without a full parse of its metadata.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up properties of the class that do not need to be reset between
+        tests.
+
+        """
+        cls.test_config_file = 'tests/unit/data/test_config.json'
+        cls.sample_config_file = 'config/1.0.0/sample_config_1.0.0.json'
+        cls.atl03_dmr = 'tests/unit/data/ATL03_example.dmr'
+        cls.namespace = 'http://xml.opendap.org/ns/DAP/4.0#'
+
+    def setUp(self):
+        self.output_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.output_dir)
+
+    def test_probe_dmr(self):
+        """Ensure the short name and mission are the same as those of a
+        `VarInfoFromDmr` instance for the same `.dmr`, for each supported
+        type of source.
+
+        """
+        dmr_paths = [
+            self.atl03_dmr,
+            'tests/unit/data/GPM_3IMERGHH_example.dmr',
+            'tests/unit/data/SPL3FTP_E_example.dmr.xml',
+            'tests/unit/data/mock_dataset_two.dmr',
+            'tests/unit/data/mock_example.dmrpp',
+        ]
+
+        for config_file in [self.sample_config_file, self.test_config_file]:
+            for dmr_path in dmr_paths:
+                with self.subTest(f'{dmr_path}, {config_file}'):
+                    var_info = VarInfoFromDmr(dmr_path, config_file=config_file)
+                    self.assertTupleEqual(
+                        probe_dmr(dmr_path, config_file),
+                        (var_info.short_name, var_info.mission),
+                    )
+
+        with self.subTest('Values from the test configuration file'):
+            self.assertTupleEqual(
+                probe_dmr(self.atl03_dmr, self.test_config_file),
+                ('ATL03', 'ICESat2'),
+            )
+            self.assertTupleEqual(
+                probe_dmr('tests/unit/data/mock_example.dmrpp', self.test_config_file),
+                ('FAKE99', 'FakeSat'),
+            )
+
+        with self.subTest('Bytes-like source'):
+            with open(self.atl03_dmr, 'rb') as file_handler:
+                dmr_content = file_handler.read()
+
+            self.assertTupleEqual(
+                probe_dmr(dmr_content, self.test_config_file), ('ATL03', 'ICESat2')
+            )
+
+        with self.subTest('Binary file-like source'):
+            with open(self.atl03_dmr, 'rb') as file_handler:
+                self.assertTupleEqual(
+                    probe_dmr(file_handler, self.test_config_file),
+                    ('ATL03', 'ICESat2'),
+                )
+
+        with self.subTest('Short name with no matching mission'):
+            dmr_path = write_dmr(
+                self.output_dir,
+                f'<Dataset xmlns="{self.namespace}">'
+                '  <Attribute name="short_name" type="String">'
+                '    <Value>UNKNOWN01</Value>'
+                '  </Attribute>'
+                '</Dataset>',
+            )
+            self.assertTupleEqual(
+                probe_dmr(dmr_path, self.test_config_file), ('UNKNOWN01', None)
+            )
+
+        with self.subTest('No configuration file'):
+            self.assertTupleEqual(probe_dmr(self.atl03_dmr), (None, None))
+
+    def test_probe_dmr_stops_early(self):
+        """Ensure the `.dmr` is only read until the value of the highest
+        priority attribute path is determined.
+
+        """
+        consumed_chunks = []
+
+        def record_chunks(chunks):
+            for chunk in chunks:
+                consumed_chunks.append(chunk)
+                yield chunk
+
+        dmr_chunks = list(read_binary_chunks(self.atl03_dmr, 4096))
+
+        self.assertEqual(
+            get_first_dmr_attribute(
+                record_chunks(dmr_chunks),
+                ['/METADATA/DatasetIdentification/shortName'],
+            ),
+            'ATL03',
+        )
+        self.assertLess(len(consumed_chunks), len(dmr_chunks) / 10)
+
+    def test_get_first_dmr_attribute_creates_few_elements(self):
+        """Ensure elements are only created for the root element, the
+        elements matching each path segment, and the requested Attribute and
+        its children, rather than for the subtrees of unrelated variables.
+
+        """
+        created_tags = []
+        create_element = ET.Element
+
+        def record_element(tag, *args, **kwargs):
+            created_tags.append(tag.rpartition('}')[2])
+            return create_element(tag, *args, **kwargs)
+
+        with patch('varinfo.probe.ET.Element', side_effect=record_element):
+            self.assertEqual(
+                get_first_dmr_attribute(
+                    read_binary_chunks(self.atl03_dmr), ['/gt1l/atlas_pce']
+                ),
+                'pce1',
+            )
+
+        self.assertListEqual(
+            created_tags, ['unrelated', 'Dataset', 'Group', 'Attribute', 'Value']
+        )
+
+    def test_get_first_dmr_attribute(self):
+        """Ensure the first available value from a list of full attribute
+        paths can be retrieved, with the same results as
+        `get_first_full_path_xml_attribute`.
+
+        """
+        test_args = [
+            ['Non nested attribute.', ['/Conventions'], 'CF-1.6'],
+            ['No leading slash.', ['Conventions'], 'CF-1.6'],
+            ['Singly nested attribute.', ['/gt1l/atlas_pce'], 'pce1'],
+            [
+                'Deeply nested attribute.',
+                ['/gt1l/bckgrd_atlas/tlm_height_band1/coordinates'],
+                'delta_time',
+            ],
+            ['Absent paths are skipped.', ['/NONEXISTENT', '/gt1l/atlas_pce'], 'pce1'],
+            [
+                'Earlier paths take precedence.',
+                ['/gt2r/atlas_pce', '/gt1l/atlas_pce'],
+                'pce2',
+            ],
+            ['Attribute that does not exist returns None.', ['/NONEXISTENT'], None],
+            [
+                'Non-existent variable or group returns None.',
+                ['/absent_attribute_container/units'],
+                None,
+            ],
+            ['No paths returns None.', [], None],
+        ]
+
+        for description, attribute_paths, expected_value in test_args:
+            with self.subTest(description):
+                self.assertEqual(
+                    get_first_dmr_attribute(
+                        read_binary_chunks(self.atl03_dmr, 4096), attribute_paths
+                    ),
+                    expected_value,
+                )
+                self.assertEqual(
+                    get_first_full_path_xml_attribute(
+                        ET.iterparse(self.atl03_dmr, events=('start', 'end')),
+                        attribute_paths,
+                        f'{{{self.namespace}}}',
+                    ),
+                    expected_value,
+                )
+
+        with self.subTest('Attribute within an attribute container.'):
+            dmr_path = write_dmr(
+                self.output_dir,
+                f'<Dataset xmlns="{self.namespace}">'
+                '  <Attribute name="HDF5_GLOBAL" type="Container">'
+                '    <Attribute name="short_name" type="String">'
+                '      <Value>FAKESAT1</Value>'
+                '    </Attribute>'
+                '  </Attribute>'
+                '</Dataset>',
+            )
+            self.assertEqual(
+                get_first_dmr_attribute(
+                    read_binary_chunks(dmr_path), ['/HDF5_GLOBAL/short_name']
+                ),
+                'FAKESAT1',
+            )
+
+    def test_get_first_dmr_attribute_overlapping_paths(self):
+        """Ensure nested and overlapping attribute paths give the same result
+        as a full parse of the `.dmr`, including when one path resolves to an
+        attribute container that is also the container of another path.
+
+        """
+        dmr_path = write_dmr(
+            self.output_dir,
+            f'<Dataset xmlns="{self.namespace}">'
+            '  <Attribute name="sn" type="Container">'
+            '    <Attribute name="a" type="String"><Value>container a</Value>'
+            '    </Attribute>'
+            '    <Attribute name="b" type="String"><Value>container b</Value>'
+            '    </Attribute>'
+            '  </Attribute>'
+            '  <Attribute name="b" type="String"><Value>root b</Value></Attribute>'
+            '  <Group name="sn">'
+            '    <Attribute name="c" type="String"><Value>group c</Value>'
+            '    </Attribute>'
+            '    <Float64 name="b">'
+            '      <Attribute name="units" type="String"><Value>m</Value>'
+            '      </Attribute>'
+            '    </Float64>'
+            '  </Group>'
+            '</Dataset>',
+        )
+        dmr_document = ET.parse(dmr_path).getroot()
+        namespace = f'{{{self.namespace}}}'
+
+        test_paths = [
+            ['/sn/b', '/sn'],
+            ['/sn', '/sn/b'],
+            ['/sn/a', '/sn/b'],
+            ['/sn/c', '/b'],
+            ['/sn/b/units', '/sn/a'],
+            ['/sn/missing', '/sn/b/units', '/sn/a'],
+            ['/sn/sn/b', '/b'],
+            ['/b', '/sn/b'],
+        ]
+
+        for attribute_paths in test_paths:
+            with self.subTest(attribute_paths):
+                expected_value = next(
+                    (
+                        value
+                        for value in (
+                            get_full_path_xml_attribute(dmr_document, path, namespace)
+                            for path in attribute_paths
+                        )
+                        if value is not None
+                    ),
+                    None,
+                )
+
+                for chunk_size in [16, 2**16]:
+                    self.assertEqual(
+                        get_first_dmr_attribute(
+                            read_binary_chunks(dmr_path, chunk_size), attribute_paths
+                        ),
+                        expected_value,
+                    )
+
+        with self.subTest('Attribute within a container takes precedence'):
+            self.assertEqual(
+                get_first_dmr_attribute(read_binary_chunks(dmr_path), ['/sn/b', '/sn']),
+                'container b',
+            )
+
+    def test_probe_netcdf4(self):
+        """Ensure the short name and mission can be determined from the
+        metadata attributes of a NetCDF-4 file, either from a path or an
+        open dataset, which is left open.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+
+        with self.subTest('File path'):
+            self.assertTupleEqual(
+                probe_netcdf4(netcdf4_path, self.test_config_file),
+                ('ATL03', 'ICESat2'),
+            )
+
+        with self.subTest('Open dataset'):
+            with Dataset(netcdf4_path) as dataset:
+                self.assertTupleEqual(
+                    probe_netcdf4(dataset, self.test_config_file),
+                    ('ATL03', 'ICESat2'),
+                )
+                self.assertTrue(dataset.isopen())
+
+        with self.subTest('No configuration file'):
+            self.assertTupleEqual(probe_netcdf4(netcdf4_path), (None, None))
@@ -1,3 +1,4 @@
+from io import BytesIO
 from shutil import rmtree
 from tempfile import mkdtemp
 from typing import List
@@ -9,14 +10,28 @@ import numpy as np
 
 from varinfo.exceptions import DmrNamespaceError
 from varinfo.utilities import (
+    GroupFilter,
+    get_combined_pattern,
+    get_dmr_element_type,
+    get_dmr_tag_types,
+    get_first_full_path_xml_attribute,
     get_full_path_netcdf4_attribute,
     get_full_path_xml_attribute,
+    get_literal_prefix,
+    get_literal_prefixes,
+    get_numeric_array,
     get_xml_attribute,
     get_xml_attribute_value,
     get_xml_container_attribute,
     get_xml_namespace,
+    has_top_level_alternation,
+    is_binary_file_object,
+    MissionResolver,
+    PatternPrefixTrie,
+    read_binary_chunks,
     recursive_get,
     split_attribute_path,
+    XmlNameIndex,
 )
 
 from tests.utilities import write_skeleton_netcdf4
@@ -51,6 +66,47 @@ class TestUtilities(TestCase):
             with self.subTest(description):
                 self.assertEqual(recursive_get(test_dictionary, keys), expected_output)
 
+    def test_read_binary_chunks(self):
+        """Ensure a binary source is yielded in chunks of the requested size,
+        without being decoded, and that bytes-like objects are sliced as
+        `memoryview` objects instead of being copied.
+
+        """
+        content = b'<Dataset>\xb0</Dataset>\n'
+        file_path = f'{self.output_dir}/binary_file.xml'
+
+        with open(file_path, 'wb') as file_handler:
+            file_handler.write(content)
+
+        sources = {
+            'file path': file_path,
+            'bytes': content,
+            'memoryview': memoryview(content),
+            'file-like object': BytesIO(content),
+        }
+
+        for description, source in sources.items():
+            with self.subTest(description):
+                chunks = list(read_binary_chunks(source, chunk_size=4))
+                self.assertEqual(b''.join(chunks), content)
+                self.assertListEqual(
+                    [len(chunk) for chunk in chunks], [4, 4, 4, 4, 4, 1]
+                )
+
+        with self.subTest('bytes-like objects are not copied'):
+            for chunk in read_binary_chunks(content, chunk_size=4):
+                self.assertIsInstance(chunk, memoryview)
+
+    def test_is_binary_file_object(self):
+        """Ensure only file-like objects are identified, and not file paths or
+        bytes-like objects.
+
+        """
+        self.assertTrue(is_binary_file_object(BytesIO(b'content')))
+        self.assertFalse(is_binary_file_object('path/to/file.dmr'))
+        self.assertFalse(is_binary_file_object(b'content'))
+        self.assertFalse(is_binary_file_object(memoryview(b'content')))
+
     def test_split_attribute_path(self):
         """Check that a fully qualified path to a metadata attribute is
         correctly converted to a combination of two keys, to locate the
@@ -75,6 +131,49 @@ class TestUtilities(TestCase):
             with self.subTest(description):
                 self.assertEqual(split_attribute_path(full_path), expected_key_list)
 
+    def test_get_dmr_tag_types(self):
+        """Ensure fully qualified tags are mapped to their unqualified `.dmr`
+        element type, and that the lookup table is shared between calls with
+        the same namespace.
+
+        """
+        namespace = '{http://xml.opendap.org/ns/DAP/4.0#}'
+        tag_types = get_dmr_tag_types(namespace)
+
+        self.assertEqual(tag_types[f'{namespace}Float64'], 'Float64')
+        self.assertEqual(tag_types[f'{namespace}Group'], 'Group')
+        self.assertEqual(tag_types[f'{namespace}Dimension'], 'Dimension')
+        self.assertEqual(tag_types[f'{namespace}Attribute'], 'Attribute')
+        self.assertNotIn('Float64', tag_types)
+        self.assertIs(get_dmr_tag_types(namespace), tag_types)
+
+    def test_get_dmr_element_type(self):
+        """Ensure the element type is retrieved for known and unknown tags,
+        removing only the exact namespace prefix from the tag. Characters at
+        the start of the element type that also occur in the namespace should
+        not be removed.
+
+        """
+        namespace = '{http://xml.opendap.org/ns/DAP/4.0#}'
+
+        with self.subTest('Known element type'):
+            self.assertEqual(
+                get_dmr_element_type(ET.Element(f'{namespace}Int32'), namespace),
+                'Int32',
+            )
+
+        with self.subTest('Unknown element type'):
+            self.assertEqual(
+                get_dmr_element_type(ET.Element(f'{namespace}Structure'), namespace),
+                'Structure',
+            )
+
+        with self.subTest('Element type sharing characters with namespace'):
+            self.assertEqual(
+                get_dmr_element_type(ET.Element('{String}String'), '{String}'),
+                'String',
+            )
+
     def test_get_xml_namespace(self):
         """Check that an XML namespace can be retrieved, or if one is absent,
         that a `DmrNamespaceError` is raised.
@@ -212,6 +311,73 @@ class TestUtilities(TestCase):
                 default,
             )
 
+    def test_get_xml_attribute_value_numeric(self):
+        """Ensure numeric attributes with multiple values are decoded as a list
+        of NumPy scalars by default, or as a single NumPy array if requested.
+
+        """
+        attribute = ET.fromstring(
+            f'  <{self.namespace}Attribute name="flag_masks" type="Int16">'
+            f'    <{self.namespace}Value>1</{self.namespace}Value>'
+            f'    <{self.namespace}Value>2</{self.namespace}Value>'
+            f'    <{self.namespace}Value>-4</{self.namespace}Value>'
+            f'  </{self.namespace}Attribute>'
+        )
+
+        with self.subTest('List of NumPy scalars by default.'):
+            attribute_value = get_xml_attribute_value(
+                attribute, self.namespace, 'Int16'
+            )
+            self.assertListEqual(attribute_value, [1, 2, -4])
+            self.assertTrue(
+                all(isinstance(value, np.int16) for value in attribute_value)
+            )
+
+        with self.subTest('NumPy array if requested.'):
+            attribute_value = get_xml_attribute_value(
+                attribute, self.namespace, 'Int16', as_array=True
+            )
+            self.assertIsInstance(attribute_value, np.ndarray)
+            self.assertEqual(attribute_value.dtype, np.int16)
+            np.testing.assert_array_equal(attribute_value, [1, 2, -4])
+
+        with self.subTest('Single numeric value is a NumPy scalar.'):
+            attribute = ET.fromstring(
+                f'  <{self.namespace}Attribute name="scale" type="Float32">'
+                f'    <{self.namespace}Value>0.5</{self.namespace}Value>'
+                f'  </{self.namespace}Attribute>'
+            )
+            attribute_value = get_xml_attribute_value(
+                attribute, self.namespace, 'Float32', as_array=True
+            )
+            self.assertIsInstance(attribute_value, np.float32)
+            self.assertEqual(attribute_value, 0.5)
+
+    def test_get_numeric_array(self):
+        """Ensure a list of strings is decoded into a NumPy array of the
+        requested type, including values that are not parsed by the built-in
+        `int` or `float` functions, and that values out of range for the type
+        raise an exception.
+
+        """
+        with self.subTest('Integer values'):
+            numeric_array = get_numeric_array([' 1', '255 ', '0'], np.uint8)
+            self.assertEqual(numeric_array.dtype, np.uint8)
+            np.testing.assert_array_equal(numeric_array, [1, 255, 0])
+
+        with self.subTest('Floating point values'):
+            numeric_array = get_numeric_array(['1e10', '-inf', 'nan'], np.float32)
+            self.assertEqual(numeric_array.dtype, np.float32)
+            np.testing.assert_array_equal(numeric_array, [1e10, -np.inf, np.nan])
+
+        with self.subTest('Empty values fall back to NumPy casting'):
+            numeric_array = get_numeric_array(['1.5', None], np.float64)
+            np.testing.assert_array_equal(numeric_array, [1.5, np.nan])
+
+        with self.subTest('Out of range values raise an exception'):
+            with self.assertRaises(OverflowError):
+                get_numeric_array(['256'], np.uint8)
+
     def test_get_xml_container_attribute(self):
         """Ensure a dictionary of attributes is retrieved for a container."""
 
@@ -341,6 +507,119 @@ class TestUtilities(TestCase):
                 )
             )
 
+    def test_xml_name_index(self):
+        """Ensure an `XmlNameIndex` resolves full attribute paths with the same
+        results as `get_full_path_xml_attribute`, including when only the
+        elements named in those paths are indexed.
+
+        """
+        with open(
+            'tests/unit/data/ATL03_example.dmr', 'r', encoding='utf-8'
+        ) as file_handler:
+            atl03_dmr = ET.fromstring(file_handler.read())
+
+        atl03_namespace = '{http://xml.opendap.org/ns/DAP/4.0#}'
+
+        test_args = [
+            ['Non nested attribute', '/Conventions', 'CF-1.6'],
+            ['No leading slash', 'Conventions', 'CF-1.6'],
+            ['Singly nested attribute', '/gt1l/atlas_pce', 'pce1'],
+            ['Later group with same child', '/gt2r/atlas_pce', 'pce2'],
+            [
+                'Deeply nested attribute',
+                '/gt1l/bckgrd_atlas/tlm_height_band1/coordinates',
+                'delta_time',
+            ],
+            [
+                'Skipped intermediate group',
+                '/gt1l/tlm_height_band1/coordinates',
+                'delta_time',
+            ],
+            ['Segment outside previous match', '/gt1l/gt2r/atlas_pce', None],
+            ['Attribute that does not exist', '/NONEXISTENT', None],
+            ['Non-existent group', '/absent_attribute_container/units', None],
+        ]
+
+        for names in [None, {'gt1l', 'gt2r', 'bckgrd_atlas', 'tlm_height_band1'}]:
+            name_index = XmlNameIndex(atl03_dmr, atl03_namespace, names=names)
+
+            for description, attribute_path, expected_value in test_args:
+                with self.subTest(f'{description}, names: {names}'):
+                    self.assertEqual(
+                        name_index.get_full_path_attribute(attribute_path),
+                        expected_value,
+                    )
+                    self.assertEqual(
+                        get_full_path_xml_attribute(
+                            atl03_dmr, attribute_path, atl03_namespace
+                        ),
+                        expected_value,
+                    )
+
+    def test_get_first_full_path_xml_attribute(self):
+        """Ensure the first available value from a list of full attribute
+        paths can be retrieved from the events of an incremental parse, with
+        the same results as `get_full_path_xml_attribute`.
+
+        """
+        atl03_path = 'tests/unit/data/ATL03_example.dmr'
+        atl03_namespace = '{http://xml.opendap.org/ns/DAP/4.0#}'
+        test_args = [
+            ['Non nested attribute.', ['/Conventions'], 'CF-1.6'],
+            ['No leading slash.', ['Conventions'], 'CF-1.6'],
+            ['Singly nested attribute.', ['/gt1l/atlas_pce'], 'pce1'],
+            [
+                'Deeply nested attribute.',
+                ['/gt1l/bckgrd_atlas/tlm_height_band1/coordinates'],
+                'delta_time',
+            ],
+            ['Absent paths are skipped.', ['/NONEXISTENT', '/gt1l/atlas_pce'], 'pce1'],
+            [
+                'Earlier paths take precedence.',
+                ['/gt2r/atlas_pce', '/gt1l/atlas_pce'],
+                'pce2',
+            ],
+            ['Attribute that does not exist returns None.', ['/NONEXISTENT'], None],
+            [
+                'Non-existent variable or group returns None.',
+                ['/absent_attribute_container/units'],
+                None,
+            ],
+            ['No paths returns None.', [], None],
+        ]
+
+        for description, attribute_paths, expected_value in test_args:
+            with self.subTest(description):
+                xml_events = ET.iterparse(atl03_path, events=('start', 'end'))
+                self.assertEqual(
+                    get_first_full_path_xml_attribute(
+                        xml_events, attribute_paths, atl03_namespace
+                    ),
+                    expected_value,
+                )
+
+        with self.subTest('Attribute within an attribute container.'):
+            dmr_path = f'{self.output_dir}/nested.dmr'
+
+            with open(dmr_path, 'w', encoding='utf-8') as file_handler:
+                file_handler.write(
+                    f'<Dataset xmlns="{self.namespace}">'
+                    '  <Attribute name="HDF5_GLOBAL" type="Container">'
+                    '    <Attribute name="short_name" type="String">'
+                    '      <Value>FAKESAT1</Value>'
+                    '    </Attribute>'
+                    '  </Attribute>'
+                    '</Dataset>'
+                )
+
+            xml_events = ET.iterparse(dmr_path, events=('start', 'end'))
+            self.assertEqual(
+                get_first_full_path_xml_attribute(
+                    xml_events, ['/HDF5_GLOBAL/short_name'], f'{{{self.namespace}}}'
+                ),
+                'FAKESAT1',
+            )
+
     def test_get_full_path_netcdf4_attribute(self):
         """Ensure a NetCDF-4 metadata attribute can be retrieved from anywhere
         in the file. This includes the root group, nested groups, variables in
@@ -394,3 +673,187 @@ class TestUtilities(TestCase):
                     ),
                     '/lat /lon',
                 )
+
+    def test_group_filter(self):
+        """Ensure groups are parsed, traversed or pruned according to the
+        include and exclude patterns. Excluded groups prune their whole
+        subtree, and groups not matching an include pattern are only
+        traversed if a descendant could match. The root is always parsed.
+
+        """
+        group_filter = GroupFilter(
+            ['/gt1l/.*', '/ancillary_data/', '/METADATA/Lineage/ANC0\\d/'],
+            ['/gt1l/geophys_corr/'],
+        )
+        test_args = [
+            ['Root group', '/', True, True],
+            ['Included group', '/gt1l', True, True],
+            ['Included group with trailing slash', '/gt1l/', True, True],
+            ['Descendant of included group', '/gt1l/heights', True, True],
+            ['Excluded group', '/gt1l/geophys_corr', False, False],
+            ['Descendant of excluded group', '/gt1l/geophys_corr/x', False, False],
+            ['Not included group', '/gt2l', False, False],
+            ['Ancestor of included group', '/METADATA/Lineage', True, False],
+            ['Group matching nested pattern', '/METADATA/Lineage/ANC03', True, True],
+            ['Sibling of ancestor', '/METADATA/Extent', False, False],
+        ]
+
+        for description, group_path, traverses, parses in test_args:
+            with self.subTest(description):
+                self.assertEqual(group_filter.traverses(group_path), traverses)
+                self.assertEqual(group_filter.parses(group_path), parses)
+
+        with self.subTest('No patterns parses every group'):
+            group_filter = GroupFilter()
+            self.assertTrue(group_filter.is_empty)
+            self.assertTrue(group_filter.parses('/gt1l/heights'))
+
+        with self.subTest('Only exclude patterns'):
+            group_filter = GroupFilter(exclude_patterns=['/METADATA/'])
+            self.assertFalse(group_filter.is_empty)
+            self.assertTrue(group_filter.parses('/gt1l'))
+            self.assertFalse(group_filter.traverses('/METADATA/Extent'))
+
+    def test_get_literal_prefix(self):
+        """Ensure the literal prefix of a regular expression excludes special
+        characters, and optional final characters.
+
+        """
+        test_args = [
+            ['Trailing wildcard', '/gt1l/.*', '/gt1l/'],
+            ['Optional final character', '/gt1l/ab?/', '/gt1l/a'],
+            ['Repeated final character', '/gt1l/ab{2}', '/gt1l/a'],
+            ['Required repeated character', '/gt1l/ab+', '/gt1l/ab'],
+            ['Character class', '/gt[123]l/', '/gt'],
+            ['Escaped character', '/gt\\dl/', '/gt'],
+            ['Alternation', '/gt1l/|/gt2l/', ''],
+            ['Fully literal', '/ancillary_data/', '/ancillary_data/'],
+        ]
+
+        for description, pattern, expected_prefix in test_args:
+            with self.subTest(description):
+                self.assertEqual(get_literal_prefix(pattern), expected_prefix)
+
+    def test_get_literal_prefixes(self):
+        """Ensure simple character classes are expanded into multiple literal
+        prefixes, and that expansion stops at other special characters or
+        when the maximum number of prefixes would be exceeded.
+
+        """
+        test_args = [
+            [
+                'Character classes',
+                '/gt[12][lr]/heights/.*',
+                [
+                    '/gt1l/heights/',
+                    '/gt1r/heights/',
+                    '/gt2l/heights/',
+                    '/gt2r/heights/',
+                ],
+            ],
+            ['Fully literal', '/EASE2_global_projection', ['/EASE2_global_projection']],
+            ['No literal prefix', '.*', ['']],
+            ['Inline flags', '(?i).*global.*', ['']],
+            ['Group with alternation', '/group/(lat|lon).*', ['/group/']],
+            ['Top-level alternation', '/gt1l/.*|/gt2l/.*', ['']],
+            ['Optional character class', '/gt[12]?/', ['/gt']],
+            ['Repeated character class', '/gt[12]+/', ['/gt1', '/gt2']],
+            ['Escaped character class', '/BEAM[\\d]+/', ['/BEAM']],
+            ['Optional final character', '/ab?c', ['/a']],
+        ]
+
+        for description, pattern, expected_prefixes in test_args:
+            with self.subTest(description):
+                self.assertListEqual(get_literal_prefixes(pattern), expected_prefixes)
+
+        with self.subTest('Maximum number of prefixes'):
+            self.assertListEqual(
+                get_literal_prefixes('/gt[123][lr]/', max_prefixes=4),
+                ['/gt1', '/gt2', '/gt3'],
+            )
+
+    def test_has_top_level_alternation(self):
+        """Ensure alternation is only identified outside of groups and
+        character classes, and when not escaped.
+
+        """
+        self.assertTrue(has_top_level_alternation('/a/.*|/b/.*'))
+        self.assertFalse(has_top_level_alternation('/group/(a|b)'))
+        self.assertFalse(has_top_level_alternation('/group/[|]'))
+        self.assertFalse(has_top_level_alternation('/group/a\\|b'))
+        self.assertFalse(has_top_level_alternation('/group/.*'))
+
+    def test_pattern_prefix_trie(self):
+        """Ensure the values for every prefix of a path are retrieved,
+        including those with an empty prefix, in order of prefix length.
+
+        """
+        trie = PatternPrefixTrie()
+        trie.add('', 'all')
+        trie.add('/gt1l/', 'gt1l')
+        trie.add('/gt1l/heights/', 'gt1l heights')
+        trie.add('/gt1r/', 'gt1r')
+        trie.add('/gt1l/', 'gt1l again')
+
+        self.assertListEqual(
+            trie.get_values('/gt1l/heights/h_ph'),
+            ['all', 'gt1l', 'gt1l again', 'gt1l heights'],
+        )
+        self.assertListEqual(trie.get_values('/gt1r'), ['all'])
+        self.assertListEqual(trie.get_values('/gt1r/h_ph'), ['all', 'gt1r'])
+        self.assertListEqual(trie.get_values(''), ['all'])
+
+    def test_mission_resolver(self):
+        """Ensure the first pattern matching a short name determines the
+        mission, whether the patterns are combined or matched in turn, and
+        that each resolved short name is cached.
+
+        """
+        mission_items = (
+            ('ATL\\d{2}', 'ICESat2'),
+            ('ATL03', 'Unreachable'),
+            ('GEDI_L[1234][AB]|GEDI0[1234]_[AB]', 'GEDI'),
+            ('(SPL)(\\d).+', 'SMAP'),
+            ('', 'Default'),
+        )
+        resolver = MissionResolver(mission_items, 2)
+        self.assertIsNotNone(resolver.combined_pattern)
+
+        test_args = [
+            ['First of multiple matches', 'ATL03', 'ICESat2'],
+            ['Alternation within a pattern', 'GEDI02_A', 'GEDI'],
+            ['Groups within a pattern', 'SPL3FTA', 'SMAP'],
+            ['Later pattern matches', 'MOD10', 'Default'],
+        ]
+
+        for description, short_name, expected_mission in test_args:
+            with self.subTest(description):
+                self.assertEqual(resolver.resolve(short_name), expected_mission)
+
+        with self.subTest('Resolved short names are cached'):
+            resolver.resolve('MOD10')
+            self.assertEqual(resolver.resolve.cache_info().hits, 1)
+            self.assertEqual(resolver.resolve.cache_info().currsize, 2)
+
+        with self.subTest('No matching pattern'):
+            self.assertIsNone(MissionResolver(mission_items[:2], 2).resolve('MOD10'))
+
+        with self.subTest('Patterns with backreferences are matched in turn'):
+            resolver = MissionResolver((('(A)\\1', 'Double'), ('A', 'Single')), 2)
+            self.assertIsNone(resolver.combined_pattern)
+            self.assertEqual(resolver.resolve('AA'), 'Double')
+            self.assertEqual(resolver.resolve('AB'), 'Single')
+
+    def test_get_combined_pattern(self):
+        """Ensure patterns are combined into named groups, unless they cannot
+        be combined.
+
+        """
+        self.assertEqual(
+            get_combined_pattern(['ATL\\d{2}', 'GEDI.*']).pattern,
+            '(?P<mission_0>ATL\\d{2})|(?P<mission_1>GEDI.*)',
+        )
+        self.assertIsNone(get_combined_pattern([]))
+        self.assertIsNone(get_combined_pattern(['(A)\\1']))
+        self.assertIsNone(get_combined_pattern(['(?P<a>A)(?P=a)']))
+        self.assertIsNone(get_combined_pattern(['ATL03', '(?i)atl08']))
@@ -1,15 +1,32 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BufferedReader, BytesIO, RawIOBase
+from mmap import ACCESS_READ, mmap
+from os import remove
 from shutil import rmtree
 from tempfile import mkdtemp
-from unittest import TestCase
+from unittest import SkipTest, TestCase
+from unittest.mock import ANY, patch
+import json
 import re
 
-from varinfo import VarInfoFromDmr, VarInfoFromNetCDF4
+from netCDF4 import Dataset
+
+from varinfo import (
+    VarInfoFromDmr,
+    VarInfoFromDmrpp,
+    VarInfoFromNetCDF4,
+    VarInfoFromZarr,
+)
+from varinfo.parser_backends import lxml_etree
 from varinfo.exceptions import (
     InvalidConfigFileFormatError,
     MissingConfigurationFileError,
+    MissingZarrMetadataError,
+    NetCDF4FileClosedError,
 )
-from tests.utilities import write_dmr, write_skeleton_netcdf4
+from tests.utilities import write_dmr, write_skeleton_netcdf4, write_skeleton_zarr
 from varinfo.umm_var import get_dimension_information
+from varinfo.var_info import get_netcdf4_containers
 
 
 class TestVarInfoFromDmr(TestCase):
@@ -169,6 +186,208 @@ class TestVarInfoFromDmr(TestCase):
             )
             self.assertEqual(dataset.short_name, 'ATL08')
 
+    def test_var_info_streaming_short_name(self):
+        """Ensure a streaming parse retrieves the same collection short name as
+        a full parse of the `.dmr`. When a short name is present in multiple
+        locations, the earliest location listed in the configuration file
+        should take precedence, even if that is later in the document.
+
+        """
+        mock_dmr = (
+            f'<Dataset xmlns="{self.namespace}">'
+            '  <Attribute name="short_name">'
+            '    <Value>ATL08</Value>'
+            '  </Attribute>'
+            '  <Group name="METADATA">'
+            '    <Group name="DatasetIdentification">'
+            '      <Attribute name="shortName">'
+            '        <Value>ATL03</Value>'
+            '      </Attribute>'
+            '    </Group>'
+            '  </Group>'
+            '</Dataset>'
+        )
+        dmr_path = write_dmr(self.output_dir, mock_dmr)
+
+        with self.subTest('Higher priority location later in the document'):
+            dataset = VarInfoFromDmr(
+                dmr_path, config_file=self.test_config_file, streaming=True
+            )
+            self.assertEqual(dataset.short_name, 'ATL03')
+            self.assertEqual(dataset.mission, 'ICESat2')
+
+        with self.subTest('No short name'):
+            mock_dmr = f'<Dataset xmlns="{self.namespace}"></Dataset>'
+            dmr_path = write_dmr(self.output_dir, mock_dmr)
+
+            dataset = VarInfoFromDmr(
+                dmr_path, config_file=self.test_config_file, streaming=True
+            )
+
+            self.assertIsNone(dataset.short_name)
+
+        with self.subTest('Short name given in call overrides metadata'):
+            dataset = VarInfoFromDmr(
+                dmr_path,
+                short_name='ATL08',
+                config_file=self.test_config_file,
+                streaming=True,
+            )
+            self.assertEqual(dataset.short_name, 'ATL08')
+
+    def test_var_info_streaming(self):
+        """Ensure a streaming parse of a `.dmr` produces the same groups,
+        variables, dimensions and references as a parse of the full XML tree,
+        and that the XML tree is not retained afterwards.
+
+        """
+        dmr_paths = [
+            'tests/unit/data/ATL03_example.dmr',
+            'tests/unit/data/GPM_3IMERGHH_example.dmr',
+            'tests/unit/data/M2I3NPASM_example.dmr',
+            'tests/unit/data/SPL3FTP_E_example.dmr.xml',
+            self.dimension_grouping_size_dmr,
+            self.mock_dmr_two,
+            self.mock_geographic_dmr,
+        ]
+
+        for dmr_path in dmr_paths:
+            with self.subTest(dmr_path):
+                expected = VarInfoFromDmr(dmr_path, config_file=self.test_config_file)
+                streamed = VarInfoFromDmr(
+                    dmr_path, config_file=self.test_config_file, streaming=True
+                )
+
+                self.assertEqual(streamed.dataset, dmr_path)
+                self.assertEqual(streamed.short_name, expected.short_name)
+                self.assertEqual(streamed.mission, expected.mission)
+                self.assertListEqual(list(streamed.groups), list(expected.groups))
+                self.assertListEqual(list(streamed.variables), list(expected.variables))
+                self.assertDictEqual(
+                    streamed.all_dimensions_sizes, expected.all_dimensions_sizes
+                )
+                self.assertSetEqual(streamed.references, expected.references)
+
+                for group_path, group in expected.groups.items():
+                    self.assertDictEqual(
+                        streamed.groups[group_path].attributes, group.attributes
+                    )
+                    self.assertSetEqual(
+                        streamed.groups[group_path].variables, group.variables
+                    )
+
+                for variable_path, variable in expected.variables.items():
+                    streamed_variable = streamed.get_variable(variable_path)
+                    self.assertDictEqual(
+                        streamed_variable.attributes, variable.attributes
+                    )
+                    self.assertListEqual(
+                        streamed_variable.dimensions, variable.dimensions
+                    )
+                    self.assertListEqual(streamed_variable.shape, variable.shape)
+                    self.assertDictEqual(
+                        streamed_variable.references, variable.references
+                    )
+
+    def test_var_info_from_dmr_sources(self):
+        """Ensure a `VarInfoFromDmr` instance can be created from the content
+        of a `.dmr` held in memory, in a binary file-like object or in a
+        memory-mapped file, with the same results as reading the file path.
+        This should be true for both the streaming and full tree parsing
+        modes. A file-like object that cannot seek should also be supported
+        when streaming, as the document is read more than once.
+
+        """
+        dmr_path = 'tests/unit/data/ATL03_example.dmr'
+        expected = VarInfoFromDmr(dmr_path, config_file=self.test_config_file)
+
+        with open(dmr_path, 'rb') as file_handler:
+            dmr_bytes = file_handler.read()
+
+        class NonSeekableStream(RawIOBase):
+            """A readable stream that cannot seek, similar to a socket."""
+
+            def __init__(self, content):
+                self.content = BytesIO(content)
+
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                return self.content.readinto(buffer)
+
+        for streaming in [False, True]:
+            dmr_sources = {
+                'bytes': dmr_bytes,
+                'bytearray': bytearray(dmr_bytes),
+                'memoryview': memoryview(dmr_bytes),
+                'BytesIO': BytesIO(dmr_bytes),
+                'non-seekable stream': BufferedReader(NonSeekableStream(dmr_bytes)),
+            }
+
+            for description, dmr_source in dmr_sources.items():
+                with self.subTest(f'{description}, streaming: {streaming}'):
+                    var_info = VarInfoFromDmr(
+                        dmr_source,
+                        config_file=self.test_config_file,
+                        streaming=streaming,
+                    )
+
+                    self.assertEqual(var_info.short_name, expected.short_name)
+                    self.assertEqual(var_info.namespace, expected.namespace)
+                    self.assertListEqual(list(var_info.groups), list(expected.groups))
+                    self.assertListEqual(
+                        list(var_info.variables), list(expected.variables)
+                    )
+                    self.assertDictEqual(
+                        var_info.all_dimensions_sizes,
+                        expected.all_dimensions_sizes,
+                    )
+
+            with self.subTest(f'mmap, streaming: {streaming}'):
+                with open(dmr_path, 'rb') as file_handler, mmap(
+                    file_handler.fileno(), 0, access=ACCESS_READ
+                ) as dmr_mmap:
+                    var_info = VarInfoFromDmr(
+                        dmr_mmap,
+                        config_file=self.test_config_file,
+                        streaming=streaming,
+                    )
+
+                self.assertEqual(var_info.short_name, expected.short_name)
+                self.assertListEqual(list(var_info.variables), list(expected.variables))
+
+        with self.subTest('File-like object read from current position'):
+            file_object = BytesIO(b'prefix' + dmr_bytes)
+            file_object.seek(len(b'prefix'))
+            var_info = VarInfoFromDmr(
+                file_object, config_file=self.test_config_file, streaming=True
+            )
+            self.assertListEqual(list(var_info.variables), list(expected.variables))
+
+    def test_var_info_from_dmr_encoding(self):
+        """Ensure that the bytes of a `.dmr` are decoded according to the XML
+        declaration of the document, rather than assuming UTF-8.
+
+        """
+        dmr_content = (
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            '<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#" name="test">'
+            '<Float64 name="temp"><Attribute name="units" type="String">'
+            '<Value>\u00b0C</Value></Attribute></Float64></Dataset>'
+        ).encode('iso-8859-1')
+
+        for streaming in [False, True]:
+            with self.subTest(f'streaming: {streaming}'):
+                var_info = VarInfoFromDmr(
+                    dmr_content,
+                    config_file=self.test_config_file,
+                    streaming=streaming,
+                )
+                self.assertEqual(
+                    var_info.get_variable('/temp').attributes['units'], '\u00b0C'
+                )
+
     def test_var_info_mission(self):
         """Ensure VarInfo can identify the correct mission given a collection
         short name, or absence of one.
@@ -235,6 +454,27 @@ class TestVarInfoFromDmr(TestCase):
                 config_file='bad_file_path.json',
             )
 
+    def test_var_info_shared_configuration(self):
+        """Ensure instances for granules of the same collection share the
+        parsed configuration file and `CFConfig` instance, while granules of
+        a different collection have their own `CFConfig` instance.
+
+        """
+        first_var_info = VarInfoFromDmr(
+            self.mock_dmr_two, config_file=self.test_config_file
+        )
+        second_var_info = VarInfoFromDmr(
+            self.mock_dmr_two, config_file=self.test_config_file
+        )
+        atl03_var_info = VarInfoFromDmr(
+            'tests/unit/data/ATL03_example.dmr', config_file=self.test_config_file
+        )
+
+        self.assertIs(first_var_info.var_info_config, second_var_info.var_info_config)
+        self.assertIs(first_var_info.cf_config, second_var_info.cf_config)
+        self.assertIsNot(first_var_info.cf_config, atl03_var_info.cf_config)
+        self.assertEqual(atl03_var_info.cf_config.short_name, 'ATL03')
+
     def test_var_info_invalid_configuration_file_format(self):
         """Ensure an InvalidConfigFileFormatError is raised when the specified
         configuration file path is not a non-JSON file.
@@ -871,6 +1111,144 @@ class TestVarInfoFromDmr(TestCase):
             dataset.group_variables_by_horizontal_dimensions(), expected_groups
         )
 
+    def test_var_info_group_filters(self):
+        """Ensure only groups selected by the include and exclude patterns are
+        parsed from a `.dmr`, with the same variables and attributes as the
+        corresponding subset of a full parse. References to variables within
+        groups that were not parsed are recorded as unresolved.
+
+        """
+        atl03_dmr = 'tests/unit/data/ATL03_example.dmr'
+        expected = VarInfoFromDmr(atl03_dmr, config_file=self.test_config_file)
+        include_groups = ['/gt1l/.*', '/ancillary_data/', '/orbit_info/']
+
+        for streaming in [False, True]:
+            with self.subTest(f'Include patterns, streaming: {streaming}'):
+                dataset = VarInfoFromDmr(
+                    atl03_dmr,
+                    config_file=self.test_config_file,
+                    streaming=streaming,
+                    include_groups=include_groups,
+                )
+
+                self.assertEqual(dataset.short_name, 'ATL03')
+                self.assertSetEqual(
+                    set(dataset.variables),
+                    {
+                        variable_path
+                        for variable_path in expected.variables
+                        if re.match(
+                            r'/(gt1l|ancillary_data|orbit_info)/|/[^/]+$', variable_path
+                        )
+                    },
+                )
+                self.assertSetEqual(
+                    set(dataset.groups),
+                    {
+                        group_path
+                        for group_path in expected.groups
+                        if re.match(
+                            r'/$|/(gt1l|ancillary_data|orbit_info)\b', group_path
+                        )
+                    },
+                )
+                self.assertDictEqual(
+                    dataset.get_variable('/gt1l/heights/h_ph').attributes,
+                    expected.get_variable('/gt1l/heights/h_ph').attributes,
+                )
+                self.assertSetEqual(dataset.unresolved_references, set())
+
+        with self.subTest('Exclude patterns prune whole subtrees'):
+            dataset = VarInfoFromDmr(
+                atl03_dmr,
+                config_file=self.test_config_file,
+                exclude_groups=['/gt[123][lr]/', '/METADATA/'],
+            )
+
+            self.assertFalse(
+                any(
+                    re.match(r'/(gt[123][lr]|METADATA)/', variable_path)
+                    for variable_path in dataset.variables
+                )
+            )
+            self.assertIn('/ancillary_data/atlas_sdp_gps_epoch', dataset.variables)
+            self.assertNotIn('/METADATA', dataset.groups)
+
+        with self.subTest('References into groups not parsed are unresolved'):
+            dataset = VarInfoFromDmr(
+                atl03_dmr,
+                config_file=self.test_config_file,
+                include_groups=['/quality_assessment/gt3r/'],
+            )
+
+            self.assertNotIn('/quality_assessment', dataset.groups)
+            self.assertIn('/quality_assessment/gt3r', dataset.groups)
+            self.assertIn(
+                '/quality_assessment/delta_time', dataset.unresolved_references
+            )
+            self.assertNotIn('/quality_assessment/delta_time', dataset.references)
+
+    def test_var_info_dmrpp(self):
+        """Ensure a DMR++ can be parsed by the `VarInfoFromDmrpp` class, with
+        the same groups, variables and dimensions as when the same document
+        is parsed by `VarInfoFromDmr`. If requested, the chunk manifest of
+        each variable should be summarised.
+
+        """
+        dmrpp_path = 'tests/unit/data/mock_example.dmrpp'
+        expected = VarInfoFromDmr(dmrpp_path, config_file=self.test_config_file)
+        expected_chunk_summaries = {
+            '/latitude': {'chunk_count': 1, 'byte_total': 32, 'filters': []},
+            '/longitude': {'chunk_count': 1, 'byte_total': 48, 'filters': []},
+            '/science': {
+                'chunk_count': 4,
+                'byte_total': 75,
+                'filters': ['shuffle', 'deflate'],
+            },
+        }
+
+        for streaming in [False, True]:
+            with self.subTest(f'Streaming: {streaming}'):
+                dataset = VarInfoFromDmrpp(
+                    dmrpp_path,
+                    config_file=self.test_config_file,
+                    streaming=streaming,
+                    chunk_summary=True,
+                )
+
+                self.assertEqual(dataset.short_name, 'FAKE99')
+                self.assertEqual(dataset.mission, 'FakeSat')
+                self.assertListEqual(list(dataset.groups), list(expected.groups))
+                self.assertListEqual(list(dataset.variables), list(expected.variables))
+                self.assertDictEqual(
+                    dataset.all_dimensions_sizes, expected.all_dimensions_sizes
+                )
+                self.assertSetEqual(
+                    dataset.get_science_variables(), expected.get_science_variables()
+                )
+                self.assertSetEqual(
+                    dataset.get_required_variables({'/science'}),
+                    expected.get_required_variables({'/science'}),
+                )
+
+                for variable_path, variable in dataset.variables.items():
+                    self.assertDictEqual(
+                        variable.attributes,
+                        expected.variables[variable_path].attributes,
+                    )
+                    self.assertListEqual(
+                        variable.shape, expected.variables[variable_path].shape
+                    )
+
+                self.assertDictEqual(dataset.chunk_summaries, expected_chunk_summaries)
+
+        with self.subTest('Chunk summaries are not collected by default'):
+            dataset = VarInfoFromDmrpp(dmrpp_path, config_file=self.test_config_file)
+            self.assertDictEqual(dataset.chunk_summaries, {})
+            self.assertSetEqual(
+                dataset.get_science_variables(), expected.get_science_variables()
+            )
+
     def test_var_info_netcdf4(self):
         """Ensure a NetCDF-4 file can be parsed by the `VarInfoFromNetCDF4`
         class, with the expected results.
@@ -902,6 +1280,446 @@ class TestVarInfoFromDmr(TestCase):
         # Groups should now be saved to a new dictionary:
         self.assertSetEqual(set(dataset.groups.keys()), {'/', '/group'})
 
+    def test_var_info_netcdf4_single_open(self):
+        """Ensure the NetCDF-4 file is only opened once, and is used for both
+        the collection short name search and the extraction of variables. The
+        file should be closed after parsing, including if an exception is
+        raised, and the dataset should be set back to the file path.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+
+        opened_datasets = []
+
+        def open_dataset(*args):
+            """Open the NetCDF-4 file, retaining the `netCDF4.Dataset`."""
+            opened_datasets.append(Dataset(*args))
+            return opened_datasets[-1]
+
+        with self.subTest('File is opened once and closed after parsing'):
+            with patch('varinfo.var_info.Dataset', side_effect=open_dataset):
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_path, config_file=self.test_config_file
+                )
+
+            self.assertEqual(len(opened_datasets), 1)
+            self.assertFalse(opened_datasets[0].isopen())
+            self.assertEqual(dataset.short_name, 'ATL03')
+            self.assertEqual(dataset.dataset, netcdf4_path)
+            self.assertSetEqual(
+                dataset.get_science_variables(), {'/group/science2', '/science1'}
+            )
+
+        opened_datasets.clear()
+
+        with self.subTest('File is closed if an exception is raised'):
+            with patch('varinfo.var_info.Dataset', side_effect=open_dataset):
+                with patch.object(
+                    VarInfoFromNetCDF4,
+                    '_parse_group',
+                    side_effect=KeyError('parse failure'),
+                ):
+                    with self.assertRaises(KeyError):
+                        VarInfoFromNetCDF4(
+                            netcdf4_path, config_file=self.test_config_file
+                        )
+
+            self.assertEqual(len(opened_datasets), 1)
+            self.assertFalse(opened_datasets[0].isopen())
+
+    def test_var_info_netcdf4_open_dataset(self):
+        """Ensure an open `netCDF4.Dataset` or `netCDF4.Group` can be parsed by
+        the `VarInfoFromNetCDF4` class, and that it is not closed afterwards.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+
+        with Dataset(netcdf4_path, 'r') as netcdf4_dataset:
+            with self.subTest('Open netCDF4.Dataset'):
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_dataset, config_file=self.test_config_file
+                )
+
+                self.assertTrue(netcdf4_dataset.isopen())
+                self.assertIs(dataset.dataset, netcdf4_dataset)
+                self.assertEqual(dataset.short_name, 'ATL03')
+                self.assertSetEqual(
+                    dataset.get_science_variables(), {'/group/science2', '/science1'}
+                )
+                self.assertSetEqual(set(dataset.groups.keys()), {'/', '/group'})
+
+            with self.subTest('Open netCDF4.Group'):
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_dataset['/group'],
+                    short_name='ATL03',
+                    config_file=self.test_config_file,
+                )
+
+                self.assertTrue(netcdf4_dataset.isopen())
+                self.assertSetEqual(
+                    dataset.get_science_variables(), {'/group/science2'}
+                )
+                self.assertSetEqual(set(dataset.groups.keys()), {'/group'})
+
+    def test_var_info_netcdf4_in_memory(self):
+        """Ensure the content of a NetCDF-4 file held in memory can be parsed
+        by the `VarInfoFromNetCDF4` class, with the same results as parsing the
+        file from disk, and without writing the content to disk.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+        expected = VarInfoFromNetCDF4(netcdf4_path, config_file=self.test_config_file)
+
+        with open(netcdf4_path, 'rb') as file_handler:
+            netcdf4_content = file_handler.read()
+
+        with open(netcdf4_path, 'rb') as file_handler:
+            memory_map = mmap(file_handler.fileno(), 0, access=ACCESS_READ)
+
+        with open(netcdf4_path, 'rb') as file_handler:
+            sources = {
+                'bytes': netcdf4_content,
+                'bytearray': bytearray(netcdf4_content),
+                'memoryview': memoryview(netcdf4_content),
+                'mmap': memory_map,
+                'BytesIO': BytesIO(netcdf4_content),
+                'BufferedReader': file_handler,
+            }
+
+            for description, source in sources.items():
+                with self.subTest(description):
+                    with patch('varinfo.var_info.Dataset', wraps=Dataset) as dataset:
+                        var_info = VarInfoFromNetCDF4(
+                            source, config_file=self.test_config_file
+                        )
+
+                    dataset.assert_called_once_with('in-memory.nc4', 'r', memory=ANY)
+                    self.assertIs(var_info.dataset, source)
+                    self.assertEqual(var_info.short_name, expected.short_name)
+                    self.assertSetEqual(
+                        set(var_info.variables.keys()), set(expected.variables.keys())
+                    )
+                    self.assertDictEqual(
+                        var_info.all_dimensions_sizes, expected.all_dimensions_sizes
+                    )
+                    self.assertSetEqual(
+                        set(var_info.groups.keys()), set(expected.groups.keys())
+                    )
+
+        memory_map.close()
+
+    def test_var_info_netcdf4_parallel(self):
+        """Ensure the top-level groups of a NetCDF-4 file can be parsed in
+        parallel, with the same results as a serial traversal, including the
+        order of groups and variables, and the attributes and dimensions of
+        every variable. If the file is not specified via a path, or there are
+        fewer than two top-level groups, the file is parsed serially.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+
+        with Dataset(netcdf4_path, 'a') as dataset:
+            dataset.createGroup('/group2').setncatts({'group_attribute': 'two'})
+            dataset.createVariable(
+                '/group2/science3', 'f8', dimensions=('time', 'lat', 'lon')
+            ).setncatts({'coordinates': '/lat /lon', 'units': 'K'})
+            dataset.createVariable(
+                '/group3/nested/science4', 'f8', dimensions=('lat', 'lon')
+            ).setncatts({'coordinates': '../../lat ../../lon'})
+
+        expected = VarInfoFromNetCDF4(netcdf4_path, config_file=self.test_config_file)
+
+        with self.subTest('Top-level groups are parsed in parallel'):
+            with patch(
+                'varinfo.var_info.ProcessPoolExecutor', wraps=ProcessPoolExecutor
+            ) as mock_executor:
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_path, config_file=self.test_config_file, max_workers=2
+                )
+
+            mock_executor.assert_called_once_with(max_workers=2, mp_context=ANY)
+            self.assertListEqual(
+                list(dataset.variables.keys()), list(expected.variables.keys())
+            )
+            self.assertListEqual(
+                list(dataset.groups.keys()), list(expected.groups.keys())
+            )
+            self.assertDictEqual(
+                dataset.all_dimensions_sizes, expected.all_dimensions_sizes
+            )
+            self.assertSetEqual(dataset.references, expected.references)
+
+            for variable_path, expected_variable in expected.variables.items():
+                variable = dataset.get_variable(variable_path)
+                self.assertDictEqual(
+                    variable.attributes.copy(), expected_variable.attributes.copy()
+                )
+                self.assertListEqual(variable.dimensions, expected_variable.dimensions)
+                self.assertSetEqual(
+                    variable.get_references(), expected_variable.get_references()
+                )
+
+            for group_path, expected_group in expected.groups.items():
+                self.assertDictEqual(
+                    dataset.groups[group_path].attributes.copy(),
+                    expected_group.attributes.copy(),
+                )
+                self.assertSetEqual(
+                    dataset.groups[group_path].variables, expected_group.variables
+                )
+
+        with self.subTest('A single top-level group is parsed serially'):
+            with patch('varinfo.var_info.ProcessPoolExecutor') as mock_executor:
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_path,
+                    config_file=self.test_config_file,
+                    max_workers=2,
+                    include_groups=['/group2'],
+                )
+
+            mock_executor.assert_not_called()
+            self.assertIn('/group2/science3', dataset.variables)
+            self.assertNotIn('/group3/nested/science4', dataset.variables)
+
+        with self.subTest('In-memory content is parsed serially'):
+            with open(netcdf4_path, 'rb') as file_handler:
+                netcdf4_content = file_handler.read()
+
+            with patch('varinfo.var_info.ProcessPoolExecutor') as mock_executor:
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_content, config_file=self.test_config_file, max_workers=2
+                )
+
+            mock_executor.assert_not_called()
+            self.assertListEqual(
+                list(dataset.variables.keys()), list(expected.variables.keys())
+            )
+
+        with self.subTest('Single worker is parsed serially'):
+            with patch('varinfo.var_info.ProcessPoolExecutor') as mock_executor:
+                VarInfoFromNetCDF4(
+                    netcdf4_path, config_file=self.test_config_file, max_workers=1
+                )
+
+            mock_executor.assert_not_called()
+
+    def test_var_info_netcdf4_lazy(self):
+        """Ensure that, in lazy mode, only the paths of groups and variables
+        are recorded on instantiation, and each group is parsed when it, or
+        one of its variables, is first retrieved. Methods requiring all
+        variables should parse all remaining groups, after which the results
+        should match those from an eager traversal, and the file is closed.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+        expected = VarInfoFromNetCDF4(netcdf4_path, config_file=self.test_config_file)
+
+        with self.subTest('Only paths are indexed on instantiation'):
+            dataset = VarInfoFromNetCDF4(
+                netcdf4_path, config_file=self.test_config_file, lazy=True
+            )
+
+            self.assertListEqual(list(dataset.groups), list(expected.groups))
+            self.assertListEqual(list(dataset.variables), list(expected.variables))
+            self.assertFalse(any(map(dataset.groups.is_parsed, dataset.groups)))
+            self.assertFalse(any(map(dataset.variables.is_parsed, dataset.variables)))
+            self.assertTrue(dataset.owns_dataset)
+            self.assertSetEqual(set(dataset.unparsed_groups), {'/', '/group'})
+
+        with self.subTest('Retrieving a variable only parses its group'):
+            variable = dataset.get_variable('/group/science2')
+
+            self.assertEqual(variable.full_name_path, '/group/science2')
+            self.assertTrue(dataset.variables.is_parsed('/group/scalar2'))
+            self.assertTrue(dataset.groups.is_parsed('/group'))
+            self.assertFalse(dataset.variables.is_parsed('/science1'))
+            self.assertFalse(dataset.groups.is_parsed('/'))
+            self.assertSetEqual(set(dataset.unparsed_groups), {'/'})
+            self.assertTrue(dataset.owns_dataset)
+
+        with self.subTest('Global queries parse all groups and close the file'):
+            self.assertSetEqual(
+                dataset.get_science_variables(), expected.get_science_variables()
+            )
+            self.assertSetEqual(
+                dataset.get_metadata_variables(), expected.get_metadata_variables()
+            )
+            self.assertDictEqual(
+                dataset.all_dimensions_sizes, expected.all_dimensions_sizes
+            )
+            self.assertSetEqual(dataset.references, expected.references)
+            self.assertListEqual(list(dataset.variables), list(expected.variables))
+            self.assertDictEqual(dataset.unparsed_groups, {})
+            self.assertFalse(dataset.owns_dataset)
+            self.assertEqual(dataset.dataset, netcdf4_path)
+
+        with self.subTest('Required variables parse referenced groups'):
+            with VarInfoFromNetCDF4(
+                netcdf4_path, config_file=self.test_config_file, lazy=True
+            ) as dataset:
+                self.assertSetEqual(
+                    dataset.get_required_variables({'/group/science2'}),
+                    expected.get_required_variables({'/group/science2'}),
+                )
+
+            self.assertFalse(dataset.owns_dataset)
+
+        with self.subTest('Unparsed groups cannot be retrieved after close'):
+            with VarInfoFromNetCDF4(
+                netcdf4_path, config_file=self.test_config_file, lazy=True
+            ) as dataset:
+                dataset.get_variable('/science1')
+
+            self.assertFalse(dataset.owns_dataset)
+            self.assertEqual(
+                dataset.get_variable('/science1').full_name_path, '/science1'
+            )
+
+            with self.assertRaises(NetCDF4FileClosedError):
+                dataset.get_variable('/group/science2')
+
+            with self.assertRaises(NetCDF4FileClosedError):
+                dataset.groups['/group']
+
+        with self.subTest('Supplied dataset closed before parsing'):
+            with Dataset(netcdf4_path, 'r') as netcdf4_dataset:
+                dataset = VarInfoFromNetCDF4(
+                    netcdf4_dataset, config_file=self.test_config_file, lazy=True
+                )
+
+            with self.assertRaises(NetCDF4FileClosedError):
+                dataset.variables['/group/science2']
+
+    def test_var_info_netcdf4_group_filters(self):
+        """Ensure only groups selected by the include and exclude patterns are
+        parsed from a NetCDF-4 file, in both eager and lazy modes. References
+        from parsed variables to variables within pruned groups are recorded
+        as unresolved.
+
+        """
+        netcdf4_path = write_skeleton_netcdf4(self.output_dir)
+
+        with Dataset(netcdf4_path, 'r+') as dataset:
+            dataset['/science1'].setncattr('ancillary_variables', '/group/scalar2')
+
+        for lazy in [False, True]:
+            with self.subTest(f'Excluded group is pruned, lazy: {lazy}'):
+                with VarInfoFromNetCDF4(
+                    netcdf4_path,
+                    config_file=self.test_config_file,
+                    lazy=lazy,
+                    exclude_groups=['/group/'],
+                ) as dataset:
+                    self.assertListEqual(list(dataset.groups), ['/'])
+                    self.assertSetEqual(
+                        set(dataset.variables),
+                        {'/lat', '/lon', '/time', '/science1', '/scalar1'},
+                    )
+                    self.assertSetEqual(
+                        dataset.get_required_variables({'/science1'}),
+                        {'/lat', '/lon', '/time', '/science1'},
+                    )
+                    self.assertSetEqual(
+                        dataset.unresolved_references, {'/group/scalar2'}
+                    )
+
+        with self.subTest('Pruned groups are not traversed'):
+            with patch(
+                'varinfo.var_info.get_netcdf4_containers',
+                wraps=get_netcdf4_containers,
+            ) as mock_get_containers:
+                VarInfoFromNetCDF4(
+                    netcdf4_path,
+                    config_file=self.test_config_file,
+                    exclude_groups=['/group/'],
+                )
+
+            self.assertListEqual(
+                [call.args[0].path for call in mock_get_containers.call_args_list],
+                ['/'],
+            )
+
+        with self.subTest('Included group'):
+            dataset = VarInfoFromNetCDF4(
+                netcdf4_path,
+                config_file=self.test_config_file,
+                include_groups=['/group/'],
+            )
+            self.assertListEqual(list(dataset.groups), ['/', '/group'])
+            self.assertIn('/group/science2', dataset.variables)
+            self.assertSetEqual(dataset.unresolved_references, set())
+
+    def test_var_info_zarr(self):
+        """Ensure a Zarr store with consolidated metadata can be parsed by the
+        `VarInfoFromZarr` class, with the same results as for a NetCDF-4 file
+        with the same structure. Only the `.zmetadata` file should be read.
+
+        """
+        zarr_path = write_skeleton_zarr(self.output_dir)
+        expected = VarInfoFromNetCDF4(
+            write_skeleton_netcdf4(self.output_dir), config_file=self.test_config_file
+        )
+
+        with self.subTest('Zarr store directory'):
+            with patch('varinfo.var_info.open', wraps=open) as mock_open:
+                dataset = VarInfoFromZarr(zarr_path, config_file=self.test_config_file)
+
+            self.assertListEqual(
+                [
+                    open_call.args[0]
+                    for open_call in mock_open.call_args_list
+                    if open_call.args[0].startswith(zarr_path)
+                ],
+                [f'{zarr_path}/.zmetadata'],
+            )
+            self.assertEqual(dataset.short_name, 'ATL03')
+            self.assertEqual(dataset.mission, 'ICESat2')
+            self.assertDictEqual(
+                dataset.all_dimensions_sizes, expected.all_dimensions_sizes
+            )
+            self.assertSetEqual(
+                dataset.get_science_variables(), expected.get_science_variables()
+            )
+            self.assertSetEqual(
+                dataset.get_metadata_variables(), expected.get_metadata_variables()
+            )
+            self.assertSetEqual(
+                dataset.get_required_variables({'/group/science2'}),
+                expected.get_required_variables({'/group/science2'}),
+            )
+            self.assertSetEqual(set(dataset.groups), set(expected.groups))
+            self.assertSetEqual(
+                dataset.groups['/'].variables, expected.groups['/'].variables
+            )
+            self.assertDictEqual(
+                dataset.groups['/'].attributes, expected.groups['/'].attributes
+            )
+
+            science_variable = dataset.get_variable('/group/science2')
+            self.assertEqual(science_variable.data_type, 'float64')
+            self.assertTupleEqual(science_variable.shape, (1, 2, 2))
+            self.assertListEqual(
+                science_variable.dimensions,
+                expected.get_variable('/group/science2').dimensions,
+            )
+
+        with self.subTest('Consolidated metadata file or dictionary'):
+            with open(f'{zarr_path}/.zmetadata', encoding='utf-8') as file_handler:
+                consolidated_metadata = json.load(file_handler)
+
+            for zarr_source in [f'{zarr_path}/.zmetadata', consolidated_metadata]:
+                dataset = VarInfoFromZarr(zarr_source, short_name='ATL03')
+                self.assertSetEqual(set(dataset.variables), set(expected.variables))
+
+        with self.subTest('No consolidated metadata raises an exception'):
+            remove(f'{zarr_path}/.zmetadata')
+
+            with self.assertRaises(MissingZarrMetadataError):
+                VarInfoFromZarr(zarr_path)
+
+            with self.assertRaises(MissingZarrMetadataError):
+                VarInfoFromZarr({'zarr_consolidated_format': 1})
+
     def test_is_science_variable(self):
         """Ensure that a science variable is correctly recognized and
         a spatial or temporal variable is correctly excluded.
@@ -1147,3 +1965,72 @@ class TestVarInfoFromDmr(TestCase):
         self.assertFalse(variable.is_latitude())
         self.assertFalse(variable.is_temporal())
         self.assertFalse(variable.is_projection_x_or_y())
+
+    def test_traverse_elements_compatibility(self):
+        """Ensure `traverse_elements` can be called without a list of
+        unresolved shapes, resolving shapes referring to a `Dimension`
+        declared later in the document, and that the deprecated
+        `find_all_dimensions_sizes` still records all `Dimension` sizes.
+
+        """
+        dmr_path = write_dmr(
+            self.output_dir,
+            '<Dataset xmlns="http://xml.opendap.org/ns/DAP/4.0#">'
+            '  <Float64 name="science">'
+            '    <Dim name="/group/time"/>'
+            '  </Float64>'
+            '  <Group name="group">'
+            '    <Dimension name="time" size="3"/>'
+            '  </Group>'
+            '</Dataset>',
+        )
+        var_info = VarInfoFromDmr(dmr_path, parser_backend='etree')
+        self.assertListEqual(var_info.get_variable('/science').shape, [3])
+
+        with self.subTest('traverse_elements resolves shapes by default'):
+            var_info.all_dimensions_sizes = {}
+            var_info.traverse_elements(var_info.dataset, '/')
+            self.assertListEqual(var_info.get_variable('/science').shape, [3])
+
+        with self.subTest('find_all_dimensions_sizes is deprecated'):
+            var_info.all_dimensions_sizes = {}
+
+            with self.assertWarns(DeprecationWarning):
+                var_info.find_all_dimensions_sizes(var_info.dataset, set(), '/')
+
+            self.assertDictEqual(var_info.all_dimensions_sizes, {'/group/time': 3})
+
+
+class TestVarInfoFromDmrLxml(TestVarInfoFromDmr):
+    """Run all tests for the `VarInfoFromDmr` class using the "lxml" parser
+    backend, to ensure it produces identical results to the default backend.
+
+    """
+
+    parser_backend = 'lxml'
+
+    @classmethod
+    def setUpClass(cls):
+        """Use the parser backend for all `VarInfoFromDmr` instances."""
+        if cls.parser_backend == 'lxml' and lxml_etree is None:
+            raise SkipTest('lxml is not installed.')
+
+        cls.parser_backend_patch = patch.object(
+            VarInfoFromDmr, 'parser_backend', cls.parser_backend
+        )
+        cls.parser_backend_patch.start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parser_backend_patch.stop()
+        super().tearDownClass()
+
+
+class TestVarInfoFromDmrExpat(TestVarInfoFromDmrLxml):
+    """Run all tests for the `VarInfoFromDmr` class using the "expat" parser
+    backend, to ensure it produces identical results to the default backend.
+
+    """
+
+    parser_backend = 'expat'
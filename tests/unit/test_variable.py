@@ -2,10 +2,10 @@ from unittest import TestCase
 import xml.etree.ElementTree as ET
 
 from netCDF4 import Dataset
-from numpy import float64
+from numpy import array, float64
 
 from varinfo import CFConfig
-from varinfo import VariableFromDmr, VariableFromNetCDF4
+from varinfo import VariableFromDmr, VariableFromNetCDF4, VariableFromZarr
 
 
 class TestVariableFromDmr(TestCase):
@@ -773,6 +773,17 @@ class TestVariableFromDmr(TestCase):
 
                 self.assertEqual(variable.get_valid_min(), expected_valid_min)
 
+        with self.subTest('valid_range as a NumPy array'):
+            variable = VariableFromDmr(
+                ET.fromstring(self.no_range_string),
+                self.fakesat_config,
+                self.namespace,
+                '/variable',
+                self.fake_all_dimensions_sizes,
+            )
+            variable.attributes['valid_range'] = array([-180.0, 180.0])
+            self.assertEqual(variable.get_valid_min(), -180.0)
+
     def test_get_valid_max(self):
         """Ensure the correct valid maximum of the variable range is extracted
         from a variable based on the `valid_max` metadata attribute, or if
@@ -801,6 +812,17 @@ class TestVariableFromDmr(TestCase):
 
                 self.assertEqual(variable.get_valid_max(), expected_valid_max)
 
+        with self.subTest('valid_range as a NumPy array'):
+            variable = VariableFromDmr(
+                ET.fromstring(self.no_range_string),
+                self.fakesat_config,
+                self.namespace,
+                '/variable',
+                self.fake_all_dimensions_sizes,
+            )
+            variable.attributes['valid_range'] = array([-180.0, 180.0])
+            self.assertEqual(variable.get_valid_max(), 180.0)
+
     def test_variable_get_shape(self):
         """Ensure that all variable shapes are returned when requesting
         variable.shape and dimension.
@@ -923,6 +945,98 @@ class TestVariableFromDmr(TestCase):
             self.assertEqual(variable.dimensions, [])
             self.assertEqual(variable.shape, [2222])
 
+    def test_variable_get_shape_mixed_anonymous_and_named(self):
+        """Ensure that the shape follows the order of the `<Dim />` elements
+        when anonymous dimensions, with only a size, are mixed with named
+        dimensions without a size. Named dimensions without a known size are
+        omitted.
+
+        """
+        with self.subTest('Anonymous dimensions either side of a named one'):
+            dmr_variable = ET.fromstring(
+                f'<{self.namespace}Float64 name="science">'
+                f' <{self.namespace}Dim size="3"/>'
+                f' <{self.namespace}Dim name="/latitude"/>'
+                f' <{self.namespace}Dim size="4"/>'
+                f' <{self.namespace}Dim name="/longitude"/>'
+                f'</{self.namespace}Float64>'
+            )
+
+            variable = VariableFromDmr(
+                dmr_variable,
+                self.fakesat_config,
+                self.namespace,
+                '/science',
+                self.fake_all_dimensions_sizes,
+            )
+
+            self.assertListEqual(variable.dimensions, ['/latitude', '/longitude'])
+            self.assertListEqual(variable.shape, [3, 1800, 4, 3600])
+
+        with self.subTest('Repeated named dimension'):
+            dmr_variable = ET.fromstring(
+                f'<{self.namespace}Float64 name="science">'
+                f' <{self.namespace}Dim size="2"/>'
+                f' <{self.namespace}Dim name="/time"/>'
+                f' <{self.namespace}Dim name="/time"/>'
+                f'</{self.namespace}Float64>'
+            )
+
+            variable = VariableFromDmr(
+                dmr_variable,
+                self.fakesat_config,
+                self.namespace,
+                '/science',
+                self.fake_all_dimensions_sizes,
+            )
+
+            self.assertListEqual(variable.shape, [2, 1, 1])
+
+        with self.subTest('Named dimension with unknown size'):
+            dmr_variable = ET.fromstring(
+                f'<{self.namespace}Float64 name="science">'
+                f' <{self.namespace}Dim name="/unknown"/>'
+                f' <{self.namespace}Dim name="/latitude"/>'
+                f'</{self.namespace}Float64>'
+            )
+
+            variable = VariableFromDmr(
+                dmr_variable,
+                self.fakesat_config,
+                self.namespace,
+                '/science',
+                self.fake_all_dimensions_sizes,
+            )
+
+            self.assertListEqual(variable.shape, [1800])
+
+    def test_variable_resolve_shape(self):
+        """Ensure the shape of a variable can be set again from its `Dim`
+        elements, once the size of a `Dimension` declared later in the `.dmr`
+        has been recorded.
+
+        """
+        all_dimensions_sizes = {'/latitude': 1800}
+        dimensions_element = ET.fromstring(
+            f'<{self.namespace}Float64 name="science">'
+            f' <{self.namespace}Dim name="/time"/>'
+            f' <{self.namespace}Dim name="/latitude"/>'
+            f'</{self.namespace}Float64>'
+        )
+
+        variable = VariableFromDmr(
+            dimensions_element,
+            self.fakesat_config,
+            self.namespace,
+            '/science',
+            all_dimensions_sizes,
+        )
+        self.assertListEqual(variable.shape, [1800])
+
+        all_dimensions_sizes['/time'] = 5
+        variable.resolve_shape(dimensions_element)
+        self.assertListEqual(variable.shape, [5, 1800])
+
     def test_variable_from_netcdf4(self):
         """Ensure that a `netCDF4.Variable` instance can be correctly
         parsed by the `VariableFromNetCDF4` child class.
@@ -968,3 +1082,41 @@ class TestVariableFromDmr(TestCase):
         self.assertEqual(variable.get_valid_min(), -10)
         self.assertEqual(variable.get_valid_max(), 10)
         self.assertSetEqual(variable.get_references(), {'/lat', '/lon'})
+
+    def test_variable_from_zarr(self):
+        """Ensure that an array from the consolidated metadata of a Zarr store
+        can be correctly parsed by the `VariableFromZarr` child class. The
+        dimensions should be taken from the "_ARRAY_DIMENSIONS" attribute, and
+        qualified relative to the group containing the array.
+
+        """
+        variable = VariableFromZarr(
+            {
+                'zarray': {'dtype': '<i2', 'fill_value': -1, 'shape': [3, 2]},
+                'attributes': {
+                    '_ARRAY_DIMENSIONS': ['lat', 'lon'],
+                    'coordinates': '/lat /lon',
+                    'valid_range': [-10, 10],
+                },
+            },
+            self.fakesat_config,
+            self.namespace,
+            '/science_group/science',
+        )
+
+        self.assertEqual(variable.full_name_path, '/science_group/science')
+        self.assertEqual(variable.data_type, 'int16')
+        self.assertTupleEqual(variable.shape, (3, 2))
+        self.assertListEqual(
+            variable.dimensions, ['/science_group/lat', '/science_group/lon']
+        )
+        self.assertSetEqual(
+            set(variable.attributes.keys()),
+            {'_FillValue', 'coordinates', 'valid_range', 'collection_override'},
+        )
+        self.assertEqual(variable.attributes['_FillValue'], -1)
+        self.assertListEqual(variable.get_range(), [-10, 10])
+        self.assertSetEqual(
+            variable.get_references(),
+            {'/lat', '/lon', '/science_group/lat', '/science_group/lon'},
+        )
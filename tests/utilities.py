@@ -1,6 +1,8 @@
 """Utility classes used to extend the unittest capabilities"""
 
 from typing import Dict
+import json
+import os
 
 from netCDF4 import Dataset
 from numpy import float64
@@ -90,3 +92,107 @@ def create_science_variable(dataset: Dataset, variable_name: str):
     variable.setncatts(
         {'coordinates': '/lat /lon', 'description': 'A science variable for testing'}
     )
+
+
+def write_skeleton_zarr(output_dir: str) -> str:
+    """A helper function to write a skeletal Zarr (version 2) store with the
+    same structure as the skeletal NetCDF-4 file. The `.zgroup`, `.zarray`
+    and `.zattrs` objects of each group and array are written to the store,
+    along with the consolidated metadata in `.zmetadata`. No array chunks
+    are written.
+
+    """
+    store_path = '/'.join([output_dir, 'test.zarr'])
+    zarr_metadata = {
+        '.zgroup': {'zarr_format': 2},
+        '.zattrs': netcdf4_global_attributes,
+        'group/.zgroup': {'zarr_format': 2},
+    }
+
+    add_zarr_array(
+        zarr_metadata,
+        'lat',
+        [2],
+        ['lat'],
+        {
+            'long_name': 'latitude',
+            'standard_name': 'latitude',
+            'units': 'degrees_north',
+        },
+    )
+    add_zarr_array(
+        zarr_metadata,
+        'lon',
+        [2],
+        ['lon'],
+        {
+            'long_name': 'longitude',
+            'standard_name': 'longitude',
+            'units': 'degrees_east',
+        },
+    )
+    add_zarr_array(
+        zarr_metadata,
+        'time',
+        [1],
+        ['time'],
+        {'long_name': 'time', 'units': 'seconds since 1970-01-01T00:00:00'},
+    )
+
+    for variable_path in ['science1', 'group/science2']:
+        add_zarr_array(
+            zarr_metadata,
+            variable_path,
+            [1, 2, 2],
+            ['time', 'lat', 'lon'],
+            {
+                'coordinates': '/lat /lon',
+                'description': 'A science variable for testing',
+            },
+        )
+
+    add_zarr_array(zarr_metadata, 'scalar1', [], [], {})
+    add_zarr_array(zarr_metadata, 'group/scalar2', [], [], {})
+
+    for metadata_key, metadata_object in zarr_metadata.items():
+        object_path = '/'.join([store_path, metadata_key])
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+
+        with open(object_path, 'w', encoding='utf-8') as file_handler:
+            json.dump(metadata_object, file_handler)
+
+    with open(f'{store_path}/.zmetadata', 'w', encoding='utf-8') as file_handler:
+        json.dump(
+            {'metadata': zarr_metadata, 'zarr_consolidated_format': 1}, file_handler
+        )
+
+    return store_path
+
+
+def add_zarr_array(
+    zarr_metadata: Dict,
+    array_path: str,
+    shape: list[int],
+    dimensions: list[str],
+    attributes: Dict,
+):
+    """A utility function to add the `.zarray` and `.zattrs` objects for a
+    64-bit floating point array to the consolidated metadata of a skeletal
+    Zarr store. The dimension names are stored in the "_ARRAY_DIMENSIONS"
+    attribute, as written by `xarray`.
+
+    """
+    zarr_metadata[f'{array_path}/.zarray'] = {
+        'chunks': shape,
+        'compressor': None,
+        'dtype': '<f8',
+        'fill_value': 'NaN',
+        'filters': None,
+        'order': 'C',
+        'shape': shape,
+        'zarr_format': 2,
+    }
+    zarr_metadata[f'{array_path}/.zattrs'] = {
+        '_ARRAY_DIMENSIONS': dimensions,
+        **attributes,
+    }
@@ -1,5 +1,10 @@
 """Module containing convenience exports for the earthdata-varinfo library."""
 
 from .cf_config import CFConfig  # noqa
-from .var_info import VarInfoFromDmr, VarInfoFromNetCDF4  # noqa
-from .variable import VariableFromDmr, VariableFromNetCDF4  # noqa
+from .var_info import (  # noqa
+    VarInfoFromDmr,
+    VarInfoFromDmrpp,
+    VarInfoFromNetCDF4,
+    VarInfoFromZarr,
+)
+from .variable import VariableFromDmr, VariableFromNetCDF4, VariableFromZarr  # noqa
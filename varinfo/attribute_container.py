@@ -1,13 +1,14 @@
 """This module contains classes designed to capture information regarding
-metadata attributes as read from either an OPeNDAP DMR or a NetCDF-4 file.
-These classes are inherited by both representations of groups and of
-variables.
+metadata attributes as read from an OPeNDAP DMR, a NetCDF-4 file or the
+consolidated metadata of a Zarr store. These classes are inherited by both
+representations of groups and of variables.
 
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
 from typing import Any, Union
 import xml.etree.ElementTree as ET
 
@@ -15,15 +16,115 @@ from netCDF4 import Group as NetCDF4Group
 from netCDF4 import Variable as NetCDF4Variable
 
 from varinfo.cf_config import CFConfig
-from varinfo.utilities import get_xml_attribute
+from varinfo.utilities import (
+    CF_REFERENCE_ATTRIBUTES,
+    get_xml_attribute,
+    get_xml_attribute_from_element,
+    get_zarr_fill_value,
+)
 
 
-InputContainerType = Union[ET.Element, NetCDF4Group, NetCDF4Variable]
+InputContainerType = Union[ET.Element, NetCDF4Group, NetCDF4Variable, dict]
+
+# Placeholder for attribute values in a `LazyAttributeDict` not yet decoded.
+UNDECODED = object()
+
+
+class LazyAttributeDict(dict):
+    """A dictionary of metadata attributes, in which values can be stored in
+    their raw, undecoded form, for example as an XML Attribute element. The
+    supplied `decoder` is called the first time such a value is retrieved,
+    and the decoded value then replaces the raw value. All methods returning
+    values (including iteration over items, comparison and copying) will
+    decode any remaining raw values, so this class behaves as a standard
+    dictionary of decoded values.
+
+    """
+
+    def __init__(self, decoder: Callable[[str, Any], Any], *args, **kwargs):
+        self.decoder = decoder
+        self.undecoded = {}
+        super().__init__(*args, **kwargs)
+
+    def set_undecoded(self, key: str, raw_value: Any) -> None:
+        """Store the raw value of an attribute, to be decoded on access."""
+        self.undecoded[key] = raw_value
+        super().__setitem__(key, UNDECODED)
+
+    def is_decoded(self, key: str) -> bool:
+        """Whether the value of an attribute has already been decoded."""
+        return super().__getitem__(key) is not UNDECODED
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+
+        if value is UNDECODED:
+            value = self.decoder(key, self.undecoded.pop(key))
+            super().__setitem__(key, value)
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        # Overridden so that `dict(instance)` and `{**instance}` do not copy
+        # raw values via the fast path for dictionaries.
+        return super().__iter__()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = super().get(key, default)
+
+        if value is UNDECODED:
+            value = self[key]
+
+        return value
+
+    def items(self):
+        return {key: self[key] for key in self.keys()}.items()
+
+    def values(self):
+        return {key: self[key] for key in self.keys()}.values()
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            super().__delitem__(key)
+        else:
+            value = super().pop(key, *default)
+
+        return value
+
+    def popitem(self) -> tuple[str, Any]:
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            super().__setitem__(key, default)
+
+        return self[key]
+
+    def clear(self) -> None:
+        self.undecoded.clear()
+        super().clear()
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        return dict(self.items()) == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
 
 
 class AttributeContainerBase(ABC):
     """A class to represent objects that have metadata attributes, such as
-    groups or variables within a NetCDF-4 file or OPeNDAP DMR.
+    groups or variables within a NetCDF-4 file, OPeNDAP DMR or Zarr store.
 
     """
 
@@ -109,16 +210,56 @@ class AttributeContainerFromDmr(AttributeContainerBase):
 
     """
 
+    lazy_attributes = True
+
     def _get_attributes(self, container: ET.Element) -> dict[str, Any]:
         """Locate all child Attribute elements of the container and extract
-        their associated values.
+        their associated values. Each Attribute element is found in a single
+        pass through the children of the container, rather than searching the
+        container again for each attribute name. If an attribute name is
+        repeated, the first Attribute element with that name is used.
+
+        If `lazy_attributes` is set, the Attribute elements are retained and
+        only decoded when the attribute value is first requested. The
+        CF-Convention attributes referring to other variables, which are
+        needed to construct references, and any attributes with a value
+        overridden by `CFConfig` are set immediately.
 
         """
-        return {
-            attribute.get('name'): self._get_attribute(container, attribute.get('name'))
-            for attribute in container.findall(f'{self.namespace}Attribute')
-            if attribute.get('name') is not None
-        }
+        if self.lazy_attributes:
+            attributes = LazyAttributeDict(self._decode_attribute_element)
+        else:
+            attributes = {}
+
+        for attribute_element in container.findall(f'{self.namespace}Attribute'):
+            attribute_name = attribute_element.get('name')
+
+            if attribute_name is not None and attribute_name not in attributes:
+                if attribute_name in self.metadata_overrides:
+                    attributes[attribute_name] = self.metadata_overrides[attribute_name]
+                elif (
+                    self.lazy_attributes
+                    and attribute_name not in CF_REFERENCE_ATTRIBUTES
+                ):
+                    attributes.set_undecoded(attribute_name, attribute_element)
+                else:
+                    attributes[attribute_name] = self._decode_attribute_element(
+                        attribute_name, attribute_element
+                    )
+
+        return attributes
+
+    def _decode_attribute_element(
+        self, attribute_name: str, attribute_element: ET.Element
+    ) -> Any:
+        """Cast the value of an XML Attribute element to the appropriate type,
+        applying any necessary metadata overrides.
+
+        """
+        return self._get_configured_attribute(
+            attribute_name,
+            get_xml_attribute_from_element(attribute_element, self.namespace),
+        )
 
     def _get_attribute(self, container: ET.Element, attribute_name: str) -> Any:
         """Extract the value of an XML Attribute element, casting it to the
@@ -139,10 +280,15 @@ class AttributeContainerFromNetCDF4(AttributeContainerBase):
     def _get_attributes(
         self, container: NetCDF4Group | NetCDF4Variable
     ) -> dict[str, Any]:
-        """Identify all variable attributes and save them to a dictionary."""
+        """Identify all variable attributes and save them to a dictionary.
+        Each access of `__dict__` reads every attribute of the container from
+        the file, so all attributes are retrieved in a single call, before any
+        overrides from the `CFConfig` instance are applied.
+
+        """
         return {
-            attribute_name: self._get_attribute(container, attribute_name)
-            for attribute_name in container.ncattrs()
+            attribute_name: self._get_configured_attribute(attribute_name, raw_value)
+            for attribute_name, raw_value in container.__dict__.items()
         }
 
     def _get_attribute(
@@ -152,5 +298,51 @@ class AttributeContainerFromNetCDF4(AttributeContainerBase):
         override from the `CFConfig` instance.
 
         """
-        raw_value = container.__dict__.get(attribute_name)
+        if attribute_name in container.ncattrs():
+            raw_value = container.getncattr(attribute_name)
+        else:
+            raw_value = None
+
+        return self._get_configured_attribute(attribute_name, raw_value)
+
+
+class AttributeContainerFromZarr(AttributeContainerBase):
+    """This child class inherits from the `AttributeContainerBase` class and
+    implements the abstract methods assuming the container source is a group
+    or array from the consolidated metadata of a Zarr store. The container is
+    a dictionary, in which the "attributes" key contains the parsed `.zattrs`
+    of the group or array.
+
+    """
+
+    def _get_attributes(self, container: dict[str, Any]) -> dict[str, Any]:
+        """Retrieve all attributes from the parsed `.zattrs`. The
+        "_ARRAY_DIMENSIONS" attribute is excluded, as it is the convention used
+        to store dimension names, rather than a metadata attribute. For an
+        array with a fill value in its `.zarray`, that fill value is used for
+        the "_FillValue" attribute, unless also present in the `.zattrs`.
+
+        """
+        raw_attributes = dict(container.get('attributes', {}))
+        raw_attributes.pop('_ARRAY_DIMENSIONS', None)
+
+        zarray = container.get('zarray', {})
+        fill_value = zarray.get('fill_value')
+
+        if fill_value is not None and '_FillValue' not in raw_attributes:
+            raw_attributes['_FillValue'] = get_zarr_fill_value(
+                fill_value, zarray.get('dtype')
+            )
+
+        return {
+            attribute_name: self._get_configured_attribute(attribute_name, raw_value)
+            for attribute_name, raw_value in raw_attributes.items()
+        }
+
+    def _get_attribute(self, container: dict[str, Any], attribute_name: str) -> Any:
+        """Extract the value of the metadata attribute, applying any necessary
+        override from the `CFConfig` instance.
+
+        """
+        raw_value = container.get('attributes', {}).get(attribute_name)
         return self._get_configured_attribute(attribute_name, raw_value)
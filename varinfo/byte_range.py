@@ -0,0 +1,338 @@
+"""This module allows the metadata of a remote NetCDF-4 file to be parsed by
+`VarInfoFromNetCDF4` without downloading the whole file. Only the parts of the
+file read by the netCDF-C library, such as the superblock, object headers and
+attributes, are retrieved using HTTP byte-range requests.
+
+The netCDF-C library can open a file over HTTP using byte-range requests
+(by appending "#mode=bytes" to the URL), but it cannot send an Authorization
+header, nor does it retain the bytes it has retrieved between reads. Instead,
+the netCDF-C library is pointed to a local HTTP server, bound to the loopback
+interface, that serves each requested range from a `ByteRangeCache`. The
+server only answers byte-range requests for a path containing a random token,
+so other local processes cannot use it to retrieve the authenticated file. Missing
+blocks are retrieved from the remote file with the `requests` library,
+including any Authorization header, and are retained for subsequent reads.
+
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import quote, urlsplit
+import os.path
+import re
+import secrets
+
+from netCDF4 import Dataset
+import requests
+
+from varinfo.exceptions import ByteRangeRequestException
+
+
+BYTE_RANGE_BLOCK_SIZE = 2**18
+BYTE_RANGE_MAX_BLOCKS = 64
+
+
+class ByteRangeCache:
+    """A least-recently used cache of fixed-size blocks from a remote file.
+    Each missing block is retrieved using an HTTP byte-range request, and the
+    number of requests and the total bytes transferred are recorded, so they
+    can be compared to the size of the whole file.
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        auth_header: str | None = None,
+        block_size: int = BYTE_RANGE_BLOCK_SIZE,
+        max_blocks: int = BYTE_RANGE_MAX_BLOCKS,
+        timeout: int = 10,
+    ):
+        self.url = url
+        self.headers = {} if auth_header is None else {'Authorization': auth_header}
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.timeout = timeout
+        self.blocks: OrderedDict[int, bytes] = OrderedDict()
+        self.content_length: int | None = None
+        self.bytes_transferred = 0
+        self.request_count = 0
+        self.lock = Lock()
+        self.session = requests.Session()
+
+    def get_content_length(self) -> int:
+        """Retrieve the size of the remote file. This is taken from the
+        response to the request for the first block of the file, which is
+        always needed, as it contains the file signature and superblock.
+
+        """
+        if self.content_length is None:
+            self.get_block(0)
+
+        return self.content_length
+
+    def read(self, start: int, end: int) -> bytes:
+        """Retrieve the bytes from `start` to `end` (inclusive) of the remote
+        file, consistent with an HTTP byte-range. Only blocks that are not
+        already cached are requested from the remote file.
+
+        """
+        end = min(end, self.get_content_length() - 1)
+        first_block = start // self.block_size
+        last_block = end // self.block_size
+        offset = first_block * self.block_size
+
+        content = b''.join(
+            self.get_block(block_index)
+            for block_index in range(first_block, last_block + 1)
+        )
+
+        return content[start - offset : end - offset + 1]
+
+    def get_block(self, block_index: int) -> bytes:
+        """Retrieve a single block of the remote file, either from the cache,
+        or from the remote file, in which case it is added to the cache. When
+        the cache is full, the least-recently used block is discarded.
+
+        """
+        with self.lock:
+            if block_index in self.blocks:
+                self.blocks.move_to_end(block_index)
+            else:
+                self.blocks[block_index] = self._request_block(block_index)
+
+                if len(self.blocks) > self.max_blocks:
+                    self.blocks.popitem(last=False)
+
+            return self.blocks[block_index]
+
+    def _request_block(self, block_index: int) -> bytes:
+        """Make an HTTP byte-range request for a single block of the remote
+        file. If the server does not respond with partial content, the
+        response body is not read, and an exception is raised.
+
+        """
+        block_start = block_index * self.block_size
+        block_end = block_start + self.block_size - 1
+
+        try:
+            response = self.session.get(
+                self.url,
+                headers={**self.headers, 'Range': f'bytes={block_start}-{block_end}'},
+                stream=True,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except Exception as requests_exception:
+            raise ByteRangeRequestException(
+                str(requests_exception)
+            ) from requests_exception
+
+        content_range = re.match(
+            r'^bytes \d+-\d+/(\d+)$', response.headers.get('Content-Range', '')
+        )
+
+        if response.status_code != 206 or content_range is None:
+            response.close()
+            raise ByteRangeRequestException(
+                f'Byte-range requests not supported for {self.url}, '
+                f'status code: {response.status_code}'
+            )
+
+        block = response.content
+        self.content_length = int(content_range.group(1))
+        self.bytes_transferred += len(block)
+        self.request_count += 1
+
+        return block
+
+
+class ByteRangeRequestHandler(BaseHTTPRequestHandler):
+    """Respond to requests from the netCDF-C library using the
+    `ByteRangeCache` of the local server. Only requests for the path served
+    by the local server, which contains an unguessable token, are answered,
+    and only single byte-ranges are served, so that other local processes
+    cannot retrieve the remote file with the Authorization header of the
+    cache.
+
+    The first exception raised while retrieving blocks from the remote file
+    is retained by the server, so it can be raised in place of the generic
+    error from the netCDF-C library.
+
+    """
+
+    def do_HEAD(self):
+        """Respond with the size of the remote file."""
+        if not self._is_served_path():
+            self.send_error(404)
+            return
+
+        try:
+            self._send_headers(200, self.server.cache.get_content_length())
+        except ByteRangeRequestException as exception:
+            self._send_exception(exception)
+
+    def do_GET(self):
+        """Respond with the requested range of the remote file. Requests
+        without a single byte-range are refused, rather than returning the
+        whole file, and a range that starts beyond the end of the file, or
+        after its own end, cannot be satisfied.
+
+        """
+        if not self._is_served_path():
+            self.send_error(404)
+            return
+
+        requested_range = re.match(
+            r'^bytes=(\d+)-(\d*)$', self.headers.get('Range', '')
+        )
+
+        if requested_range is None:
+            self.send_error(400, 'A single byte-range must be requested')
+            return
+
+        try:
+            content_length = self.server.cache.get_content_length()
+            start = int(requested_range.group(1))
+            end = int(requested_range.group(2) or content_length - 1)
+
+            if start >= content_length or start > end:
+                self._send_headers(416, 0, f'bytes */{content_length}')
+                return
+
+            content = self.server.cache.read(start, end)
+        except ByteRangeRequestException as exception:
+            self._send_exception(exception)
+        else:
+            self._send_headers(
+                206,
+                len(content),
+                f'bytes {start}-{start + len(content) - 1}/{content_length}',
+            )
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress the logging of each request to stderr."""
+
+    def _is_served_path(self) -> bool:
+        """Whether the request is for the path served by the local server."""
+        return urlsplit(self.path).path == self.server.served_path
+
+    def _send_headers(
+        self, status_code: int, content_length: int, content_range: str | None = None
+    ):
+        """Send the response status and headers."""
+        self.send_response(status_code)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(content_length))
+
+        if content_range is not None:
+            self.send_header('Content-Range', content_range)
+
+        self.end_headers()
+
+    def _send_exception(self, exception: ByteRangeRequestException):
+        """Retain the first exception, and respond with an error status: 504
+        if the remote server timed out, otherwise 502.
+
+        """
+        if self.server.exception is None:
+            self.server.exception = exception
+
+        if isinstance(exception.__cause__, requests.Timeout):
+            self.send_error(504, exception.message)
+        else:
+            self.send_error(502, exception.message)
+
+
+class RemoteNetCDF4:
+    """A context manager that opens a remote NetCDF-4 file as a read-only
+    `netCDF4.Dataset`, retrieving only the bytes read by the netCDF-C library
+    with HTTP byte-range requests. The dataset can be passed directly to
+    `VarInfoFromNetCDF4`:
+
+    with RemoteNetCDF4(granule_url, auth_header) as remote_granule:
+        var_info = VarInfoFromNetCDF4(remote_granule.dataset)
+
+    print(remote_granule.bytes_transferred, remote_granule.content_length)
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        auth_header: str | None = None,
+        block_size: int = BYTE_RANGE_BLOCK_SIZE,
+        max_blocks: int = BYTE_RANGE_MAX_BLOCKS,
+        timeout: int = 10,
+    ):
+        self.cache = ByteRangeCache(
+            url,
+            auth_header=auth_header,
+            block_size=block_size,
+            max_blocks=max_blocks,
+            timeout=timeout,
+        )
+        self.dataset: Dataset | None = None
+        self.server: ThreadingHTTPServer | None = None
+
+    @property
+    def bytes_transferred(self) -> int:
+        """The total number of bytes retrieved from the remote file."""
+        return self.cache.bytes_transferred
+
+    @property
+    def request_count(self) -> int:
+        """The number of HTTP byte-range requests made to the remote file."""
+        return self.cache.request_count
+
+    @property
+    def content_length(self) -> int | None:
+        """The size of the whole remote file, once known."""
+        return self.cache.content_length
+
+    def __enter__(self) -> RemoteNetCDF4:
+        """Start the local server and open the remote file through it."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ByteRangeRequestHandler)
+        self.server.daemon_threads = True
+        file_name = os.path.basename(urlsplit(self.cache.url).path) or 'granule'
+        self.server.served_path = f'/{secrets.token_urlsafe()}/{quote(file_name)}'
+        self.server.cache = self.cache
+        self.server.exception = None
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+        local_url = (
+            f'http://127.0.0.1:{self.server.server_address[1]}'
+            f'{self.server.served_path}#mode=bytes'
+        )
+
+        try:
+            self.dataset = Dataset(local_url, 'r')
+        except OSError as os_exception:
+            exception = self.server.exception
+            self._stop_server()
+
+            if exception is not None:
+                raise exception from os_exception
+
+            raise
+
+        return self
+
+    def __exit__(self, *exception_information):
+        """Close the dataset and stop the local server."""
+        if self.dataset is not None:
+            self.dataset.close()
+            self.dataset = None
+
+        self._stop_server()
+
+    def _stop_server(self):
+        """Stop the local server, if it is running."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
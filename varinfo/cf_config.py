@@ -16,19 +16,65 @@ references in the coordinates attribute. Further, there are required
 variables that have to be included in the output of any variable subset
 request for a specific collection.
 
+Configuration files are parsed by a process-wide `ConfigRegistry`, which
+retains each parsed file, and the `CFConfig` instance for each mission and
+collection short name, until the file is modified, or until they are the
+least recently requested beyond the limits of the registry.
+
 """
 
 from __future__ import annotations
 
-from os.path import exists
-from typing import Any
+from collections import OrderedDict
+from contextlib import suppress
+from functools import lru_cache
+from operator import itemgetter
+from os import stat
+from os.path import abspath
+from threading import RLock
+from typing import Any, Union
 import json
 import re
 
 from varinfo.exceptions import (
+    InvalidCompiledConfigError,
     InvalidConfigFileFormatError,
     MissingConfigurationFileError,
 )
+from varinfo.utilities import (
+    MISSION_CACHE_SIZE,
+    MissionResolver,
+    PatternPrefixTrie,
+    get_literal_prefixes,
+)
+
+
+# Below this number of applicable MetadataOverrides patterns, evaluating every
+# pattern is quicker than finding candidates with `PatternPrefixTrie`.
+MINIMUM_TRIE_PATTERNS = 16
+
+# The maximum number of paths with combined MetadataOverrides retained by each
+# `CFConfig`, after which the least recently requested path is discarded.
+PATH_OVERRIDES_CACHE_SIZE = 4096
+
+# The default maximum number of configuration files retained by a
+# `ConfigRegistry`, and of `CFConfig` instances retained for each file. The
+# least recently requested entries are discarded beyond these limits.
+MAXIMUM_REGISTERED_CONFIGS = 16
+MAXIMUM_CF_CONFIGS = 256
+
+# The version of the artifacts produced by `varinfo.config_compiler`.
+COMPILED_CONFIG_VERSION = 1
+
+# Sections of the configuration file containing rules with an Applicability.
+RULE_SECTIONS = ('ExcludedScienceVariables', 'RequiredVariables', 'MetadataOverrides')
+
+# Rules keyed by their Applicability (Mission, ShortNamePath), then by their
+# section, retaining the position of each rule within that section.
+RulePartitions = dict[
+    tuple[Union[str, None], Union[str, None]],
+    dict[str, list[tuple[int, dict[str, Any]]]],
+]
 
 
 class CFConfig:
@@ -47,10 +93,12 @@ class CFConfig:
         mission: str | None,
         collection_short_name: str | None,
         config_file: str | None = None,
+        registry: ConfigRegistry | None = None,
     ):
         """Set supplied class attributes. Then read the designated
         configuration file to obtain mission and short name specific
-        attributes.
+        attributes. The file is parsed via the supplied `ConfigRegistry`, or
+        the process-wide `config_registry` if none is supplied.
 
         """
         self.config_file = config_file
@@ -60,53 +108,106 @@ class CFConfig:
         self.metadata_overrides: dict[str, dict[str, Any]] = {}
         self.excluded_science_variables: set[str] = set()
         self.required_variables: set[str] = set()
+        self.override_index: list[tuple[re.Pattern, dict[str, Any]]] = []
+        self.override_trie: PatternPrefixTrie | None = None
+        self.path_overrides: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
         if self.mission is not None:
-            self._read_config_file()
+            self._read_config_file(registry or config_registry)
+            self._index_metadata_overrides()
 
-    def _read_config_file(self):
+    def _read_config_file(self, registry: ConfigRegistry):
         """Open the main configuration JSON file and extract only those parts
         of it pertaining to the mission and collection specified upon
         instantiating the class.
 
+        The rules are retrieved from the supplied `ConfigRegistry`, which
+        parses each configuration file once and partitions its rules by
+        Applicability, so that each distinct Mission and ShortNamePath is only
+        checked once.
+
         Note: Applicable rules for `RequiredVariables` will be applied to all
         variables in a collection when trying to identify required variables
         for a given subset of requested variables. The `VariablePattern` of
         the `ApplicabilityType` is not taken into account.
 
         """
-        if self.config_file is not None and not exists(self.config_file):
-            raise MissingConfigurationFileError(self.config_file)
-        elif self.config_file is not None and self.config_file.endswith('.json'):
-            with open(self.config_file, 'r', encoding='utf-8') as file_handler:
-                config = json.load(file_handler)
-        elif self.config_file is not None:
-            raise InvalidConfigFileFormatError(self.config_file)
+        if self.config_file is not None:
+            compiled_config = registry.get_config(self.config_file).get(
+                'CompiledConfig'
+            )
+            rule_partitions = registry.get_rule_partitions(self.config_file)
         else:
-            config = {}
+            compiled_config = None
+            rule_partitions = {}
+
+        if compiled_config is not None:
+            self._read_compiled_config(compiled_config)
+            return
+
+        applicable_rules: dict[str, list[tuple[int, dict[str, Any]]]] = {
+            section: [] for section in RULE_SECTIONS
+        }
+
+        for (mission, short_name), section_rules in rule_partitions.items():
+            if mission is not None and self._is_applicable(mission, short_name):
+                for section, rules in section_rules.items():
+                    applicable_rules[section].extend(rules)
+
+        # Retain the order of the configuration file, so that a later override
+        # with the same VariablePattern replaces an earlier one.
+        for rules in applicable_rules.values():
+            rules.sort(key=itemgetter(0))
 
         self.excluded_science_variables = {
             pattern
-            for item in config.get('ExcludedScienceVariables', [])
-            if self._is_applicable(
-                item['Applicability'].get('Mission'),
-                item['Applicability'].get('ShortNamePath'),
-            )
+            for _, item in applicable_rules['ExcludedScienceVariables']
             for pattern in item['VariablePattern']
         }
 
         self.required_variables = {
             pattern
-            for item in config.get('RequiredVariables', [])
-            if self._is_applicable(
-                item['Applicability'].get('Mission'),
-                item['Applicability'].get('ShortNamePath'),
-            )
+            for _, item in applicable_rules['RequiredVariables']
             for pattern in item['VariablePattern']
         }
 
-        for override in config.get('MetadataOverrides', []):
-            self._process_cf_item(override, self.metadata_overrides)
+        for _, override in applicable_rules['MetadataOverrides']:
+            # Some outer Applicability items have attributes, but no
+            # variable path - the assumption here is that the applicability is
+            # to all variables (see ICESat2 dimensions override, SPL4.* and
+            # SPL3FTA grid_mapping overrides)
+            pattern = override['Applicability'].get('VariablePattern', '.*')
+            self.metadata_overrides[pattern] = self._create_attributes_object(override)
+
+    def _read_compiled_config(self, compiled_config: dict[str, Any]):
+        """Set the rules from a configuration file compiled for a single
+        collection by `varinfo.config_compiler.compile_config`. These rules
+        have already been filtered by their Applicability, and the
+        MetadataOverrides are already in the order of `self.override_index`.
+
+        """
+        if compiled_config.get('Version') != COMPILED_CONFIG_VERSION:
+            raise InvalidCompiledConfigError(
+                self.config_file,
+                f'unsupported version {compiled_config.get("Version")}',
+            )
+
+        if (compiled_config['Mission'], compiled_config['ShortName']) != (
+            self.mission,
+            self.short_name,
+        ):
+            raise InvalidCompiledConfigError(
+                self.config_file,
+                f'compiled for {compiled_config["Mission"]} '
+                f'{compiled_config["ShortName"]}, not {self.mission} '
+                f'{self.short_name}',
+            )
+
+        self.excluded_science_variables = set(
+            compiled_config['ExcludedScienceVariables']
+        )
+        self.required_variables = set(compiled_config['RequiredVariables'])
+        self.metadata_overrides = dict(compiled_config['MetadataOverrides'])
 
     def _is_applicable(self, mission: str, short_name: str | None = None) -> bool:
         """Given a mission, and optionally also a collection short name, of an
@@ -115,39 +216,42 @@ class CFConfig:
         class object.
 
         """
-        mission_matches = re.match(mission, self.mission) is not None
+        return is_applicable(mission, short_name, self.mission, self.short_name)
 
-        short_name_matches = (
-            short_name is None or re.match(short_name, self.short_name) is not None
-        )
+    def _index_metadata_overrides(self):
+        """Compile the variable pattern of each applicable MetadataOverrides
+        item, and order them as required by `get_metadata_overrides`. This is
+        done once, when the configuration file is read, rather than for every
+        variable or group path.
 
-        return mission_matches and short_name_matches
+        The order is primarily from shallowest to deepest pattern, by
+        counting the total number of slashes, and secondly from shortest to
+        longest pattern. The sort is stable, so patterns with the same depth
+        and length retain the order in which they were read.
 
-    def _process_cf_item(
-        self,
-        cf_item: dict,
-        results: dict[str, dict],
-        input_mission: str | None = None,
-        input_short_name: str | None = None,
-    ):
-        """Process a single block in the `MetadataOverrides` region of the
-        configuration file. First check that the applicability matches the
-        mission and short name for the class. Next, check for a variable
-        pattern. This is indicative of there being overriding attributes in
-        this list item. Assign any information to the results dictionary, with
-        a key of that variable pattern.
+        If there are at least `MINIMUM_TRIE_PATTERNS` patterns, the position
+        of each pattern in the index is also added to a trie, under each of
+        the literal prefixes of that pattern, so that only patterns with a
+        prefix matching a path are evaluated for that path. Patterns without
+        a literal prefix, such as ".*", are evaluated for every path.
 
         """
-        mission = cf_item['Applicability'].get('Mission') or input_mission
-        short_name = cf_item['Applicability'].get('ShortNamePath') or input_short_name
+        self.override_index = [
+            (re.compile(pattern), attributes)
+            for pattern, attributes in sorted(
+                self.metadata_overrides.items(),
+                key=lambda override: (override[0].count('/'), len(override[0])),
+            )
+        ]
+        self.override_trie = None
+        self.path_overrides = OrderedDict()
 
-        if mission is not None and self._is_applicable(mission, short_name):
-            # Some outer Applicability items have attributes, but no
-            # variable path - the assumption here is that the applicability is
-            # to all variables (see ICESat2 dimensions override, SPL4.* and
-            # SPL3FTA grid_mapping overrides)
-            pattern = cf_item['Applicability'].get('VariablePattern', '.*')
-            results[pattern] = self._create_attributes_object(cf_item)
+        if len(self.override_index) >= MINIMUM_TRIE_PATTERNS:
+            self.override_trie = PatternPrefixTrie()
+
+            for index_position, (pattern, _) in enumerate(self.override_index):
+                for prefix in get_literal_prefixes(pattern.pattern):
+                    self.override_trie.add(prefix, index_position)
 
     @staticmethod
     def _create_attributes_object(cf_item: dict) -> dict[str, str]:
@@ -164,11 +268,13 @@ class CFConfig:
         """Return the MetadataOverrides that match a given variable. If there
         are no overrides, then empty dictionaries will be returned instead.
 
-        First iterate through the self.metadata_overrides and find all items
-        with a variable pattern that matches the supplied variable (or group)
-        path.
-
-        Next sort that dictionary, so that matching patterns are:
+        The overrides are checked in the order of `self.override_index`,
+        which contains the compiled variable pattern of every item in
+        `self.metadata_overrides`, retaining those that match the supplied
+        variable (or group) path. Only patterns with a literal prefix of the
+        path, as found in `self.override_trie`, are evaluated, unless there
+        are too few patterns for a trie to be beneficial. The index is
+        sorted when the configuration file is read, so that patterns are:
 
         * Primarily sorted from shallowed to deepest, by counting the total
           number of slashes in the string.
@@ -179,11 +285,11 @@ class CFConfig:
         a file hierarchy are intended to be more specifically applied, and that
         within a given depth, the string length is a proxy for specificity.
 
-        Last, combine the attribute names and values from each matching
-        override item. Because of the ordering in the previous step, if there
-        are multiple values supplied for the same metadata attribute, the value
-        retained will be the one with the longest variable pattern, which is a
-        proxy for how specific the override is.
+        The attribute names and values from each matching override item are
+        combined. Because of the ordering of the index, if there are multiple
+        values supplied for the same metadata attribute, the value retained
+        will be the one with the longest variable pattern, which is a proxy
+        for how specific the override is.
 
         Note: Depth is approximated by counting the _total_ number of slashes
         in the VariablePattern regular expression, and does not account for
@@ -204,31 +310,267 @@ class CFConfig:
         ```
         will incorrectly determine a depth of 4.
 
+        The combined overrides for each path are retained in
+        `self.path_overrides`, for up to `PATH_OVERRIDES_CACHE_SIZE` of the
+        most recently requested paths, and a copy is returned for every
+        subsequent request for the same path.
+
+        As `CFConfig` instances are shared between threads by
+        `ConfigRegistry`, this relies on each operation on `OrderedDict` being
+        atomic, as it is under the global interpreter lock. Concurrent
+        requests may calculate the overrides for the same path more than
+        once, or discard an extra path, but will always return the complete
+        overrides for the requested path.
+
         """
-        matching_overrides = {
-            pattern: attributes
-            for pattern, attributes in self.metadata_overrides.items()
-            if re.match(pattern, variable_path) is not None
-        }
+        path_overrides = self.path_overrides.get(variable_path)
+
+        if path_overrides is None:
+            # Combine all overrides. In the case a metadata attribute appears
+            # in multiple matching overrides, the value that comes later based
+            # on the ordering of the index will take precedence.
+            if self.override_trie is None:
+                candidate_overrides = self.override_index
+            else:
+                candidate_overrides = [
+                    self.override_index[index_position]
+                    for index_position in sorted(
+                        set(self.override_trie.get_values(variable_path))
+                    )
+                ]
+
+            path_overrides = {
+                attribute_name: attribute_value
+                for pattern, attributes in candidate_overrides
+                if pattern.match(variable_path) is not None
+                for attribute_name, attribute_value in attributes.items()
+            }
+            self.path_overrides[variable_path] = path_overrides
+
+            if len(self.path_overrides) > PATH_OVERRIDES_CACHE_SIZE:
+                with suppress(KeyError):
+                    self.path_overrides.popitem(last=False)
+        else:
+            # Another thread may have discarded the path since it was found.
+            with suppress(KeyError):
+                self.path_overrides.move_to_end(variable_path)
+
+        return dict(path_overrides)
+
+
+class RegisteredConfig:
+    """A parsed configuration file, as retained by `ConfigRegistry`, along
+    with the modification time and size of the file when it was parsed, the
+    rules of the file partitioned by Applicability, the `MissionResolver`
+    for its "Mission" mapping, and the `CFConfig` instances created for each
+    mission and collection short name.
+
+    """
 
-        # Order MetadataOverrides items by:
-        # First: Depth of the variable hierarchy included in the regular
-        # expression pattern (number of slashes), shallowest to deepest.
-        # Second: The length of the variable pattern, from shorted to longest.
-        # The second ordering is applied in to regular expressions specifying
-        # the same depth of variable hierarchy.
-        sorted_overrides = dict(
-            sorted(
-                matching_overrides.items(),
-                key=lambda pattern: (pattern[0].count('/'), len(pattern[0])),
-            ),
+    def __init__(self, config: dict[str, Any], signature: tuple[int, int]):
+        self.config = config
+        self.signature = signature
+        self.rule_partitions = partition_rules(config)
+        self.mission_resolver = MissionResolver(
+            tuple(config.get('Mission', {}).items()), MISSION_CACHE_SIZE
+        )
+        self.cf_configs: OrderedDict[tuple[str | None, str | None], CFConfig] = (
+            OrderedDict()
         )
 
-        # Combine all overrides. In the case a metadata attribute appears in
-        # multiple matching overrides, the value that comes later based on the
-        # previous sorting of variable patterns will take precedence.
-        return {
-            attribute_name: attribute_value
-            for sorted_override in sorted_overrides.values()
-            for attribute_name, attribute_value in sorted_override.items()
-        }
+
+class ConfigRegistry:
+    """A process-wide cache of parsed configuration files, keyed by the
+    absolute path of each file. A file is only parsed again if its
+    modification time or size has changed since it was last parsed, in which
+    case all cached information for the previous version is discarded.
+
+    At most `max_configs` files are retained, each with at most
+    `max_cf_configs` `CFConfig` instances. Beyond these limits, the least
+    recently requested file, or `CFConfig` instance, is discarded, and will
+    be created again if requested. All entries can be discarded with `clear`,
+    for example between tests, or when a service reloads its configuration.
+
+    The parsed configuration and the `CFConfig` instances returned are shared
+    between all callers, including other threads, and must not be modified.
+
+    """
+
+    def __init__(
+        self,
+        max_configs: int = MAXIMUM_REGISTERED_CONFIGS,
+        max_cf_configs: int = MAXIMUM_CF_CONFIGS,
+    ):
+        self.lock = RLock()
+        self.max_configs = max_configs
+        self.max_cf_configs = max_cf_configs
+        self.registered_configs: OrderedDict[str, RegisteredConfig] = OrderedDict()
+
+    def get_config(self, config_file: str) -> dict[str, Any]:
+        """Return the parsed contents of a JSON configuration file."""
+        return self._get_registered_config(config_file).config
+
+    def get_rule_partitions(self, config_file: str) -> RulePartitions:
+        """Return the rules of a configuration file, partitioned by the
+        Mission and ShortNamePath of their Applicability.
+
+        """
+        return self._get_registered_config(config_file).rule_partitions
+
+    def get_mission_resolver(self, config_file: str | None) -> MissionResolver:
+        """Return the `MissionResolver` for the "Mission" mapping of a
+        configuration file, which is created once when the file is parsed.
+        Without a configuration file, a resolver without any patterns is
+        returned, which does not resolve any short name to a mission.
+
+        """
+        return self.get_registered_config(config_file).mission_resolver
+
+    def get_registered_config(self, config_file: str | None) -> RegisteredConfig:
+        """Return the parsed configuration file, along with the information
+        derived from it, such as its `MissionResolver`. Callers needing more
+        than one of these should retrieve them all from the same instance, so
+        they are consistent even if the file is modified between requests.
+        Without a configuration file, an empty configuration is returned.
+
+        """
+        if config_file is None:
+            return RegisteredConfig({}, (0, 0))
+
+        return self._get_registered_config(config_file)
+
+    def get_cf_config(
+        self, mission: str | None, short_name: str | None, config_file: str | None
+    ) -> CFConfig:
+        """Return the `CFConfig` instance for a mission and collection short
+        name. This is created on the first request for that pair, and the
+        same instance is returned for subsequent requests, unless the
+        configuration file has been modified, or the instance has been
+        discarded as the least recently requested. Without a configuration
+        file, a new (and empty) `CFConfig` instance is returned.
+
+        The returned instance is shared by all callers requesting the same
+        mission and collection short name, and must not be modified.
+
+        """
+        if config_file is None:
+            return CFConfig(mission, short_name, config_file)
+
+        with self.lock:
+            registered_config = self._get_registered_config(config_file)
+            cf_config = registered_config.cf_configs.get((mission, short_name))
+
+            if cf_config is None:
+                cf_config = CFConfig(mission, short_name, config_file, self)
+                registered_config.cf_configs[(mission, short_name)] = cf_config
+
+                if len(registered_config.cf_configs) > self.max_cf_configs:
+                    registered_config.cf_configs.popitem(last=False)
+            else:
+                registered_config.cf_configs.move_to_end((mission, short_name))
+
+        return cf_config
+
+    def clear(self):
+        """Discard all parsed configuration files."""
+        with self.lock:
+            self.registered_configs.clear()
+
+    def _get_registered_config(self, config_file: str) -> RegisteredConfig:
+        """Retrieve the parsed configuration file, checking its modification
+        time and size against those when it was last parsed. The file is only
+        opened if it has not previously been parsed, or has been modified.
+
+        """
+        try:
+            file_stat = stat(config_file)
+        except OSError as exception:
+            raise MissingConfigurationFileError(config_file) from exception
+
+        if not config_file.endswith('.json'):
+            raise InvalidConfigFileFormatError(config_file)
+
+        config_path = abspath(config_file)
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        with self.lock:
+            registered_config = self.registered_configs.get(config_path)
+
+            if registered_config is None or registered_config.signature != signature:
+                with open(config_file, 'r', encoding='utf-8') as file_handler:
+                    registered_config = RegisteredConfig(
+                        json.load(file_handler), signature
+                    )
+
+                self.registered_configs[config_path] = registered_config
+
+                if len(self.registered_configs) > self.max_configs:
+                    self.registered_configs.popitem(last=False)
+
+            self.registered_configs.move_to_end(config_path)
+
+        return registered_config
+
+
+def is_applicable(
+    mission_pattern: str,
+    short_name_pattern: str | None,
+    mission: str,
+    short_name: str | None,
+) -> bool:
+    """Check whether the Mission and (optional) ShortNamePath of an
+    Applicability within the configuration file match a mission and
+    collection short name.
+
+    """
+    mission_regex, short_name_regex = get_applicability_patterns(
+        mission_pattern, short_name_pattern
+    )
+
+    return mission_regex.match(mission) is not None and (
+        short_name_regex is None or short_name_regex.match(short_name) is not None
+    )
+
+
+@lru_cache(maxsize=1024)
+def get_applicability_patterns(
+    mission_pattern: str, short_name_pattern: str | None
+) -> tuple[re.Pattern, re.Pattern | None]:
+    """Compile the Mission and (optional) ShortNamePath of an Applicability.
+    The compiled patterns are cached, so each Applicability is only compiled
+    once, however many `CFConfig` instances check it.
+
+    """
+    if short_name_pattern is None:
+        short_name_regex = None
+    else:
+        short_name_regex = re.compile(short_name_pattern)
+
+    return re.compile(mission_pattern), short_name_regex
+
+
+def partition_rules(config: dict[str, Any]) -> RulePartitions:
+    """Group the rules in each section of a configuration file by the
+    Mission and ShortNamePath of their Applicability, so that the rules
+    applicable to a collection can be found by checking each distinct
+    Applicability once, rather than checking every rule. A missing or empty
+    ShortNamePath applies to all collections of a mission, and is stored as
+    `None`. Rules without a Mission are not applicable to any collection.
+
+    """
+    rule_partitions: RulePartitions = {}
+
+    for section in RULE_SECTIONS:
+        for position, rule in enumerate(config.get(section, [])):
+            applicability = (
+                rule['Applicability'].get('Mission') or None,
+                rule['Applicability'].get('ShortNamePath') or None,
+            )
+            rule_partitions.setdefault(applicability, {}).setdefault(
+                section, []
+            ).append((position, rule))
+
+    return rule_partitions
+
+
+config_registry = ConfigRegistry()
@@ -141,21 +141,39 @@ def download_granule(
             raise DirectoryCreationException(str(os_exception)) from os_exception
 
     out_filename = os.path.join(out_directory, os.path.basename(granule_link))
+    granule_content = get_granule_content(granule_link, auth_header)
 
     try:
-        # Write content of data to out_filename and return response
+        # Write content of data to out_filename
+        with open(out_filename, 'wb') as file_download:
+            file_download.write(granule_content)
+    except Exception as write_exception:
+        raise GranuleDownloadException(str(write_exception)) from write_exception
+
+    return out_filename
+
+
+def get_granule_content(granule_link: str, auth_header: str) -> bytes:
+    """Use the requests module to retrieve the content of a granule via https,
+    without writing it to disk. The returned bytes can be passed directly to
+    `VarInfoFromNetCDF4`. A response with an HTTP error status raises a
+    `GranuleDownloadException`, rather than returning the body of the error.
+    * granule_link: granule download URL.
+    * auth_header: Authorization HTTP header, either:
+      - A header with a LaunchPad token: 'Authorization: <token>'
+      - A header with an EDL bearer token: 'Authorization: Bearer <token>'
+    """
+    try:
         response = requests.get(
             granule_link, headers={'Authorization': auth_header}, timeout=10
         )
-
-        with open(out_filename, 'wb') as file_download:
-            file_download.write(response.content)
-
-        return out_filename
+        response.raise_for_status()
     except Exception as requests_exception:
         # Custom exception for error from `requests.get`
         raise GranuleDownloadException(str(requests_exception)) from requests_exception
 
+    return response.content
+
 
 def get_edl_token_from_launchpad(
     launchpad_token: str, cmr_env: CmrEnvType
@@ -0,0 +1,181 @@
+"""This module contains functions to compile a VarInfo configuration file into
+a compact artifact for a single collection. The artifact retains the
+`CollectionShortNamePath` and `Mission` sections of the source file, so it
+can be supplied as the `config_file` of any VarInfo class, along with only
+those rules applicable to the collection, under a "CompiledConfig" key:
+
+* The `ExcludedScienceVariables` and `RequiredVariables` patterns, already
+  filtered by their Applicability.
+* The `MetadataOverrides`, as pairs of variable pattern and attributes,
+  already filtered by their Applicability and sorted into the order used by
+  `CFConfig.get_metadata_overrides`.
+
+`CFConfig` reads these rules directly, without checking the Applicability of
+any rule. The compiler also reports rules in the source file that can never
+be applied, or that are replaced by a later rule.
+
+"""
+
+from __future__ import annotations
+
+from os.path import abspath
+from typing import Any
+import json
+import re
+
+from varinfo.cf_config import (
+    COMPILED_CONFIG_VERSION,
+    RULE_SECTIONS,
+    CFConfig,
+    ConfigRegistry,
+    config_registry,
+    is_applicable,
+)
+
+
+def compile_config(
+    config_file: str,
+    short_name: str,
+    mission: str | None = None,
+    registry: ConfigRegistry | None = None,
+) -> dict[str, Any]:
+    """Compile a VarInfo configuration file for a single collection. If no
+    mission is supplied, it is determined from the short name, using the
+    `Mission` section of the configuration file. The returned artifact can
+    be saved with `write_compiled_config`.
+
+    The "Report" of the artifact lists the rules that are unreachable for
+    any collection, and those that are shadowed for this collection.
+
+    """
+    registry = registry or config_registry
+    registered_config = registry.get_registered_config(config_file)
+    config = registered_config.config
+
+    if mission is None:
+        mission = registered_config.mission_resolver.resolve(short_name)
+
+    cf_config = CFConfig(mission, short_name, config_file, registry)
+
+    return {
+        'CompiledConfig': {
+            'Version': COMPILED_CONFIG_VERSION,
+            'Source': abspath(config_file),
+            'SourceVersion': config.get('Version'),
+            'Mission': mission,
+            'ShortName': short_name,
+            'ExcludedScienceVariables': sorted(cf_config.excluded_science_variables),
+            'RequiredVariables': sorted(cf_config.required_variables),
+            'MetadataOverrides': [
+                [pattern.pattern, attributes]
+                for pattern, attributes in cf_config.override_index
+            ],
+            'Report': (
+                find_unreachable_rules(config)
+                + find_shadowed_rules(config, mission, short_name)
+            ),
+        },
+        'CollectionShortNamePath': config.get('CollectionShortNamePath', []),
+        'Mission': config.get('Mission', {}),
+    }
+
+
+def write_compiled_config(compiled_config: dict[str, Any], output_path: str):
+    """Save a compiled configuration as JSON, without any whitespace. The
+    output path must have a ".json" extension to be used as the
+    `config_file` of a VarInfo class or `CFConfig`.
+
+    """
+    with open(output_path, 'w', encoding='utf-8') as file_handler:
+        json.dump(compiled_config, file_handler, separators=(',', ':'))
+
+
+def find_unreachable_rules(config: dict[str, Any]) -> list[str]:
+    """Identify rules in a configuration file that cannot apply to any
+    collection that VarInfo can identify. These are:
+
+    * Rules without a Mission in their Applicability.
+    * Rules with a Mission that does not match any mission in the `Mission`
+      section of the configuration file (if that section is not empty).
+    * Entries in the `Mission` section with a literal short name that is
+      matched by an earlier entry, which will always take precedence.
+
+    """
+    mission_table = config.get('Mission', {})
+    missions = set(mission_table.values())
+    unreachable_rules = []
+
+    for section in RULE_SECTIONS:
+        for position, rule in enumerate(config.get(section, [])):
+            rule_mission = rule['Applicability'].get('Mission')
+
+            if not rule_mission:
+                unreachable_rules.append(
+                    f'{section}[{position}] is unreachable: it has no Mission.'
+                )
+            elif len(missions) > 0 and not any(
+                re.match(rule_mission, mission) is not None for mission in missions
+            ):
+                unreachable_rules.append(
+                    f'{section}[{position}] is unreachable: Mission '
+                    f'"{rule_mission}" does not match any mission in the '
+                    'Mission section.'
+                )
+
+    short_name_patterns = list(mission_table)
+
+    for position, short_name_pattern in enumerate(short_name_patterns):
+        if re.escape(short_name_pattern) == short_name_pattern:
+            earlier_pattern = next(
+                (
+                    pattern
+                    for pattern in short_name_patterns[:position]
+                    if re.match(pattern, short_name_pattern) is not None
+                ),
+                None,
+            )
+
+            if earlier_pattern is not None:
+                unreachable_rules.append(
+                    f'Mission entry "{short_name_pattern}" is unreachable: it '
+                    f'is matched by the earlier entry "{earlier_pattern}".'
+                )
+
+    return unreachable_rules
+
+
+def find_shadowed_rules(
+    config: dict[str, Any], mission: str | None, short_name: str | None
+) -> list[str]:
+    """Identify `MetadataOverrides` rules applicable to a collection that are
+    replaced in their entirety by a later applicable rule with the same
+    variable pattern, and so have no effect for that collection.
+
+    """
+    if mission is None:
+        return []
+
+    latest_rules: dict[str, int] = {}
+    shadowed_rules = []
+
+    for position, rule in enumerate(config.get('MetadataOverrides', [])):
+        applicability = rule['Applicability']
+
+        if applicability.get('Mission') and is_applicable(
+            applicability['Mission'],
+            applicability.get('ShortNamePath') or None,
+            mission,
+            short_name,
+        ):
+            pattern = applicability.get('VariablePattern', '.*')
+
+            if pattern in latest_rules:
+                shadowed_rules.append(
+                    f'MetadataOverrides[{latest_rules[pattern]}] is shadowed: '
+                    f'MetadataOverrides[{position}] has the same '
+                    f'VariablePattern "{pattern}".'
+                )
+
+            latest_rules[pattern] = position
+
+    return shadowed_rules
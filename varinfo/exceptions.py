@@ -19,6 +19,21 @@ class CustomError(Exception):
         super().__init__(self.message)
 
 
+class ByteRangeRequestException(CustomError):
+    """This exception is raised when a block of a remote file cannot be
+    retrieved with an HTTP byte-range request, including when the server does
+    not support byte-range requests.
+
+    """
+
+    def __init__(self, byte_range_exception_message):
+        super().__init__(
+            'ByteRangeRequestException',
+            'byte-range request failed with the following error: '
+            f'{byte_range_exception_message}',
+        )
+
+
 class DmrNamespaceError(CustomError):
     """This exception is raised when the root element of a dmr XML document
     is not a fully qualified Dataset tag.
@@ -29,6 +44,21 @@ class DmrNamespaceError(CustomError):
         super().__init__('DmrNamespaceError', f'Unexpected root: {tag}')
 
 
+class InvalidCompiledConfigError(CustomError):
+    """This exception is raised when a compiled configuration file was
+    produced by an unsupported version of `varinfo.config_compiler`, or is
+    used for a mission and collection short name other than those it was
+    compiled for.
+
+    """
+
+    def __init__(self, file_path, reason):
+        super().__init__(
+            'InvalidCompiledConfigError',
+            f'"{file_path}" cannot be used: {reason}',
+        )
+
+
 class InvalidConfigFileFormatError(CustomError):
     """This exception is raised when a configuration file is specified when
     creating an instance of a VarInfo or CFConfig class with a non ".json"
@@ -54,6 +84,20 @@ class InvalidExportDirectory(CustomError):
         )
 
 
+class InvalidParserBackendError(CustomError):
+    """This exception is raised when an XML parser backend is requested for a
+    `VarInfoFromDmr` instance that is either not recognised, or relies on a
+    package that is not installed.
+
+    """
+
+    def __init__(self, parser_backend):
+        super().__init__(
+            'InvalidParserBackendError',
+            f'"{parser_backend}" parser backend is unrecognised or unavailable.',
+        )
+
+
 class MissingConfigurationFileError(CustomError):
     """This exception is raised when a configuration file path is supplied to
     either a VarInfo class or the CFConfig class, but there is no file at
@@ -68,6 +112,34 @@ class MissingConfigurationFileError(CustomError):
         )
 
 
+class MissingZarrMetadataError(CustomError):
+    """This exception is raised when a Zarr store supplied to the
+    `VarInfoFromZarr` class does not contain consolidated metadata.
+
+    """
+
+    def __init__(self, store_path):
+        super().__init__(
+            'MissingZarrMetadataError',
+            f'No consolidated metadata for Zarr store: {store_path}',
+        )
+
+
+class NetCDF4FileClosedError(CustomError):
+    """This exception is raised when a group or variable of a NetCDF-4 file is
+    retrieved from a lazy `VarInfoFromNetCDF4` instance after the file was
+    closed, but before the group containing it was parsed.
+
+    """
+
+    def __init__(self, container_path):
+        super().__init__(
+            'NetCDF4FileClosedError',
+            f'"{container_path}" was not parsed before the NetCDF-4 file was '
+            'closed.',
+        )
+
+
 class CMRQueryException(CustomError):
     """This exception is raised when a query to CMR fails."""
 
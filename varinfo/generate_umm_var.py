@@ -3,7 +3,8 @@ optionally will publish those records to CMR.
 `generation_collection_umm_var` will:
 
 * Performing a CMR granule search with collection-based query parameters.
-* Downloading the granule locally.
+* Retrieving the granule content in memory, or only its metadata using
+  HTTP byte-range requests.
 * Parse the variable metadata from the granule using VarInfoFromNetCDF4.
 * Generate UMM-Var JSON as a dictionary for each identified variable.
 * (Optional) Publish each UMM-Var entry to the selected CMR environment.
@@ -12,16 +13,16 @@ optionally will publish those records to CMR.
 
 from __future__ import annotations
 
-from tempfile import TemporaryDirectory
 from typing import Union
 import re
 
 from cmr import CMR_UAT
 
 from varinfo import VarInfoFromNetCDF4
+from varinfo.byte_range import RemoteNetCDF4
 from varinfo.cmr_search import (
     CmrEnvType,
-    download_granule,
+    get_granule_content,
     get_granule_link,
     get_granules,
     get_edl_token_header,
@@ -40,6 +41,7 @@ def generate_collection_umm_var(
     cmr_env: CmrEnvType = CMR_UAT,
     publish: bool = False,
     config_file: str | None = None,
+    remote: bool = False,
 ) -> UmmVarReturnType:
     """Run all the of the functions for downloading and publishing
     a UMM-Var entry to CMR given:
@@ -54,6 +56,9 @@ def generate_collection_umm_var(
       False.
     * config_file: Optional argument to provide a configuration file that
       could be used to override any known errors in a collection. Defaults to None
+    * remote: Optional argument determining whether to read only the
+      metadata of the granule, using HTTP byte-range requests, instead of
+      retrieving the whole granule. Defaults to False.
     Note - if attempting to publish to CMR, a LaunchPad token must be used.
 
     """
@@ -67,17 +72,21 @@ def generate_collection_umm_var(
     # Get the data download URL for the most recent granule (NetCDF-4 file)
     granule_link = get_granule_link(granule_response)
 
-    with TemporaryDirectory() as temp_dir:
-        # Download file to runtime environment
-        local_granule = download_granule(
-            granule_link, auth_header_edl_token, out_directory=temp_dir
-        )
+    if remote:
+        # Read only the granule metadata, using HTTP byte-range requests:
+        with RemoteNetCDF4(granule_link, auth_header_edl_token) as remote_granule:
+            var_info = VarInfoFromNetCDF4(
+                remote_granule.dataset, config_file=config_file
+            )
+    else:
+        # Retrieve the granule content, without writing it to disk:
+        granule_content = get_granule_content(granule_link, auth_header_edl_token)
 
         # Parse the granule with VarInfo to map all variables and relations:
-        var_info = VarInfoFromNetCDF4(local_granule, config_file=config_file)
+        var_info = VarInfoFromNetCDF4(granule_content, config_file=config_file)
 
-        # Generate all the UMM-Var records:
-        all_umm_var_records = get_all_umm_var(var_info)
+    # Generate all the UMM-Var records:
+    all_umm_var_records = get_all_umm_var(var_info)
 
     if publish:
         # Publish to CMR and construct an output object that is a list of
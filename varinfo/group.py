@@ -1,5 +1,5 @@
 """This module contains classes that represent groups (e.g., containers of
-variables within a NetCDF-4 file or OPeNDAP DMR). A group has metadata
+variables within a NetCDF-4 file, OPeNDAP DMR or Zarr store). A group has metadata
 attributes and child variables.
 
 """
@@ -16,12 +16,13 @@ from varinfo.attribute_container import (
     AttributeContainerBase,
     AttributeContainerFromDmr,
     AttributeContainerFromNetCDF4,
+    AttributeContainerFromZarr,
 )
 from varinfo.cf_config import CFConfig
-from varinfo.utilities import DAP4_TO_NUMPY_MAP
+from varinfo.utilities import DAP4_TO_NUMPY_MAP, get_dmr_tag_types
 
 
-InputGroupType = Union[ET.Element, NetCDF4Group]
+InputGroupType = Union[ET.Element, NetCDF4Group, dict]
 
 
 class GroupBase(AttributeContainerBase):
@@ -61,12 +62,40 @@ class GroupFromDmr(GroupBase, AttributeContainerFromDmr):
 
     """
 
+    def __init__(
+        self,
+        group: ET.Element,
+        cf_config: CFConfig,
+        namespace: str,
+        full_name_path: str,
+        child_variables: set[str] | None = None,
+        lazy_attributes: bool = True,
+    ):
+        """The optional `child_variables` are the full paths of all variables
+        in the group, if they have already been identified while traversing the
+        `.dmr`. Otherwise, they will be parsed from the group element.
+
+        If `lazy_attributes` is set, metadata attributes other than those
+        referring to other variables are only decoded when first requested.
+        This requires the group element to remain unchanged after
+        instantiation.
+
+        """
+        self.child_variables = child_variables
+        self.lazy_attributes = lazy_attributes
+        super().__init__(group, cf_config, namespace, full_name_path)
+
     def _parse_variables(self, group: ET.Element) -> set[str]:
         """Returns full paths of all child variables in the group."""
+        if self.child_variables is not None:
+            return self.child_variables
+
+        tag_types = get_dmr_tag_types(self.namespace)
+
         return {
             '/'.join([self.full_name_path.rstrip('/'), child.get('name', '')])
             for child in group
-            if child.tag.replace(self.namespace, '') in DAP4_TO_NUMPY_MAP
+            if tag_types.get(child.tag) in DAP4_TO_NUMPY_MAP
         }
 
 
@@ -82,3 +111,20 @@ class GroupFromNetCDF4(GroupBase, AttributeContainerFromNetCDF4):
             '/'.join([self.full_name_path.rstrip('/'), variable])
             for variable in group.variables
         }
+
+
+class GroupFromZarr(GroupBase, AttributeContainerFromZarr):
+    """This child class inherits from the `GroupBase` class and implements the
+    abstract methods assuming the group source is from the consolidated
+    metadata of a Zarr store. The group is a dictionary containing the parsed
+    `.zattrs` of the group under the "attributes" key, and the names of all
+    child arrays under the "variables" key.
+
+    """
+
+    def _parse_variables(self, group: dict) -> set[str]:
+        """Returns full paths of all child variables in the group."""
+        return {
+            '/'.join([self.full_name_path.rstrip('/'), variable])
+            for variable in group.get('variables', [])
+        }
@@ -0,0 +1,366 @@
+"""This module contains the XML parser backends that can be used to read an
+OPeNDAP DMR. The default backend is the `xml.etree.ElementTree` module from
+the Python standard library. If the `lxml` package is installed, `lxml.etree`
+can be used instead. Lastly, the `expat` backend uses event handlers with the
+`xml.parsers.expat` module directly, and never constructs an element tree
+for the whole document. Instead, only the subtrees for individual variables,
+dimensions and metadata attributes are created.
+
+Elements in a given namespace, such as the chunk manifests in a DMR++, can
+also be removed from the raw bytes of a document before they are passed to
+any of these parsers, so that no XML elements are created for them.
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from types import ModuleType
+from xml.parsers import expat
+import re
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+from varinfo.exceptions import InvalidParserBackendError
+
+
+DMRPP_NAMESPACE = 'http://xml.opendap.org/dap/dmrpp/1.0.0#'
+PARSER_BACKENDS = ['etree', 'lxml', 'expat']
+
+# Matches the attributes of a start tag, allowing ">" within quoted values.
+TAG_ATTRIBUTES = rb'(?:[^>"\']|"[^"]*"|\'[^\']*\')*?'
+
+# Matches the remainder of a start tag, after its name.
+START_TAG_REMAINDER = TAG_ATTRIBUTES + rb'(/?)>'
+
+# Matches the remainder of an end tag, after its name. If the end of the
+# buffer is reached first, the closing ">" is not captured.
+END_TAG_REMAINDER = re.compile(rb'\s*(?:(>)|\Z)')
+
+# The opening and closing of sections in which markup is not recognised.
+UNPARSED_SECTIONS = ((b'<!--', b'-->'), (b'<![CDATA[', b']]>'))
+UNPARSED_SECTION_LENGTH = max(len(opening) for opening, _ in UNPARSED_SECTIONS)
+
+
+def get_element_tree_module(parser_backend: str) -> ModuleType:
+    """Retrieve the module used to create XML parsers and elements for the
+    requested backend. The `expat` backend creates `xml.etree.ElementTree`
+    elements for each variable subtree.
+
+    """
+    if parser_backend not in PARSER_BACKENDS or (
+        parser_backend == 'lxml' and lxml_etree is None
+    ):
+        raise InvalidParserBackendError(parser_backend)
+
+    if parser_backend == 'lxml':
+        element_tree_module = lxml_etree
+    else:
+        element_tree_module = ET
+
+    return element_tree_module
+
+
+def iterparse_with_expat(
+    xml_chunks: Iterable[bytes | memoryview],
+    events: tuple[str, ...] = ('start', 'end'),
+) -> Iterator[tuple[str, ET.Element]]:
+    """Incrementally parse an XML document with `xml.parsers.expat`, yielding
+    the requested "start" and "end" events, and the elements they relate to,
+    in the same form as `xml.etree.ElementTree.XMLPullParser`.
+
+    A new element is created for each opening tag, but child elements are
+    only appended to their parent if that parent is not a `Dataset` or a
+    `Group`, or if the child is an `Attribute`. As such, the elements for
+    variables, dimensions and metadata attributes contain their full
+    subtrees, while the document and its groups only retain their own
+    metadata attributes, without any intermediate element tree.
+
+    """
+    open_elements: list[ET.Element] = []
+    has_children: list[bool] = []
+    pending_events: list[tuple[str, ET.Element]] = []
+    yield_start = 'start' in events
+    yield_end = 'end' in events
+
+    def start_element(name: str, attributes: dict[str, str]):
+        """Create an element for the opening tag, qualifying the tag and the
+        names of any attributes with their namespace, if present.
+
+        """
+        element = ET.Element(
+            get_qualified_name(name),
+            {
+                get_qualified_name(attribute_name): attribute_value
+                for attribute_name, attribute_value in attributes.items()
+            },
+        )
+
+        if len(open_elements) > 0:
+            parent = open_elements[-1]
+
+            if element.tag.endswith('}Attribute') or not (
+                parent.tag.endswith('}Group') or parent.tag.endswith('}Dataset')
+            ):
+                parent.append(element)
+
+            has_children[-1] = True
+
+        open_elements.append(element)
+        has_children.append(False)
+
+        if yield_start:
+            pending_events.append(('start', element))
+
+    def end_element(name: str):
+        """Close the most recently opened element."""
+        element = open_elements.pop()
+        has_children.pop()
+
+        if yield_end:
+            pending_events.append(('end', element))
+
+    def character_data(data: str):
+        """Retain text preceding the first child of an element."""
+        if not has_children[-1]:
+            element = open_elements[-1]
+            element.text = data if element.text is None else element.text + data
+
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    for xml_chunk in xml_chunks:
+        parser.Parse(xml_chunk, False)
+        yield from pending_events
+        pending_events.clear()
+
+    parser.Parse(b'', True)
+    yield from pending_events
+
+
+def get_qualified_name(expat_name: str) -> str:
+    """Convert a name reported by `xml.parsers.expat`, with the namespace
+    separated by a "}" character, to the fully qualified form used by
+    `xml.etree.ElementTree`, e.g.: "{namespace}name".
+
+    """
+    if '}' in expat_name:
+        qualified_name = f'{{{expat_name}'
+    else:
+        qualified_name = expat_name
+
+    return qualified_name
+
+
+def strip_namespace_elements(
+    xml_chunks: Iterable[bytes | memoryview],
+    namespace: str,
+    get_replacement: Callable[[bytes, bytes, bytes], bytes] | None = None,
+) -> Iterator[bytes]:
+    """Remove all elements in the specified namespace, and their content, from
+    the raw bytes of an XML document, yielding the remaining bytes in chunks.
+    The prefix of the namespace is taken from its declaration in the start
+    tag of the root element. If the namespace is not declared there, the
+    document is yielded unchanged.
+
+    Each element is located with a search of the raw bytes for its prefixed
+    start tag, and then for the matching end tag, so the removed elements are
+    never parsed. Comments and CDATA sections are skipped by each search, so
+    any tags within them are not mistaken for elements. If supplied,
+    `get_replacement` is called with the prefix, the local name and the full
+    content of each removed element, and its output is yielded in place of
+    that element.
+
+    Between chunks, only the bytes from the start of an unfinished element,
+    comment or CDATA section, or a possible partial tag, are retained, and
+    searches resume from where the previous search stopped.
+
+    This assumes elements in the namespace are not nested within another
+    element of the same name, as is the case for the DMR++ namespace.
+
+    """
+    xml_chunks = iter(xml_chunks)
+    buffer = bytearray()
+    prefix = None
+
+    for xml_chunk in xml_chunks:
+        buffer += xml_chunk
+        root_tag = re.search(rb'<[A-Za-z_][^\s/>]*' + START_TAG_REMAINDER, buffer)
+
+        if root_tag is not None:
+            declaration = re.search(
+                rb'xmlns:([^\s=]+)\s*=\s*["\']'
+                + re.escape(namespace.encode('utf-8'))
+                + rb'["\']',
+                root_tag.group(0),
+            )
+            prefix = None if declaration is None else declaration.group(1)
+            break
+
+    if prefix is None:
+        yield bytes(buffer)
+        yield from map(bytes, xml_chunks)
+        return
+
+    start_token = b'<' + prefix + b':'
+    start_tag = re.compile(
+        re.escape(start_token) + rb'([^\s/>]+)' + START_TAG_REMAINDER
+    )
+    position = 0
+    search_start = 0
+    element_start = None
+    element_name = b''
+    end_token = b''
+
+    while True:
+        # Find the next start tag, or the end tag of the open element, and
+        # skip any comment or CDATA section before it.
+        token = start_token if element_start is None else end_token
+        token_start = buffer.find(token, search_start)
+        section = find_unparsed_section(
+            buffer, search_start, len(buffer) if token_start == -1 else token_start
+        )
+        element_end = None
+
+        if section is not None:
+            if section[1] is not None:
+                search_start = section[1]
+                continue
+
+            search_start = section[0]
+        elif token_start == -1:
+            search_start = max(
+                search_start, len(buffer) - max(len(token), UNPARSED_SECTION_LENGTH)
+            )
+        elif element_start is None:
+            element_tag = start_tag.match(buffer, token_start)
+            search_start = token_start
+
+            if element_tag is not None and element_tag.group(2) == b'/':
+                element_start = token_start
+                element_name = element_tag.group(1)
+                element_end = element_tag.end()
+            elif element_tag is not None:
+                element_start = token_start
+                element_name = element_tag.group(1)
+                end_token = b'</' + prefix + b':' + element_name
+                search_start = element_tag.end()
+                continue
+        else:
+            end_tag = END_TAG_REMAINDER.match(buffer, token_start + len(end_token))
+
+            if end_tag is None:
+                # A longer name with the same beginning, e.g. "chunksX".
+                search_start = token_start + 1
+                continue
+
+            search_start = token_start
+
+            if end_tag.group(1) is not None:
+                element_end = end_tag.end()
+
+        if element_end is not None:
+            yield bytes(buffer[position:element_start])
+
+            if get_replacement is not None:
+                yield get_replacement(
+                    prefix, element_name, bytes(buffer[element_start:element_end])
+                )
+
+            position = search_start = element_end
+            element_start = None
+            continue
+
+        # Retain any unfinished element, comment, CDATA section or partial
+        # tag, and then read more of the document.
+        retained_start = search_start if element_start is None else element_start
+        yield bytes(buffer[position:retained_start])
+        del buffer[:retained_start]
+        search_start -= retained_start
+        element_start = None if element_start is None else 0
+        position = 0
+        xml_chunk = next(xml_chunks, None)
+
+        if xml_chunk is None:
+            yield bytes(buffer)
+            return
+
+        buffer += xml_chunk
+
+
+def find_unparsed_section(
+    buffer: bytes | bytearray, search_start: int, search_end: int
+) -> tuple[int, int | None] | None:
+    """Find the first comment or CDATA section beginning between the search
+    start and end positions of the buffer, returning its start and end
+    positions. If the section is not complete within the buffer, the end
+    position is `None`. If there is no such section, `None` is returned.
+
+    """
+    section_start = buffer.find(b'<!', search_start, search_end)
+
+    while section_start != -1:
+        for opening, closing in UNPARSED_SECTIONS:
+            if buffer.startswith(opening, section_start):
+                section_end = buffer.find(closing, section_start + len(opening))
+
+                if section_end == -1:
+                    return section_start, None
+
+                return section_start, section_end + len(closing)
+
+            if len(buffer) - section_start < len(opening) and opening.startswith(
+                bytes(buffer[section_start:])
+            ):
+                return section_start, None
+
+        section_start = buffer.find(b'<!', section_start + 2, search_end)
+
+    return None
+
+
+def get_dmrpp_chunk_summary(prefix: bytes, name: bytes, content: bytes) -> bytes:
+    """Create an element to replace a `chunks` element in a DMR++, containing
+    the number of `chunk` elements, the sum of their sizes in bytes and the
+    compression filters listed in the `compressionType` of the manifest. All
+    other elements in the DMR++ namespace are removed without replacement.
+
+    The `chunk` start tags are found with a search of the raw bytes, after
+    removing any comments or CDATA sections from the content.
+
+    """
+    if name != b'chunks':
+        return b''
+
+    if b'<!' in content:
+        content = re.sub(rb'<!--.*?-->|<!\[CDATA\[.*?\]\]>', b'', content, flags=re.S)
+
+    chunk_sizes = re.findall(
+        rb'<' + re.escape(prefix) + rb':chunk\s' + TAG_ATTRIBUTES + rb'\bnBytes\s*='
+        rb'\s*["\']?(\d+)',
+        content,
+    )
+    compression_type = re.match(
+        rb'<[^\s/>]+' + TAG_ATTRIBUTES + rb'\bcompressionType\s*=\s*'
+        rb'(?:"([^"]*)"|\'([^\']*)\')',
+        content,
+    )
+
+    if compression_type is None:
+        filters = b''
+    else:
+        filters = compression_type.group(1) or compression_type.group(2) or b''
+
+    return b'<%b:chunkSummary chunkCount="%d" byteTotal="%d" filters="%b"/>' % (
+        prefix,
+        len(chunk_sizes),
+        sum(map(int, chunk_sizes)),
+        filters.replace(b'"', b'&quot;'),
+    )
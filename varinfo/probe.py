@@ -0,0 +1,240 @@
+"""This module contains functions to determine the collection short name and
+mission of a granule, without parsing its groups and variables. This allows,
+for example, a granule to be routed to the appropriate service using only
+the `CollectionShortNamePath` and `Mission` sections of the VarInfo
+configuration file.
+
+For an OPeNDAP `.dmr`, the document is parsed incrementally with
+`xml.parsers.expat`, and parsing stops as soon as the highest priority
+location is resolved. Elements are only created along the requested
+attribute paths, not for the subtrees of unrelated variables. For a NetCDF-4
+file, only the metadata attributes at each location are read.
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import partial
+from typing import Any
+from xml.parsers import expat
+import xml.etree.ElementTree as ET
+
+from varinfo.cf_config import config_registry
+from varinfo.parser_backends import get_qualified_name
+from varinfo.utilities import (
+    BinarySourceType,
+    XmlAttributePathSearch,
+    get_full_path_netcdf4_attribute,
+    get_xml_namespace,
+    read_binary_chunks,
+)
+from varinfo.var_info import NetCDF4SourceType, open_netcdf4_source
+
+
+def probe_dmr(
+    file_path: BinarySourceType, config_file: str | None = None
+) -> tuple[str | None, str | None]:
+    """Determine the collection short name and mission of a granule from its
+    `.dmr`, using the locations and mission mapping in the VarInfo
+    configuration file. The `.dmr` can be supplied as a path to a local file,
+    a bytes-like object or a binary file-like object, as for
+    `VarInfoFromDmr`. A DMR++ can also be probed in the same way.
+
+    The values are the same as the `short_name` and `mission` of a
+    `VarInfoFromDmr` instance for the same `.dmr`. Either can be `None`.
+
+    """
+    registered_config = config_registry.get_registered_config(config_file)
+    short_name_paths = registered_config.config.get('CollectionShortNamePath', [])
+
+    if len(short_name_paths) > 0:
+        short_name = get_first_dmr_attribute(
+            read_binary_chunks(file_path), short_name_paths
+        )
+    else:
+        short_name = None
+
+    mission = registered_config.mission_resolver.resolve(short_name)
+
+    return short_name, mission
+
+
+def probe_netcdf4(
+    file_path: NetCDF4SourceType, config_file: str | None = None
+) -> tuple[str | None, str | None]:
+    """Determine the collection short name and mission of a granule from the
+    metadata attributes of a NetCDF-4 file, using the locations and mission
+    mapping in the VarInfo configuration file. The file can be supplied in
+    any of the forms accepted by `VarInfoFromNetCDF4`. Only the attributes at
+    each location are read, until a short name is found.
+
+    The values are the same as the `short_name` and `mission` of a
+    `VarInfoFromNetCDF4` instance for the same file. Either can be `None`.
+
+    """
+    registered_config = config_registry.get_registered_config(config_file)
+    dataset, owns_dataset = open_netcdf4_source(file_path)
+
+    try:
+        short_name = next(
+            (
+                short_name
+                for short_name in map(
+                    partial(get_full_path_netcdf4_attribute, dataset),
+                    registered_config.config.get('CollectionShortNamePath', []),
+                )
+                if short_name is not None
+            ),
+            None,
+        )
+    finally:
+        if owns_dataset:
+            dataset.close()
+
+    mission = registered_config.mission_resolver.resolve(short_name)
+
+    return short_name, mission
+
+
+def get_first_dmr_attribute(
+    dmr_chunks: Iterable[bytes | memoryview], attribute_paths: list[str]
+) -> Any | None:
+    """Parse a `.dmr` with `xml.parsers.expat`, returning the first non-`None`
+    value from the list of full attribute paths, with earlier paths in the
+    list taking precedence over later ones.
+
+    Each path is tracked by a `varinfo.utilities.XmlAttributePathSearch`, so
+    the paths are resolved with exactly the same semantics as for
+    `VarInfoFromDmr`. However, the searches are driven directly from the
+    expat start and end handlers: an element is only created for the root
+    element, elements matching a path segment, and requested Attribute
+    elements and their children. All other elements are represented by a
+    single placeholder. Parsing stops after the chunk in which the value of
+    the highest priority path is determined.
+
+    """
+    if len(attribute_paths) == 0:
+        return None
+
+    searches: list[XmlAttributePathSearch] = []
+    pending_segments: set[str] = set()
+    requested_attributes: set[tuple[ET.Element, str]] = set()
+    open_elements: list[ET.Element] = []
+    attribute_elements: list[ET.Element] = []
+    unrelated_element = ET.Element('unrelated')
+
+    def update_searches(element: ET.Element, parent: ET.Element | None, event: str):
+        """Pass a created element to all searches, and then note the names of
+        the elements, and the Attribute elements, that the unfinished
+        searches now need.
+
+        """
+        for search in searches:
+            if event == 'start':
+                search.start(element, is_root=parent is None)
+            else:
+                search.end(element, parent)
+
+        pending_segments.clear()
+        pending_segments.update(search.next_segment for search in searches)
+        pending_segments.discard(None)
+        requested_attributes.clear()
+        requested_attributes.update(
+            (search.container, search.attribute_name)
+            for search in searches
+            if search.container is not None and not (search.resolved or search.failed)
+        )
+
+    def start_element(name: str, attributes: dict[str, str]):
+        """Create an element for the opening tag, if it is the root element,
+        matches the next segment of a search, or is part of a requested
+        Attribute. Only created elements are passed to the searches.
+
+        """
+        element_name = attributes.get('name')
+        parent = open_elements[-1] if len(open_elements) > 0 else None
+
+        if parent is None:
+            element = ET.Element(get_qualified_name(name))
+            namespace = get_xml_namespace(element)
+            searches.extend(
+                XmlAttributePathSearch(attribute_path, namespace)
+                for attribute_path in attribute_paths
+            )
+        elif len(attribute_elements) > 0 or (
+            name.endswith('}Attribute')
+            and (parent, element_name) in requested_attributes
+        ):
+            element = ET.Element(
+                get_qualified_name(name),
+                {
+                    get_qualified_name(attribute_name): attribute_value
+                    for attribute_name, attribute_value in attributes.items()
+                },
+            )
+
+            if len(attribute_elements) > 0:
+                attribute_elements[-1].append(element)
+            else:
+                parser.CharacterDataHandler = character_data
+
+            attribute_elements.append(element)
+        elif element_name in pending_segments:
+            element = ET.Element(get_qualified_name(name), {'name': element_name})
+        else:
+            element = unrelated_element
+
+        if element is not unrelated_element:
+            update_searches(element, parent, 'start')
+
+        open_elements.append(element)
+
+    def end_element(name: str):
+        """Close the most recently opened element, passing it to the searches
+        if it was created, or if it is the root element.
+
+        """
+        element = open_elements.pop()
+        parent = open_elements[-1] if len(open_elements) > 0 else None
+
+        if len(attribute_elements) > 0:
+            attribute_elements.pop()
+
+            if len(attribute_elements) == 0:
+                parser.CharacterDataHandler = None
+
+        if element is not unrelated_element:
+            update_searches(element, parent, 'end')
+
+    def character_data(data: str):
+        """Retain text preceding the first child of an element within a
+        requested Attribute. This handler is only set while such an Attribute
+        is open.
+
+        """
+        element = attribute_elements[-1]
+
+        if len(element) == 0:
+            element.text = data if element.text is None else element.text + data
+
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+
+    for dmr_chunk in dmr_chunks:
+        parser.Parse(dmr_chunk, False)
+        first_candidate = next(
+            (search for search in searches if not search.failed), None
+        )
+
+        if len(searches) > 0 and first_candidate is None:
+            return None
+
+        if first_candidate is not None and first_candidate.resolved:
+            return first_candidate.value
+
+    parser.Parse(b'', True)
+
+    return next((search.value for search in searches if search.resolved), None)
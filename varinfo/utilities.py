@@ -20,7 +20,11 @@ Services team, primarily for use with references for segmented data.
 
 from __future__ import annotations
 
-from typing import Any
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from mmap import mmap
+from os import PathLike
+from typing import Any, BinaryIO, Union
 from xml.etree.ElementTree import Element
 import functools
 import re
@@ -46,6 +50,12 @@ CF_REFERENCE_ATTRIBUTES = [
     'subset_control_variables',
 ]
 
+BINARY_CHUNK_SIZE = 2**16
+
+# The number of collection short names for which the mission is retained by
+# each `MissionResolver`.
+MISSION_CACHE_SIZE = 1024
+
 DAP4_TO_NUMPY_MAP = {
     'Char': np.uint8,
     'Byte': np.uint8,
@@ -64,6 +74,20 @@ DAP4_TO_NUMPY_MAP = {
 }
 
 
+DMR_ELEMENT_TYPES = [
+    *DAP4_TO_NUMPY_MAP,
+    'Attribute',
+    'Dataset',
+    'Dim',
+    'Dimension',
+    'Group',
+    'Value',
+]
+
+
+BinarySourceType = Union[str, PathLike, bytes, bytearray, memoryview, mmap, BinaryIO]
+
+
 def recursive_get(input_dictionary: dict, keys: list[str]):
     """Extract a value from an arbitrarily nested dictionary."""
     try:
@@ -85,6 +109,64 @@ def split_attribute_path(full_path: str) -> list[str]:
     return full_path.lstrip('/').split('/')
 
 
+def is_binary_file_object(source: Any) -> bool:
+    """Determine whether an input source is a file-like object, as opposed to
+    a file path or a bytes-like object. Note, an `mmap.mmap` instance has a
+    `read` method, but is treated as a bytes-like object.
+
+    """
+    return not isinstance(
+        source, (str, PathLike, bytes, bytearray, memoryview, mmap)
+    ) and hasattr(source, 'read')
+
+
+def read_binary_chunks(
+    source: BinarySourceType, chunk_size: int = BINARY_CHUNK_SIZE
+) -> Iterator[bytes | memoryview]:
+    """Yield the content of a binary source in chunks, without decoding it.
+    The source can be a path to a local file, a bytes-like object (including
+    `memoryview` and `mmap.mmap` instances) or a binary file-like object.
+    Chunks of bytes-like objects are zero-copy `memoryview` slices. File-like
+    objects are read from their current position, and are not closed.
+
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, 'rb') as file_handler:
+            yield from iter(functools.partial(file_handler.read, chunk_size), b'')
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap)):
+        with memoryview(source) as source_view, source_view.cast('B') as source_buffer:
+            for offset in range(0, source_buffer.nbytes, chunk_size):
+                yield source_buffer[offset : offset + chunk_size]
+    else:
+        yield from iter(functools.partial(source.read, chunk_size), b'')
+
+
+@functools.lru_cache(maxsize=None)
+def get_dmr_tag_types(namespace: str) -> dict[str, str]:
+    """Create a lookup table mapping the fully qualified tags of all known
+    `.dmr` element types to the unqualified type, e.g.:
+    '{http://xml.opendap.org/ns/DAP/4.0#}Float64': 'Float64'. This allows the
+    type of each element to be identified without creating a new string for
+    each element. The table is cached, so it is shared between all parsing
+    of documents with the same namespace.
+
+    """
+    return {
+        f'{namespace}{element_type}': element_type for element_type in DMR_ELEMENT_TYPES
+    }
+
+
+def get_dmr_element_type(element: Element, namespace: str) -> str:
+    """Retrieve the unqualified type of an XML element from a `.dmr`, e.g.,
+    'Float64' or 'Group'. Types not in the lookup table are determined by
+    removing the exact namespace prefix from the element tag.
+
+    """
+    return get_dmr_tag_types(namespace).get(
+        element.tag, element.tag.removeprefix(namespace)
+    )
+
+
 def get_xml_namespace(root_element: Element) -> str:
     """Given the root element of an XML document, extract the associated
     namespace. This allows for the full qualification of child elements.
@@ -106,6 +188,7 @@ def get_xml_attribute(
     attribute_name: str,
     namespace: str,
     default_value: Any | None = None,
+    as_array: bool = False,
 ) -> Any | None:
     """Extract the value of an XML Attribute tag from a `.dmr`. First search
     the supplied variable element for a fully qualified Attribute child
@@ -115,8 +198,9 @@ def get_xml_attribute(
     cast as the type indicated by the Attribute tag's `type` property.
 
     Attributes with multiple Value children will return a list of all those
-    children, cast as the indicated type. Attributes that are containers of
-    nested attributes will return a dictionary structure.
+    children, cast as the indicated type, or a NumPy array for numeric types
+    if `as_array` is set. Attributes that are containers of nested attributes
+    will return a dictionary structure.
 
     """
     attribute_element = variable.find(
@@ -124,20 +208,42 @@ def get_xml_attribute(
     )
 
     if attribute_element is not None:
-        value_type = attribute_element.get('type', 'String')
+        attribute_value = get_xml_attribute_from_element(
+            attribute_element, namespace, default_value, as_array=as_array
+        )
+    else:
+        attribute_value = default_value
 
-        if value_type != 'Container':
-            attribute_value = get_xml_attribute_value(
-                attribute_element,
-                namespace,
-                value_type,
-                default_value,
-            )
-        else:
-            attribute_value = get_xml_container_attribute(attribute_element, namespace)
+    return attribute_value
+
+
+def get_xml_attribute_from_element(
+    attribute_element: Element,
+    namespace: str,
+    default_value: Any | None = None,
+    as_array: bool = False,
+) -> Any | None:
+    """Extract the value of an XML Attribute element that has already been
+    located within a `.dmr`. The returned value is cast as the type indicated
+    by the Attribute tag's `type` property, with containers of nested
+    attributes returned as a dictionary structure. If `as_array` is set,
+    numeric attributes with multiple values are returned as a NumPy array.
 
+    """
+    value_type = attribute_element.get('type', 'String')
+
+    if value_type != 'Container':
+        attribute_value = get_xml_attribute_value(
+            attribute_element,
+            namespace,
+            value_type,
+            default_value,
+            as_array=as_array,
+        )
     else:
-        attribute_value = default_value
+        attribute_value = get_xml_container_attribute(
+            attribute_element, namespace, as_array=as_array
+        )
 
     return attribute_value
 
@@ -147,17 +253,29 @@ def get_xml_attribute_value(
     namespace: str,
     value_type: str,
     default_value: Any | None = None,
+    as_array: bool = False,
 ) -> Any | None:
     """Extract the value (single or list) for an XML attribute. If there are
     no attributes matching the required name, then return the supplied default
     value. If no default value is supplied, the default used is `None`.
 
+    Numeric attributes with multiple values are decoded in bulk into a single
+    NumPy array. By default, this array is returned as a list of NumPy
+    scalars, but if `as_array` is set the array itself is returned.
+
     """
     numpy_type = DAP4_TO_NUMPY_MAP.get(value_type, str)
 
     value_elements = attribute_element.findall(f'{namespace}Value')
 
-    if len(value_elements) > 1:
+    if len(value_elements) > 1 and numpy_type is not str:
+        attribute_value = get_numeric_array(
+            [value_element.text for value_element in value_elements], numpy_type
+        )
+
+        if not as_array:
+            attribute_value = list(attribute_value)
+    elif len(value_elements) > 1:
         attribute_value = [
             numpy_type(value_element.text) for value_element in value_elements
         ]
@@ -169,8 +287,41 @@ def get_xml_attribute_value(
     return attribute_value
 
 
+def get_numeric_array(value_strings: list[str], numpy_type: type) -> np.ndarray:
+    """Decode a list of strings into a NumPy array of the requested numeric
+    type. The strings are parsed by the built-in `int` or `float` functions,
+    which are considerably faster than casting each string as a NumPy scalar,
+    and the resulting values are written directly into a typed array. This
+    conversion raises an exception for any value outside the range of the
+    NumPy type.
+
+    If any string cannot be parsed in this way, for example if a `Value`
+    element is empty, then each string is instead cast individually as a NumPy
+    scalar, for consistency with single-valued attributes.
+
+    """
+    if np.dtype(numpy_type).kind in 'iu':
+        python_type = int
+    else:
+        python_type = float
+
+    try:
+        numeric_array = np.fromiter(
+            map(python_type, value_strings),
+            dtype=numpy_type,
+            count=len(value_strings),
+        )
+    except (TypeError, ValueError):
+        numeric_array = np.array(
+            [numpy_type(value_string) for value_string in value_strings],
+            dtype=numpy_type,
+        )
+
+    return numeric_array
+
+
 def get_xml_container_attribute(
-    container_element: Element, namespace: str
+    container_element: Element, namespace: str, as_array: bool = False
 ) -> dict[str, Any | None]:
     """Extract a dictionary of attribute values when an attribute is a container
     for further attributes. This function is recursive, and so nested containers
@@ -188,11 +339,13 @@ def get_xml_container_attribute(
                 child,
                 namespace,
                 child_type,
+                as_array=as_array,
             )
         else:
             attribute_dictionary[child_name] = get_xml_container_attribute(
                 child,
                 namespace,
+                as_array=as_array,
             )
 
     return attribute_dictionary
@@ -225,6 +378,214 @@ def get_full_path_xml_attribute(
     return attribute_value
 
 
+class XmlNameIndex:
+    """An index of the elements in a `.dmr` that have a `name` property,
+    allowing full attribute paths to be resolved without repeatedly searching
+    the whole document. The index is built in a single pass through the
+    document, recording the document order position of each named element.
+    If `names` are specified, only elements with those names are indexed.
+
+    Paths are resolved with the same semantics as
+    `get_full_path_xml_attribute`: each path segment is the first element in
+    document order, with a matching `name`, that is a descendant of the
+    element matched for the previous segment.
+
+    """
+
+    def __init__(
+        self, root_element: Element, namespace: str, names: set[str] | None = None
+    ):
+        self.namespace = namespace
+        self.elements = list(root_element.iter())
+        self.positions: dict[str, list[int]] = {}
+        self.subtree_ends = {0: len(self.elements) - 1}
+
+        for position, element in enumerate(self.elements):
+            element_name = element.get('name')
+
+            if element_name is not None and (names is None or element_name in names):
+                self.positions.setdefault(element_name, []).append(position)
+
+    def get_full_path_attribute(self, attribute_path: str) -> Any | None:
+        """Retrieve the value of an XML attribute, given the full path to that
+        attribute. If the XML attribute is not present, then `None` is
+        returned.
+
+        """
+        position = 0
+
+        for path_part in attribute_path.lstrip('/').split('/')[:-1]:
+            if position is not None:
+                position = self.find_descendant(position, path_part)
+
+        if position is not None:
+            attribute_value = get_xml_attribute(
+                self.elements[position],
+                attribute_path.split('/')[-1],
+                self.namespace,
+            )
+        else:
+            attribute_value = None
+
+        return attribute_value
+
+    def find_descendant(self, position: int, name: str) -> int | None:
+        """Find the position of the first element in document order with the
+        requested name that is a descendant of the element at the specified
+        position. As positions are in document order, all descendants of an
+        element occupy a contiguous range of positions immediately following
+        that element.
+
+        """
+        if position not in self.subtree_ends:
+            self.subtree_ends[position] = (
+                position + sum(1 for _ in self.elements[position].iter()) - 1
+            )
+
+        candidates = self.positions.get(name, [])
+        candidate_index = bisect_right(candidates, position)
+
+        if (
+            candidate_index < len(candidates)
+            and candidates[candidate_index] <= self.subtree_ends[position]
+        ):
+            descendant_position = candidates[candidate_index]
+        else:
+            descendant_position = None
+
+        return descendant_position
+
+
+def get_first_full_path_xml_attribute(
+    xml_events: Iterable[tuple[str, Element]],
+    attribute_paths: list[str],
+    namespace: str,
+) -> Any | None:
+    """Streaming counterpart to `get_full_path_xml_attribute`. Consume the
+    "start" and "end" events of an incremental XML parse of a `.dmr`, and
+    return the first non-`None` value from the list of full attribute paths,
+    with earlier paths in the list taking precedence over later ones.
+
+    Each path is resolved with the same semantics as
+    `get_full_path_xml_attribute`, but events are only consumed until the
+    value for the highest priority path can be determined. Elements that are
+    direct children of a `Dataset` or `Group` are cleared once they have been
+    inspected, so memory use is bounded by the size of a single variable,
+    rather than that of the whole document.
+
+    """
+    group_tags = {f'{namespace}Dataset', f'{namespace}Group'}
+    searches = [XmlAttributePathSearch(path, namespace) for path in attribute_paths]
+    open_elements: list[Element] = []
+
+    for event, element in xml_events:
+        if event == 'start':
+            for search in searches:
+                search.start(element, is_root=len(open_elements) == 0)
+
+            open_elements.append(element)
+        else:
+            open_elements.pop()
+            parent = open_elements[-1] if len(open_elements) > 0 else None
+
+            for search in searches:
+                search.end(element, parent)
+
+            first_candidate = next(
+                (search for search in searches if not search.failed), None
+            )
+
+            if first_candidate is None:
+                return None
+
+            if first_candidate.resolved:
+                return first_candidate.value
+
+            if parent is not None and parent.tag in group_tags:
+                element.clear()
+
+    return None
+
+
+class XmlAttributePathSearch:
+    """A helper class that tracks the progress of locating a single full
+    attribute path, e.g.: '/METADATA/DatasetIdentification/shortName', while
+    the events of an incremental XML parse are consumed. Each path segment is
+    resolved to the first element in document order, with a matching `name`,
+    that is a descendant of the element matched for the previous segment.
+
+    """
+
+    def __init__(self, attribute_path: str, namespace: str):
+        self.namespace = namespace
+        self.segments = attribute_path.lstrip('/').split('/')[:-1]
+        self.attribute_name = attribute_path.split('/')[-1]
+        self.matched_elements: list[Element] = []
+        self.container: Element | None = None
+        self.resolved = False
+        self.failed = False
+        self.value = None
+
+    @property
+    def next_segment(self) -> str | None:
+        """The name of the next element this search needs to match, or `None`
+        if all segments have been matched, or the search has finished.
+
+        """
+        if (
+            self.resolved
+            or self.failed
+            or len(self.matched_elements) == len(self.segments)
+        ):
+            return None
+
+        return self.segments[len(self.matched_elements)]
+
+    def start(self, element: Element, is_root: bool = False):
+        """Check whether a newly opened element satisfies the next path
+        segment, noting the element containing the Attribute once all
+        segments have been matched.
+
+        """
+        if self.resolved or self.failed or self.container is not None:
+            return
+
+        if is_root:
+            if len(self.segments) == 0:
+                self.container = element
+        elif element.get('name') == self.segments[len(self.matched_elements)]:
+            self.matched_elements.append(element)
+
+            if len(self.matched_elements) == len(self.segments):
+                self.container = element
+
+    def end(self, element: Element, parent: Element | None):
+        """Check a closed element. If it is the requested Attribute child of
+        the matched container, decode its value. If the element closing is
+        the container, or the last matched ancestor, the path cannot be
+        resolved.
+
+        """
+        if self.resolved or self.failed:
+            return
+
+        if self.container is not None:
+            if element is self.container:
+                self.failed = True
+            elif (
+                parent is self.container
+                and element.tag == f'{self.namespace}Attribute'
+                and element.get('name') == self.attribute_name
+            ):
+                self.value = get_xml_attribute_from_element(element, self.namespace)
+                self.resolved = self.value is not None
+                self.failed = self.value is None
+        elif parent is None or (
+            len(self.matched_elements) > 0 and element is self.matched_elements[-1]
+        ):
+            self.failed = True
+
+
 def get_full_path_netcdf4_attribute(
     netcdf_dataset: NetCDF4Dataset,
     attribute_path: str,
@@ -248,3 +609,367 @@ def get_full_path_netcdf4_attribute(
         attribute_value = None
 
     return attribute_value
+
+
+def get_full_path_zarr_attribute(
+    zarr_metadata: dict[str, Any],
+    attribute_path: str,
+) -> Any | None:
+    """Helper function that retrieves the value of a metadata attribute from
+    the consolidated metadata of a Zarr store, given the full path to that
+    attribute. The attributes of each group or array are stored under the
+    ".zattrs" key for that group or array. If the metadata attribute is not
+    present, then `None` is returned.
+
+    """
+    container_path, _, attribute_name = attribute_path.rpartition('/')
+    attributes_key = '/'.join([container_path.strip('/'), '.zattrs']).lstrip('/')
+
+    return zarr_metadata.get(attributes_key, {}).get(attribute_name)
+
+
+def get_zarr_fill_value(fill_value: Any, data_type: str | None) -> Any:
+    """Decode the fill value from the `.zarray` of a Zarr array. Non-finite
+    floating point values are encoded in JSON as strings, such as "NaN", so
+    the fill value of an array with a numeric data type is cast to that type.
+    Other fill values, such as those for string arrays, are returned as
+    stored in the JSON.
+
+    """
+    if isinstance(data_type, str) and np.dtype(data_type).kind in 'biuf':
+        fill_value = np.dtype(data_type).type(fill_value)
+
+    return fill_value
+
+
+class GroupFilter:
+    """A filter determining which groups of a granule are parsed, based on
+    optional lists of regular expressions to include or exclude. As with the
+    variable patterns in the configuration file, each pattern is matched from
+    the start of the full path of the group, which always has a trailing
+    slash for the purposes of matching, e.g.: "/gt1l/.*" matches the groups
+    "/gt1l" and "/gt1l/heights".
+
+    A group matching an exclude pattern is pruned, along with all of its
+    descendants. If include patterns are specified, only groups matching one
+    of them are parsed. A group not matching any include pattern is still
+    traversed if one of its descendants could match, as determined by the
+    literal prefix of each include pattern, but its own metadata attributes
+    and variables are skipped. All other groups are pruned. The root group is
+    always parsed.
+
+    """
+
+    def __init__(
+        self,
+        include_patterns: list[str] | None = None,
+        exclude_patterns: list[str] | None = None,
+    ):
+        self.include_patterns = (
+            None
+            if include_patterns is None
+            else [re.compile(pattern) for pattern in include_patterns]
+        )
+        self.exclude_patterns = [
+            re.compile(pattern) for pattern in exclude_patterns or []
+        ]
+        self.include_prefixes = [
+            get_literal_prefix(pattern.pattern)
+            for pattern in self.include_patterns or []
+        ]
+        self.traversed_groups: dict[str, bool] = {'/': True}
+        self.parsed_groups: dict[str, bool] = {'/': True}
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter has no patterns, and so parses every group."""
+        return self.include_patterns is None and len(self.exclude_patterns) == 0
+
+    def traverses(self, group_path: str) -> bool:
+        """Whether the children of a group should be visited. This requires
+        that neither the group nor any of its ancestors are excluded, and that
+        the group or one of its descendants could match an include pattern.
+
+        """
+        group_path = get_filter_group_path(group_path)
+
+        if group_path not in self.traversed_groups:
+            self.traversed_groups[group_path] = self.traverses(
+                get_parent_group_path(group_path)
+            ) and not any(
+                pattern.match(group_path) for pattern in self.exclude_patterns
+            )
+
+            if self.traversed_groups[group_path] and self.include_patterns:
+                self.traversed_groups[group_path] = self._matches_include(
+                    group_path
+                ) or any(
+                    prefix.startswith(group_path) or group_path.startswith(prefix)
+                    for prefix in self.include_prefixes
+                )
+
+        return self.traversed_groups[group_path]
+
+    def parses(self, group_path: str) -> bool:
+        """Whether the metadata attributes and variables of a group should be
+        parsed. This requires the group to be traversed and, if include
+        patterns are specified, to match one of them.
+
+        """
+        group_path = get_filter_group_path(group_path)
+
+        if group_path not in self.parsed_groups:
+            self.parsed_groups[group_path] = self.traverses(group_path) and (
+                self.include_patterns is None or self._matches_include(group_path)
+            )
+
+        return self.parsed_groups[group_path]
+
+    def _matches_include(self, group_path: str) -> bool:
+        """Whether the group path matches any of the include patterns."""
+        return any(pattern.match(group_path) for pattern in self.include_patterns)
+
+
+def get_filter_group_path(group_path: str) -> str:
+    """Normalise the full path of a group to the form matched by a
+    `GroupFilter`, with a leading and trailing slash.
+
+    """
+    return f'/{group_path.strip("/")}/'.replace('//', '/')
+
+
+def get_parent_group_path(path: str) -> str:
+    """Retrieve the full path of the group containing a variable or group,
+    e.g.: "/gt1l/heights/h_ph" is contained in "/gt1l/heights". The root
+    group is its own parent.
+
+    """
+    return path.rstrip('/').rpartition('/')[0] or '/'
+
+
+def get_literal_prefix(pattern: str) -> str:
+    """Retrieve the longest literal string that must begin any path matched
+    from the start of a regular expression. This stops at the first special
+    character, and excludes a final character that may be optional or
+    repeated. A pattern with alternation has no such prefix.
+
+    """
+    if '|' in pattern:
+        return ''
+
+    literal_prefix = re.match(r'[^.^$*+?{}\[\]\\()]*', pattern).group()
+
+    if pattern[len(literal_prefix) : len(literal_prefix) + 1] in {'?', '*', '{'}:
+        literal_prefix = literal_prefix[:-1]
+
+    return literal_prefix
+
+
+def get_literal_prefixes(pattern: str, max_prefixes: int = 64) -> list[str]:
+    """Retrieve literal strings, one of which must begin any path matched from
+    the start of a regular expression. In addition to the literal characters
+    retrieved by `get_literal_prefix`, each character class consisting only of
+    letters, digits or underscores is expanded into one prefix per character,
+    e.g.: "/gt[12][lr]/heights/.*" gives "/gt1l/heights/", "/gt1r/heights/",
+    "/gt2l/heights/" and "/gt2r/heights/". Expansion stops before exceeding
+    `max_prefixes`. A pattern with alternation outside of a group has only an
+    empty prefix.
+
+    """
+    if has_top_level_alternation(pattern):
+        return ['']
+
+    prefixes = ['']
+    position = 0
+
+    while position < len(pattern):
+        literal = re.match(r'[^.^$*+?{}\[\]\\()|]*', pattern[position:]).group()
+        character_class = re.match(r'\[(\w+)\]', pattern[position:])
+
+        if literal != '':
+            token_length = len(literal)
+            options = [literal]
+        elif character_class is not None:
+            token_length = len(character_class.group())
+            options = sorted(set(character_class.group(1)))
+        else:
+            break
+
+        if pattern[position + token_length : position + token_length + 1] in {
+            '?',
+            '*',
+            '{',
+        }:
+            # The final character (or character class) is optional, or has
+            # an unknown number of repetitions.
+            if literal != '':
+                prefixes = [prefix + literal[:-1] for prefix in prefixes]
+
+            break
+
+        if len(prefixes) * len(options) > max_prefixes:
+            break
+
+        prefixes = [prefix + option for prefix in prefixes for option in options]
+        position += token_length
+
+    return prefixes
+
+
+def has_top_level_alternation(pattern: str) -> bool:
+    """Whether a regular expression contains alternation ("|") that is not
+    within a group or character class, and so applies to the whole pattern.
+
+    """
+    depth = 0
+    in_class = False
+    escaped = False
+
+    for character in pattern:
+        if escaped:
+            escaped = False
+        elif character == '\\':
+            escaped = True
+        elif in_class:
+            in_class = character != ']'
+        elif character == '[':
+            in_class = True
+        elif character == '(':
+            depth += 1
+        elif character == ')':
+            depth -= 1
+        elif character == '|' and depth == 0:
+            return True
+
+    return False
+
+
+class PatternPrefixTrie:
+    """A trie of the literal prefixes of regular expressions, as retrieved by
+    `get_literal_prefixes`, keyed by path segment. Each prefix is split into
+    complete segments, which identify a node of the trie, and a remainder
+    after the last slash. The node holds the remainder and a value, such as
+    an index into a list of compiled patterns. This allows the patterns that
+    could match a path to be found by walking the segments of that path
+    once, rather than evaluating every pattern. Values added with an empty
+    prefix are held by the root node, and so are candidates for every path.
+
+    """
+
+    def __init__(self):
+        self.children: dict[str, PatternPrefixTrie] = {}
+        self.values: list[tuple[str, Any]] = []
+
+    def add(self, prefix: str, value: Any):
+        """Add a value to the node for the complete segments of the prefix,
+        along with the remainder of the prefix.
+
+        """
+        node = self
+        *segments, remainder = prefix.split('/')
+
+        for segment in segments:
+            node = node.children.setdefault(segment, PatternPrefixTrie())
+
+        node.values.append((remainder, value))
+
+    def get_values(self, path: str) -> list[Any]:
+        """Retrieve all values added with a prefix of the specified path,
+        including the empty prefix.
+
+        """
+        node = self
+        values = []
+
+        for segment in path.split('/'):
+            for remainder, value in node.values:
+                if segment.startswith(remainder):
+                    values.append(value)
+
+            node = node.children.get(segment)
+
+            if node is None:
+                break
+
+        return values
+
+
+class MissionResolver:
+    """Resolve collection short names to missions, using the regular
+    expressions of the "Mission" mapping in the VarInfo configuration, where
+    the first pattern to match a short name determines its mission.
+
+    The patterns are combined into a single regular expression, with each
+    pattern in a named group of a top-level alternation, so that a short name
+    is matched once, rather than against each pattern in turn. Alternatives
+    are tried in order, so the first matching pattern is still the one
+    found. Patterns that cannot be combined, such as those containing
+    backreferences, which would refer to the wrong group, or global inline
+    flags, are instead matched in turn. The mission of each short name is
+    retained in a least-recently used cache.
+
+    A resolver is created once for each configuration file registered with
+    `varinfo.cf_config.ConfigRegistry`, and retrieved with
+    `ConfigRegistry.get_registered_config`.
+
+    """
+
+    def __init__(self, mission_items: tuple[tuple[str, str], ...], cache_size: int):
+        self.missions = [mission for _, mission in mission_items]
+        self.patterns = [pattern for pattern, _ in mission_items]
+        self.combined_pattern = get_combined_pattern(self.patterns)
+
+        if self.combined_pattern is None:
+            self.compiled_patterns = [re.compile(pattern) for pattern in self.patterns]
+        else:
+            self.compiled_patterns = []
+
+        self.resolve = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, short_name: str | None) -> str | None:
+        """Return the mission of the first pattern matching the short name,
+        or `None` if there is no short name, or no pattern matches.
+
+        """
+        if short_name is None:
+            return None
+
+        if self.combined_pattern is not None:
+            match = self.combined_pattern.match(short_name)
+
+            if match is None:
+                return None
+
+            return self.missions[int(match.lastgroup.rpartition('_')[2])]
+
+        return next(
+            (
+                mission
+                for pattern, mission in zip(self.compiled_patterns, self.missions)
+                if pattern.match(short_name) is not None
+            ),
+            None,
+        )
+
+
+def get_combined_pattern(patterns: list[str]) -> re.Pattern | None:
+    """Combine regular expressions into a single alternation, with each
+    pattern in a group named by its position, e.g.: "mission_0". If any
+    pattern contains a backreference, or the combined expression cannot be
+    compiled, `None` is returned.
+
+    """
+    if len(patterns) == 0 or any(
+        re.search(r'\\[1-9]|\(\?P=', pattern) is not None for pattern in patterns
+    ):
+        return None
+
+    try:
+        return re.compile(
+            '|'.join(
+                f'(?P<mission_{index}>{pattern})'
+                for index, pattern in enumerate(patterns)
+            )
+        )
+    except re.error:
+        return None
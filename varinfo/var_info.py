@@ -1,45 +1,69 @@
-"""This module contains a class designed to read information from a `.dmr`
-file. This should group the input into science variables, metadata,
-coordinates, dimensions and ancillary data sets.
+"""This module contains classes designed to read information from a `.dmr`
+file, a NetCDF-4 file or a Zarr store. These should group the input into
+science variables, metadata, coordinates, dimensions and ancillary data sets.
 
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from os.path import exists
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from os.path import exists, isdir, join
+from collections.abc import Callable, Iterator
+from functools import partial
+from itertools import repeat
+from math import ceil
+from mmap import mmap
+from multiprocessing import get_context
 from typing import Any, Union
 import json
 import re
+import warnings
 import xml.etree.ElementTree as ET
 
 from netCDF4 import Dataset, Group
 
-from varinfo.cf_config import CFConfig
-from varinfo.exceptions import (
-    InvalidConfigFileFormatError,
-    MissingConfigurationFileError,
+from varinfo.attribute_container import LazyAttributeDict
+from varinfo.cf_config import CFConfig, config_registry
+from varinfo.exceptions import MissingZarrMetadataError, NetCDF4FileClosedError
+from varinfo.group import GroupFromDmr, GroupFromNetCDF4, GroupFromZarr
+from varinfo.parser_backends import (
+    DMRPP_NAMESPACE,
+    get_dmrpp_chunk_summary,
+    get_element_tree_module,
+    iterparse_with_expat,
+    strip_namespace_elements,
 )
-from varinfo.group import GroupFromDmr, GroupFromNetCDF4
 from varinfo.utilities import (
+    BinarySourceType,
     DAP4_TO_NUMPY_MAP,
+    get_dmr_tag_types,
+    get_first_full_path_xml_attribute,
     get_full_path_netcdf4_attribute,
-    get_full_path_xml_attribute,
+    get_full_path_zarr_attribute,
+    get_parent_group_path,
     get_xml_namespace,
+    GroupFilter,
+    is_binary_file_object,
+    read_binary_chunks,
+    XmlNameIndex,
 )
-from varinfo.variable import VariableFromDmr, VariableFromNetCDF4
+from varinfo.variable import VariableFromDmr, VariableFromNetCDF4, VariableFromZarr
 
 
 DimensionsGroupType = dict[tuple[str], set[str]]
-OutputGroupType = Union[GroupFromDmr, GroupFromNetCDF4]
-OutputVariableType = Union[VariableFromDmr, VariableFromNetCDF4]
+NetCDF4SourceType = Union[BinarySourceType, Dataset, Group]
+OutputGroupType = Union[GroupFromDmr, GroupFromNetCDF4, GroupFromZarr]
+OutputVariableType = Union[VariableFromDmr, VariableFromNetCDF4, VariableFromZarr]
+ZarrSourceType = Union[str, PathLike, dict[str, Any]]
 
 
 class VarInfoBase(ABC):
     """An abstract base class to represent the full dataset of a granule,
     having reading information from a representation of that granule. Currently
     supported granule representations: OPeNDAP Dataset Metadata Response (DMR),
-    NetCDF-4 file.
+    NetCDF-4 file, Zarr store with consolidated metadata.
 
     """
 
@@ -48,6 +72,8 @@ class VarInfoBase(ABC):
         file_path: str,
         short_name: str | None = None,
         config_file: str | None = None,
+        include_groups: list[str] | None = None,
+        exclude_groups: list[str] | None = None,
     ):
         """Distinguish between variables containing references to other
         datasets, and those that do not. The former are considered science
@@ -58,14 +84,22 @@ class VarInfoBase(ABC):
         dimensions, allowing the retrieval of all required variables for a
         specified list of science variables.
 
+        If `include_groups` or `exclude_groups` are specified, only the groups
+        selected by a `GroupFilter` with those patterns are parsed. Pruned
+        groups are skipped entirely during the traversal of the granule.
+        References from parsed variables to paths within groups that were
+        not parsed are recorded in `unresolved_references`.
+
         """
         self.config_file = config_file
+        self.group_filter = GroupFilter(include_groups, exclude_groups)
         self.short_name = short_name
         self.mission = None
         self.namespace = None
         self.groups: dict[str, OutputGroupType] = {}
         self.variables: dict[str, OutputVariableType] = {}
         self.references: set[str] = set()
+        self.unresolved_references: set[str] = set()
         self.metadata: dict[str, OutputVariableType] = {}
         self.all_dimensions_sizes: dict[str, int] = {}
 
@@ -94,35 +128,47 @@ class VarInfoBase(ABC):
     def _assign_variable(self, variable_object):
         """Save the `Variable` instance in the dictionary containing all
         variables. Additionally, the set of references for all variables is
-        updated.
+        updated, as is the set of references to groups that are not parsed.
 
         """
-        self.references.update(variable_object.get_references())
+        variable_references = variable_object.get_references()
+        self.references.update(variable_references)
+
+        if not self.group_filter.is_empty:
+            self.unresolved_references.update(
+                reference
+                for reference in variable_references
+                if not self.group_filter.parses(get_parent_group_path(reference))
+            )
+
         self.variables[variable_object.full_name_path] = variable_object
 
     def _set_var_info_config(self):
         """Read the VarInfo configuration JSON file, containing locations to
         search for the collection short_name attribute, and the mapping
-        from short_name to satellite mission.
+        from short_name to satellite mission. The configuration and the
+        `MissionResolver` for that mapping are taken from a single entry in
+        `config_registry`, so they always describe the same version of the
+        file, and are shared with any other `VarInfo` instances for the same
+        configuration file.
 
         """
-        if self.config_file is not None and not exists(self.config_file):
-            raise MissingConfigurationFileError(self.config_file)
-        elif self.config_file is not None and self.config_file.endswith('.json'):
-            with open(self.config_file, 'r', encoding='utf-8') as file_handler:
-                self.var_info_config = json.load(file_handler)
-        elif self.config_file is not None:
-            raise InvalidConfigFileFormatError(self.config_file)
-        else:
-            self.var_info_config = {}
+        registered_config = config_registry.get_registered_config(self.config_file)
+        self.var_info_config = registered_config.config
+        self.mission_resolver = registered_config.mission_resolver
 
     def _set_cf_config(self) -> CFConfig:
         """Instantiate a CFConfig object, to contain any rules for exclusions,
         required fields and augmentations to CF attributes that are not
-        contained within a granule from the specified collection.
+        contained within a granule from the specified collection. The
+        instance is retrieved from `config_registry`, and so is shared with
+        any other `VarInfo` instances for the same collection and
+        configuration file.
 
         """
-        return CFConfig(self.mission, self.short_name, self.config_file)
+        return config_registry.get_cf_config(
+            self.mission, self.short_name, self.config_file
+        )
 
     def _set_mission_and_short_name(self):
         """Check a series of potential locations for the collection short name
@@ -133,15 +179,7 @@ class VarInfoBase(ABC):
         if self.short_name is None:
             self._set_short_name()
 
-        if self.short_name is not None:
-            self.mission = next(
-                (
-                    name
-                    for pattern, name in self.var_info_config.get('Mission', {}).items()
-                    if re.match(pattern, self.short_name) is not None
-                ),
-                None,
-            )
+        self.mission = self.mission_resolver.resolve(self.short_name)
 
     @abstractmethod
     def _set_short_name(self):
@@ -528,15 +566,121 @@ class VarInfoFromDmr(VarInfoBase):
     to retrieve a dataset from a `.dmr` file, and the extract variables
     from the resulting XML tree.
 
+    If `streaming` is specified, the `.dmr` is never held in memory as a
+    complete XML tree. Instead, the document is incrementally parsed, and each
+    variable and group is created as its XML element is closed, after which
+    that element is cleared. Peak memory usage is then bounded by the size of
+    a single variable, rather than by the size of the whole document.
+
+    The `parser_backend` selects the XML parser used to read the `.dmr`, from
+    those listed in `varinfo.parser_backends.PARSER_BACKENDS`. The default is
+    the `parser_backend` class attribute, "etree". The "lxml" backend requires
+    the `lxml` package to be installed. The "expat" backend never creates an
+    element tree for the whole document, and so always streams the `.dmr`.
+
+    Group elements pruned by `include_groups` or `exclude_groups` are not
+    visited, so no variables, groups or `Dimension` sizes are recorded from
+    them. When streaming, the events within a pruned group are skipped.
+
     """
 
-    def _read_dataset(self, file_path: str):
-        """Extract the XML tree and namespace from an OPeNDAP `.dmr` file."""
-        with open(file_path, 'r', encoding='utf-8') as file_handler:
-            dmr_content = file_handler.read()
+    parser_backend = 'etree'
+
+    def __init__(
+        self,
+        file_path: BinarySourceType,
+        short_name: str | None = None,
+        config_file: str | None = None,
+        streaming: bool = False,
+        parser_backend: str | None = None,
+        include_groups: list[str] | None = None,
+        exclude_groups: list[str] | None = None,
+    ):
+        if parser_backend is not None:
+            self.parser_backend = parser_backend
+
+        self.element_tree = get_element_tree_module(self.parser_backend)
+        self.streaming = streaming or self.parser_backend == 'expat'
+        super().__init__(
+            file_path,
+            short_name=short_name,
+            config_file=config_file,
+            include_groups=include_groups,
+            exclude_groups=exclude_groups,
+        )
+
+    def _read_dataset(self, file_path: BinarySourceType):
+        """Extract the XML tree and namespace from an OPeNDAP `.dmr`. The
+        `.dmr` can be supplied as a path to a local file, a bytes-like object
+        (including a `memoryview` or an `mmap.mmap` instance), or a binary
+        file-like object. The raw bytes are passed directly to the XML parser,
+        which decodes them according to the XML declaration of the document.
+
+        When streaming, only the source of the `.dmr` is retained, and the
+        namespace is determined from the first element of the document. The
+        document is read more than once in this case, so the content of a
+        file-like object that cannot seek is read into memory first.
+
+        """
+        if self.streaming:
+            if is_binary_file_object(file_path) and not file_path.seekable():
+                self.dataset = file_path.read()
+            else:
+                self.dataset = file_path
+
+            if is_binary_file_object(self.dataset):
+                self.dmr_offset = self.dataset.tell()
+
+            _, root_element = next(self._iterparse_dmr(events=('start',)))
+            self.namespace = get_xml_namespace(root_element)
+        else:
+            parser = self.element_tree.XMLParser()
+
+            for dmr_chunk in self._read_dmr_chunks(file_path):
+                parser.feed(dmr_chunk)
+
+            self.dataset = parser.close()
+            self.namespace = get_xml_namespace(self.dataset)
+
+    def _iterparse_dmr(
+        self, events: tuple[str, ...] = ('start', 'end')
+    ) -> Iterator[tuple[str, ET.Element]]:
+        """Incrementally parse the `.dmr`, yielding the requested events and
+        the elements they relate to. The `.dmr` is fed to the parser in chunks,
+        so that only a small number of elements are created ahead of the
+        events being consumed. Any file opened for parsing is closed either
+        when the document is exhausted or when the generator is discarded.
+
+        """
+        if is_binary_file_object(self.dataset):
+            self.dataset.seek(self.dmr_offset)
+
+        if self.parser_backend == 'expat':
+            yield from iterparse_with_expat(
+                self._read_dmr_chunks(self.dataset), events=events
+            )
+        else:
+            parser = self.element_tree.XMLPullParser(events=events)
+
+            for dmr_chunk in self._read_dmr_chunks(self.dataset):
+                parser.feed(dmr_chunk)
+                yield from parser.read_events()
 
-        self.dataset = ET.fromstring(dmr_content)
-        self.namespace = get_xml_namespace(self.dataset)
+            parser.close()
+            yield from parser.read_events()
+
+    def _read_dmr_chunks(
+        self, dmr_source: BinarySourceType
+    ) -> Iterator[bytes | memoryview]:
+        """Read the `.dmr` in chunks to feed to the XML parser. The `lxml`
+        parsers do not accept a `memoryview`, so each chunk is copied to a
+        `bytes` object for that backend.
+
+        """
+        if self.parser_backend == 'lxml':
+            yield from map(bytes, read_binary_chunks(dmr_source))
+        else:
+            yield from read_binary_chunks(dmr_source)
 
     def _set_short_name(self):
         """Iterate through all suggested locations for the collection short
@@ -544,23 +688,40 @@ class VarInfoFromDmr(VarInfoBase):
         search for an XML element in the DMR document for that element and, if
         found, retrieve the value of that element.
 
+        The elements named in any of the locations are indexed in a single
+        pass through the document, so that each location can be resolved
+        without further searches of the whole document.
+
+        When streaming, the document is only parsed until the value of the
+        highest priority location can be determined.
+
         """
+        short_name_paths = self.var_info_config.get('CollectionShortNamePath', [])
 
-        self.short_name = next(
-            (
-                get_full_path_xml_attribute(
-                    self.dataset, short_name_path, self.namespace
-                )
-                for short_name_path in self.var_info_config.get(
-                    'CollectionShortNamePath', []
-                )
-                if get_full_path_xml_attribute(
-                    self.dataset, short_name_path, self.namespace
-                )
-                is not None
-            ),
-            None,
-        )
+        if self.streaming and len(short_name_paths) > 0:
+            self.short_name = get_first_full_path_xml_attribute(
+                self._iterparse_dmr(), short_name_paths, self.namespace
+            )
+        elif not self.streaming:
+            name_index = XmlNameIndex(
+                self.dataset,
+                self.namespace,
+                names={
+                    path_part
+                    for short_name_path in short_name_paths
+                    for path_part in short_name_path.lstrip('/').split('/')[:-1]
+                },
+            )
+            self.short_name = next(
+                (
+                    short_name
+                    for short_name in map(
+                        name_index.get_full_path_attribute, short_name_paths
+                    )
+                    if short_name is not None
+                ),
+                None,
+            )
 
     def _extract_variables(self):
         """Iterate through all children of the `.dmr` root dataset element.
@@ -569,37 +730,40 @@ class VarInfoFromDmr(VarInfoBase):
         the `variables_with_coordinates` or the `metadata_variables`
         dictionary accordingly.
 
+        Dimensions, groups and variables are all collected in a single pass
+        through the document. A variable can refer to a `Dimension` that is
+        declared later in the document, so the shapes of any variables with
+        dimensions that were unknown when the variable was parsed are resolved
+        again once all elements have been visited.
+
         """
+        unresolved_shapes: list[tuple[VariableFromDmr, ET.Element]] = []
 
-        def save_variable(output, group_path, element):
-            element_path = '/'.join([group_path, element.get('name')])
-            variable = VariableFromDmr(
-                element,
-                self.cf_config,
-                self.namespace,
-                element_path,
-                self.all_dimensions_sizes,
-            )
-            output[variable.full_name_path] = variable
-            self._assign_variable(variable)
+        if self.streaming:
+            self._stream_elements(unresolved_shapes)
+        else:
+            self.traverse_elements(self.dataset, '/', unresolved_shapes)
 
-        self.find_all_dimensions_sizes(
-            self.dataset,
-            set(DAP4_TO_NUMPY_MAP.keys()),
-            '/',
-        )
+        self._resolve_shapes(unresolved_shapes)
+        self._remove_non_variable_references()
 
-        all_variables = {}
+    def _resolve_shapes(
+        self, unresolved_shapes: list[tuple[VariableFromDmr, ET.Element]]
+    ):
+        """Determine the shapes of variables that referred to a `Dimension`
+        that had not been found when the variable was parsed.
 
-        self.traverse_elements(
-            self.dataset,
-            set(DAP4_TO_NUMPY_MAP.keys()),
-            save_variable,
-            all_variables,
-            '/',
-        )
+        Dimensions, groups and variables are collected in a single pass
+        through the `.dmr`, but a `Dim` can refer to a `Dimension` declared
+        later in the document, such as in a sibling group that follows the
+        variable. The size of that `Dimension` is only known once the whole
+        document has been visited, so the shapes of those variables are
+        resolved afterwards, from the `Dim` elements retained for each of
+        them, rather than by a second pass through the document.
 
-        self._remove_non_variable_references()
+        """
+        for variable, dimensions_element in unresolved_shapes:
+            variable.resolve_shape(dimensions_element)
 
     def _remove_non_variable_references(self):
         """After all references have been combined, remove those that point to
@@ -615,45 +779,203 @@ class VarInfoFromDmr(VarInfoBase):
             if self.get_variable(reference) is not None
         }
 
-    def find_all_dimensions_sizes(
+    def traverse_elements(
         self,
         element: ET.Element,
-        element_types: set[str],
         group_path: str,
+        unresolved_shapes: list[tuple[VariableFromDmr, ET.Element]] | None = None,
     ):
-        """Perform a depth first search of the `.dmr` `Dimension` element
-        before parsing the variables. This ensures that any variable can
-        reference a dimension defined later in the dataset. Once an element
-        is found, it is then assigned to the `all_dimensions_sizes{}` dictionary.
+        """Perform a depth first search of the `.dmr` `Dataset` element. Each
+        group is visited once: `Dimension` sizes are recorded, variables are
+        parsed and child groups are recursively traversed, all in the same
+        iteration through the children of the group element.
 
-        """
-        group_path = group_path.rstrip('/')
+        Any variable with dimensions that are not yet known is added to the
+        list of unresolved shapes, along with its element. If no list is
+        supplied, the shapes of such variables are resolved once the
+        traversal of this element is complete.
 
-        for child in list(element):
-            # Ff it is a Dimension, assign dictionary all_dimensions_sizes{}
-            # else, if it is a Group, call this function again
-            element_type = child.tag.replace(self.namespace, '')
+        Child groups are only traversed if selected by the `GroupFilter`, and
+        variables are skipped in groups that are only traversed to reach
+        their descendants.
 
-            if element_type == 'Dimension':
-                if child.attrib['size'] is not None:
-                    dim_name = '/'.join([group_path, child.get('name')])
-                    self.all_dimensions_sizes[dim_name] = int(child.attrib['size'])
+        """
+        if unresolved_shapes is None:
+            unresolved_shapes = []
+            self.traverse_elements(element, group_path, unresolved_shapes)
+            self._resolve_shapes(unresolved_shapes)
+            return
+
+        child_variables: set[str] = set()
+        parse_group = self.group_filter.parses(group_path)
+        tag_types = get_dmr_tag_types(self.namespace)
+
+        if parse_group:
+            self._save_group(element, group_path, child_variables)
+
+        for child in element:
+            element_type = tag_types.get(child.tag)
+
+            if element_type in DAP4_TO_NUMPY_MAP and parse_group:
+                variable = self._save_variable(child, group_path)
+                child_variables.add(variable.full_name_path)
+
+                if not self._has_known_dimensions(variable):
+                    unresolved_shapes.append((variable, child))
+            elif element_type == 'Dimension':
+                self._save_dimension(child, group_path)
             elif element_type == 'Group':
-                new_group_path = '/'.join([group_path, child.get('name')])
+                child_group_path = '/'.join([group_path.rstrip('/'), child.get('name')])
 
-                self.find_all_dimensions_sizes(child, element_types, new_group_path)
+                if self.group_filter.traverses(child_group_path):
+                    self.traverse_elements(child, child_group_path, unresolved_shapes)
 
-    def traverse_elements(
+    def find_all_dimensions_sizes(
         self,
         element: ET.Element,
-        element_types: set[str],
-        operation,
-        output,
-        group_path: str,
+        element_types: set[str] | None = None,
+        group_path: str = '/',
+    ):
+        """Record the sizes of all `Dimension` elements in the supplied
+        element and its descendant groups, in the `all_dimensions_sizes`
+        dictionary.
+
+        Deprecated: `traverse_elements` now records `Dimension` sizes in the
+        same pass as groups and variables. The `element_types` argument is
+        ignored.
+
+        """
+        warnings.warn(
+            '`VarInfoFromDmr.find_all_dimensions_sizes` is deprecated, '
+            '`VarInfoFromDmr.traverse_elements` records dimension sizes.',
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        tag_types = get_dmr_tag_types(self.namespace)
+        elements_to_search = [(element, group_path)]
+
+        while len(elements_to_search) > 0:
+            group_element, group_element_path = elements_to_search.pop()
+
+            for child in group_element:
+                element_type = tag_types.get(child.tag)
+
+                if element_type == 'Dimension':
+                    self._save_dimension(child, group_element_path)
+                elif element_type == 'Group':
+                    elements_to_search.append(
+                        (
+                            child,
+                            '/'.join(
+                                [group_element_path.rstrip('/'), child.get('name')]
+                            ),
+                        )
+                    )
+
+    def _stream_elements(
+        self, unresolved_shapes: list[tuple[VariableFromDmr, ET.Element]]
+    ):
+        """Incrementally parse the `.dmr`, creating each `VariableFromDmr` or
+        `GroupFromDmr` as its XML element is closed, after which the element
+        is cleared. Group attributes are only complete once the group element
+        has been closed, but a placeholder is added to the `groups` dictionary
+        when the group is opened, to retain the same ordering of groups as
+        a parse of the full XML tree.
+
+        Any variable with dimensions that are not yet known is added to the
+        list of unresolved shapes, along with a detached element containing
+        only the `Dim` elements of that variable.
+
+        All events within a group pruned by the `GroupFilter` are skipped,
+        clearing each element as it is closed. Variables are not created in
+        groups that are only traversed to reach their descendants.
+
+        """
+        open_groups: list[tuple[str, set[str] | None] | None] = []
+        pruned_depth = 0
+        tag_types = get_dmr_tag_types(self.namespace)
+
+        for event, element in self._iterparse_dmr():
+            if pruned_depth > 0:
+                if event == 'start':
+                    pruned_depth += 1
+                else:
+                    pruned_depth -= 1
+                    element.clear()
+
+                continue
+
+            element_type = tag_types.get(element.tag)
+
+            if event == 'start':
+                if len(open_groups) == 0:
+                    group_path = '/'
+                elif open_groups[-1] is not None and element_type == 'Group':
+                    group_path = '/'.join(
+                        [open_groups[-1][0].rstrip('/'), element.get('name')]
+                    )
+                else:
+                    group_path = None
+
+                if group_path is None:
+                    open_groups.append(None)
+                elif not self.group_filter.traverses(group_path):
+                    pruned_depth = 1
+                elif self.group_filter.parses(group_path):
+                    self.groups[group_path] = None
+                    open_groups.append((group_path, set()))
+                else:
+                    open_groups.append((group_path, None))
+            else:
+                open_group = open_groups.pop()
+                parent_group = open_groups[-1] if len(open_groups) > 0 else None
+
+                if open_group is not None:
+                    if open_group[1] is not None:
+                        self._save_group(element, *open_group)
+
+                    element.clear()
+                elif parent_group is not None:
+                    if element_type in DAP4_TO_NUMPY_MAP:
+                        if parent_group[1] is not None:
+                            self._stream_variable(
+                                element, parent_group, unresolved_shapes
+                            )
+
+                        element.clear()
+                    elif element_type == 'Dimension':
+                        self._save_dimension(element, parent_group[0])
+                        element.clear()
+                    elif element_type != 'Attribute':
+                        element.clear()
+
+    def _stream_variable(
+        self,
+        element: ET.Element,
+        parent_group: tuple[str, set[str]],
+        unresolved_shapes: list[tuple[VariableFromDmr, ET.Element]],
     ):
-        """Perform a depth first search of the `.dmr` `Dataset` element.
-        When a variable is located perform an operation on the supplied
-        output object, using the supplied function or class.
+        """Create a `VariableFromDmr` instance for a closed variable element
+        while streaming the `.dmr`, recording it as a child of the parent
+        group. If the variable has dimensions that are not yet known, a
+        detached element containing only its `Dim` elements is retained.
+
+        """
+        variable = self._save_variable(element, parent_group[0])
+        parent_group[1].add(variable.full_name_path)
+
+        if not self._has_known_dimensions(variable):
+            dimensions_element = self.element_tree.Element(element.tag)
+            dimensions_element.extend(list(element.iter(f'{self.namespace}Dim')))
+            unresolved_shapes.append((variable, dimensions_element))
+
+    def _save_group(
+        self, element: ET.Element, group_path: str, child_variables: set[str]
+    ):
+        """Create a `GroupFromDmr` instance and assign it to the `groups`
+        dictionary. The full paths of child variables in the group are
+        collected by the traversal of the `.dmr`, rather than re-parsed from
+        the group element.
 
         """
         self.groups[group_path] = GroupFromDmr(
@@ -661,24 +983,145 @@ class VarInfoFromDmr(VarInfoBase):
             self.cf_config,
             namespace=self.namespace,
             full_name_path=group_path,
+            child_variables=child_variables,
+            lazy_attributes=not self.streaming,
+        )
+
+    def _save_variable(self, element: ET.Element, group_path: str) -> VariableFromDmr:
+        """Create a `VariableFromDmr` instance for a variable element within the
+        specified group, and assign it to the `variables` dictionary.
+
+        """
+        variable = VariableFromDmr(
+            element,
+            self.cf_config,
+            self.namespace,
+            '/'.join([group_path.rstrip('/'), element.get('name')]),
+            self.all_dimensions_sizes,
+            lazy_attributes=not self.streaming,
         )
+        self._assign_variable(variable)
+        return variable
 
-        group_path = group_path.rstrip('/')
+    def _save_dimension(self, element: ET.Element, group_path: str):
+        """Assign the size of a `Dimension` element to the
+        `all_dimensions_sizes` dictionary, using the full path of that
+        dimension.
 
-        for child in list(element):
-            # If it is in the DAP4 list: use the function
-            # else, if it is a Group, assign to dictionary and call this
-            # function again
-            element_type = child.tag.replace(self.namespace, '')
+        """
+        if element.get('size') is not None:
+            dimension_path = '/'.join([group_path.rstrip('/'), element.get('name')])
+            self.all_dimensions_sizes[dimension_path] = int(element.get('size'))
 
-            if element_type in element_types:
-                operation(output, group_path, child)
-            elif element_type == 'Group':
-                new_group_path = '/'.join([group_path, child.get('name')])
+    def _has_known_dimensions(self, variable: VariableFromDmr) -> bool:
+        """Check whether the sizes of all named dimensions of a variable have
+        already been found in the `.dmr`.
+
+        """
+        return set(variable.dimensions).issubset(self.all_dimensions_sizes)
 
-                self.traverse_elements(
-                    child, element_types, operation, output, new_group_path
-                )
+
+class VarInfoFromDmrpp(VarInfoFromDmr):
+    """A child class that inherits from `VarInfoFromDmr` and implements
+    functions to retrieve a dataset from a DMR++ document, as stored by
+    OPeNDAP alongside a granule in the cloud. A DMR++ is a `.dmr` in which
+    each variable also contains elements from the DMR++ namespace, describing
+    the storage of that variable, such as its chunk manifest. These elements
+    often make up the majority of the document.
+
+    All elements in the DMR++ namespace are removed from the raw bytes of
+    the document before they reach the XML parser, so no XML elements are
+    created for them. The remainder of the document is parsed as a `.dmr`,
+    using the same `streaming` and `parser_backend` options.
+
+    If `chunk_summary` is specified, the chunk manifest of each variable is
+    summarised in the `chunk_summaries` dictionary, which maps the full path
+    of each variable to the number of chunks ("chunk_count"), the total size
+    in bytes of those chunks as stored ("byte_total"), and the compression
+    filters applied to the chunks ("filters"). Variables without a chunk
+    manifest, such as those with compact storage, are not included.
+
+    """
+
+    def __init__(
+        self,
+        file_path: BinarySourceType,
+        short_name: str | None = None,
+        config_file: str | None = None,
+        streaming: bool = False,
+        parser_backend: str | None = None,
+        chunk_summary: bool = False,
+        include_groups: list[str] | None = None,
+        exclude_groups: list[str] | None = None,
+    ):
+        self.chunk_summary = chunk_summary
+        self.chunk_summaries: dict[str, dict[str, Any]] = {}
+        super().__init__(
+            file_path,
+            short_name=short_name,
+            config_file=config_file,
+            streaming=streaming,
+            parser_backend=parser_backend,
+            include_groups=include_groups,
+            exclude_groups=exclude_groups,
+        )
+
+    def _read_dmr_chunks(
+        self, dmr_source: BinarySourceType
+    ) -> Iterator[bytes | memoryview]:
+        """Read the DMR++ in chunks to feed to the XML parser, omitting all
+        elements in the DMR++ namespace. If requested, each chunk manifest is
+        replaced by a single element summarising it.
+
+        """
+        yield from strip_namespace_elements(
+            super()._read_dmr_chunks(dmr_source),
+            DMRPP_NAMESPACE,
+            get_replacement=get_dmrpp_chunk_summary if self.chunk_summary else None,
+        )
+
+    def _save_variable(self, element: ET.Element, group_path: str) -> VariableFromDmr:
+        """Create a `VariableFromDmr` instance, as for a `.dmr`, and retain
+        the chunk summary of the variable, if present.
+
+        """
+        variable = super()._save_variable(element, group_path)
+        summary_element = element.find(f'{{{DMRPP_NAMESPACE}}}chunkSummary')
+
+        if summary_element is not None:
+            self.chunk_summaries[variable.full_name_path] = {
+                'chunk_count': int(summary_element.get('chunkCount')),
+                'byte_total': int(summary_element.get('byteTotal')),
+                'filters': summary_element.get('filters').split(),
+            }
+
+        return variable
+
+
+class LazyContainerDict(LazyAttributeDict):
+    """A dictionary of the groups or variables of a NetCDF-4 file, keyed by
+    their full paths, as used by `VarInfoFromNetCDF4` in lazy mode. Each path
+    initially refers to the path of the group containing it. The first time
+    such a path is retrieved, the supplied `parser` is called with the
+    requested path and the group path, and the parsed group or variable
+    replaces the group path. All methods returning values parse any
+    remaining groups, as for `LazyAttributeDict`.
+
+    """
+
+    def __init__(
+        self,
+        parser: Callable[[str, str], GroupFromNetCDF4 | VariableFromNetCDF4],
+    ):
+        super().__init__(parser)
+
+    def set_unparsed(self, container_path: str, group_path: str) -> None:
+        """Record a group or variable to be parsed, with its group, on access."""
+        self.set_undecoded(container_path, group_path)
+
+    def is_parsed(self, container_path: str) -> bool:
+        """Whether the group or variable has already been parsed."""
+        return self.is_decoded(container_path)
 
 
 class VarInfoFromNetCDF4(VarInfoBase):
@@ -686,16 +1129,115 @@ class VarInfoFromNetCDF4(VarInfoBase):
     to retrieve a dataset from a NetCDF-4 file, and extract the variables
     by traversing the granule structure.
 
+    Parallel parsing, via `max_workers`, is only used when at least
+    `minimum_parallel_groups` top-level groups are selected for parsing.
+    With fewer groups, the cost of starting each process and opening the file
+    again outweighs any gain, so the file is parsed serially.
+
     """
 
-    def _read_dataset(self, file_path: str):
-        """Set the dataset to the file path for the NetCDF-4 file. This is
-        done instead of assigning a `netCDF4.Dataset` instance, so that the
-        file is not still in memory after being parsed, so that other
-        services can interact with the NetCDF-4 file without any conflicts.
+    minimum_parallel_groups = 2
+
+    def __init__(
+        self,
+        file_path: NetCDF4SourceType,
+        short_name: str | None = None,
+        config_file: str | None = None,
+        max_workers: int | None = None,
+        lazy: bool = False,
+        include_groups: list[str] | None = None,
+        exclude_groups: list[str] | None = None,
+    ):
+        """Open the NetCDF-4 file once, for use by both the search for the
+        collection short name and the extraction of variables. The file is
+        closed once all variables have been parsed, including when an
+        exception is raised. The content of a NetCDF-4 file held in memory
+        can also be supplied, as can an open `netCDF4.Dataset` or
+        `netCDF4.Group`, in which case it is read, but not closed.
+
+        If `max_workers` is greater than one, and the NetCDF-4 file is
+        specified via a path, the subtrees beneath each top-level group are
+        parsed concurrently in a pool of up to that many processes. These
+        processes are started with the "spawn" method, which imports the
+        `__main__` module of the calling program again in each process. A
+        script using this option must therefore only instantiate this class
+        within an `if __name__ == '__main__':` block. Each process opens the
+        file again, so this is only faster than serial parsing when the
+        top-level groups contain many variables, such as for granules with
+        hundreds of variables in each of several top-level groups.
+
+        If `lazy` is specified, only the paths of groups and variables are
+        recorded on instantiation. Each group, and all of its variables, are
+        parsed the first time that group or any of its variables are
+        retrieved from the `groups` or `variables` dictionaries, such as by
+        `get_variable`. Methods that need all variables, such as
+        `get_science_variables`, parse all remaining groups. The file remains
+        open until all groups have been parsed, or `close` is called. After
+        that, retrieving a group or variable that was not yet parsed raises a
+        `NetCDF4FileClosedError`, as does closing a supplied `netCDF4.Dataset`
+        before all of its groups are parsed.
+
+        If `include_groups` or `exclude_groups` are specified, groups pruned
+        by the resulting `GroupFilter` are not opened, and so none of their
+        metadata is read from the file. This applies to all of the modes
+        above.
+
+        """
+        self.file_path = file_path
+        self.max_workers = max_workers
+        self.lazy = lazy
+        self.owns_dataset = False
+        self.unparsed_groups: dict[str, Dataset | Group] = {}
+
+        try:
+            super().__init__(
+                file_path,
+                short_name=short_name,
+                config_file=config_file,
+                include_groups=include_groups,
+                exclude_groups=exclude_groups,
+            )
+        except Exception:
+            self.close()
+            raise
+
+        if len(self.unparsed_groups) == 0:
+            self.close()
+
+    def __enter__(self) -> VarInfoFromNetCDF4:
+        return self
+
+    def __exit__(self, *exception_information):
+        self.close()
+
+    def close(self):
+        """Close the NetCDF-4 file, if it was opened by this instance, and set
+        the dataset back to the supplied file path. In lazy mode, retrieving
+        any group or variable not yet parsed after the file is closed raises a
+        `NetCDF4FileClosedError`.
+
+        """
+        if self.owns_dataset:
+            self.dataset.close()
+            self.dataset = self.file_path
+            self.owns_dataset = False
+
+    def _read_dataset(self, file_path: NetCDF4SourceType):
+        """Set the dataset to an open `netCDF4.Dataset` for the NetCDF-4 file.
+        If the supplied `file_path` is already an open `netCDF4.Dataset` or
+        `netCDF4.Group`, it is used directly. Otherwise, the file is opened,
+        and then closed after parsing, at which point the dataset is set back
+        to the file path. This ensures the file is not still in memory after
+        being parsed, so that other services can interact with the NetCDF-4
+        file without any conflicts.
+
+        A bytes-like object (including a `memoryview` or an `mmap.mmap`
+        instance) is opened using the in-memory mode of `netCDF4.Dataset`,
+        without writing the content to disk. The content of a binary
+        file-like object is first read into memory.
 
         """
-        self.dataset = file_path
+        self.dataset, self.owns_dataset = open_netcdf4_source(file_path)
 
     def _set_short_name(self):
         """Iterate through all suggested locations for the collection short
@@ -704,58 +1246,439 @@ class VarInfoFromNetCDF4(VarInfoBase):
         and, if found, retrieve the value of that attribute.
 
         """
-
-        with Dataset(self.dataset, 'r') as dataset:
-            self.short_name = next(
-                (
-                    get_full_path_netcdf4_attribute(dataset, short_name_path)
-                    for short_name_path in self.var_info_config.get(
-                        'CollectionShortNamePath', []
-                    )
-                    if get_full_path_netcdf4_attribute(dataset, short_name_path)
-                    is not None
-                ),
-                None,
-            )
+        self.short_name = next(
+            (
+                short_name
+                for short_name in map(
+                    partial(get_full_path_netcdf4_attribute, self.dataset),
+                    self.var_info_config.get('CollectionShortNamePath', []),
+                )
+                if short_name is not None
+            ),
+            None,
+        )
 
     def _extract_variables(self):
-        """Traverse all groups of the NetCDF-4 file, beginning at the  root
-        group.
+        """Traverse all groups of the NetCDF-4 file, beginning at the root
+        group, or the supplied `netCDF4.Group`. If requested, and the file was
+        specified via a path, the subtrees of the top-level groups are parsed
+        in parallel. In lazy mode, groups are only indexed.
 
         """
-        with Dataset(self.dataset, 'r') as dataset:
-            self._parse_group(dataset)
+        if self.lazy:
+            self._index_groups()
+        elif (
+            self.max_workers is not None
+            and self.max_workers > 1
+            and isinstance(self.file_path, (str, PathLike))
+            and len(self.dataset.groups) > 0
+        ):
+            self._parse_groups_in_parallel()
+        else:
+            self._parse_group(self.dataset)
 
     def _parse_group(self, group: Dataset | Group):
-        """If the child matches one of the DAP4 variable types, then create an
-        instance of the `VariableFromNetCDF4` class, and assign it to either
-        the `variables_with_coordinates` or the `metadata_variables`
-        dictionary accordingly. Child groups are added to the `groups`
-        dictionary under the fully resolved path to that group.
+        """Create an instance of the `GroupFromNetCDF4` class for the group,
+        and of the `VariableFromNetCDF4` class for each variable in the group,
+        and then recursively for all child groups selected by the
+        `GroupFilter`.
+
+        """
+        for container in get_netcdf4_containers(
+            group, self.cf_config, self.namespace, group_filter=self.group_filter
+        ):
+            self._add_container(container)
+
+    def _parse_groups_in_parallel(self):
+        """Parse the root group and its variables, and then the subtrees of
+        the top-level groups in a pool of processes. The top-level groups are
+        split into one contiguous batch per process, so that each process only
+        opens its own handle to the file once, which is the most expensive
+        step. The groups and variables from each batch are then added in the
+        same order as a serial traversal. Processes are started with the
+        "spawn" method, as the HDF-5 library is not safe to use in a forked
+        process. If fewer than `minimum_parallel_groups` top-level groups
+        are selected, they are parsed serially instead.
+
+        """
+        for container in get_netcdf4_containers(
+            self.dataset, self.cf_config, self.namespace, recursive=False
+        ):
+            self._add_container(container)
+
+        group_paths = [
+            group.path
+            for group in self.dataset.groups.values()
+            if self.group_filter.traverses(group.path)
+        ]
+
+        if len(group_paths) < self.minimum_parallel_groups:
+            for group_path in group_paths:
+                self._parse_group(self.dataset[group_path])
+
+            return
+
+        batch_size = ceil(len(group_paths) / self.max_workers)
+        group_path_batches = [
+            group_paths[batch_start : batch_start + batch_size]
+            for batch_start in range(0, len(group_paths), batch_size)
+        ]
+
+        with ProcessPoolExecutor(
+            max_workers=len(group_path_batches), mp_context=get_context('spawn')
+        ) as executor:
+            for containers in executor.map(
+                parse_netcdf4_subtrees,
+                repeat(self.file_path),
+                group_path_batches,
+                repeat(self.cf_config),
+                repeat(self.namespace),
+                repeat(self.group_filter),
+            ):
+                for container in containers:
+                    self._add_container(container)
+
+    def _index_groups(self):
+        """Record the path of every group and variable, without parsing them.
+        The `groups` and `variables` dictionaries are replaced with instances
+        of `LazyContainerDict`, in which each group or variable path initially
+        refers to the path of its parent group. That group is parsed the first
+        time it, or one of its variables, is retrieved. The order of the keys
+        is the same as for a complete traversal of the file.
+
+        """
+        self.groups = LazyContainerDict(self._get_lazy_container)
+        self.variables = LazyContainerDict(self._get_lazy_container)
+        self._index_group(self.dataset)
+
+    def _index_group(self, group: Dataset | Group):
+        """Record the group and its variables as unparsed, and then index all
+        child groups selected by the `GroupFilter`, recursively. A group
+        without variables is parsed immediately, so that the file can be
+        closed as soon as all variables have been parsed. A group that is only
+        traversed to reach its descendants is not recorded.
+
+        """
+        if self.group_filter.parses(group.path):
+            if len(group.variables) > 0:
+                self.unparsed_groups[group.path] = group
+                self.groups.set_unparsed(group.path, group.path)
+            else:
+                self._add_container(
+                    GroupFromNetCDF4(
+                        group,
+                        self.cf_config,
+                        namespace=self.namespace,
+                        full_name_path=group.path,
+                    )
+                )
+
+            for variable_name in group.variables:
+                self.variables.set_unparsed(
+                    get_netcdf4_variable_path(group.path, variable_name), group.path
+                )
+
+        for child_group in group.groups.values():
+            if self.group_filter.traverses(child_group.path):
+                self._index_group(child_group)
+
+    def _get_lazy_container(
+        self, container_path: str, group_path: str
+    ) -> GroupFromNetCDF4 | VariableFromNetCDF4:
+        """Parse the group with the specified path, and all its variables,
+        returning the requested group or variable. Once all groups have been
+        parsed, the file is closed. If the file was closed before the group
+        was parsed, a `NetCDF4FileClosedError` is raised.
 
         """
-        self.groups[group.path] = GroupFromNetCDF4(
+        if not is_netcdf4_group_open(self.unparsed_groups[group_path]):
+            raise NetCDF4FileClosedError(container_path)
+
+        group = self.unparsed_groups.pop(group_path)
+        parsed_containers = {}
+
+        for container in get_netcdf4_containers(
+            group, self.cf_config, self.namespace, recursive=False
+        ):
+            self._add_container(container)
+            parsed_containers[container.full_name_path] = container
+
+        if len(self.unparsed_groups) == 0:
+            self.close()
+
+        return parsed_containers[container_path]
+
+    def _add_container(self, container: GroupFromNetCDF4 | VariableFromNetCDF4):
+        """Add a parsed group to the `groups` dictionary. For a variable,
+        record the size of each of its dimensions, and assign the variable to
+        the `variables` dictionary.
+
+        """
+        if isinstance(container, GroupFromNetCDF4):
+            self.groups[container.full_name_path] = container
+        else:
+            for index, dimensions_name in enumerate(container.dimensions):
+                self.all_dimensions_sizes[dimensions_name] = container.shape[index]
+
+            self._assign_variable(container)
+
+
+def get_netcdf4_containers(
+    group: Dataset | Group,
+    cf_config: CFConfig,
+    namespace: str | None,
+    recursive: bool = True,
+    group_filter: GroupFilter | None = None,
+) -> Iterator[GroupFromNetCDF4 | VariableFromNetCDF4]:
+    """Yield a `GroupFromNetCDF4` instance for the group, followed by a
+    `VariableFromNetCDF4` instance for each variable in the group. If
+    requested, the same is then done for each child group, recursively.
+
+    If a `GroupFilter` is supplied, the group and its variables are only
+    yielded if the group is parsed by that filter, and only child groups
+    traversed by the filter are visited.
+
+    """
+    if group_filter is None or group_filter.parses(group.path):
+        yield GroupFromNetCDF4(
             group,
-            self.cf_config,
-            namespace=self.namespace,
+            cf_config,
+            namespace=namespace,
             full_name_path=group.path,
         )
 
         for netcdf4_variable in group.variables.values():
-            variable_path = '/'.join([group.path, netcdf4_variable.name])
-            variable_path = f'/{variable_path.lstrip("/")}'
-
-            variable = VariableFromNetCDF4(
+            yield VariableFromNetCDF4(
                 netcdf4_variable,
-                self.cf_config,
-                namespace=self.namespace,
-                full_name_path=variable_path,
+                cf_config,
+                namespace=namespace,
+                full_name_path=get_netcdf4_variable_path(
+                    group.path, netcdf4_variable.name
+                ),
             )
 
-            for index, dimensions_name in enumerate(variable.dimensions):
-                self.all_dimensions_sizes[dimensions_name] = variable.shape[index]
+    if recursive:
+        for child_group in group.groups.values():
+            if group_filter is None or group_filter.traverses(child_group.path):
+                yield from get_netcdf4_containers(
+                    child_group, cf_config, namespace, group_filter=group_filter
+                )
 
-            self._assign_variable(variable)
 
-        for child_group in group.groups.values():
-            self._parse_group(child_group)
+def get_netcdf4_variable_path(group_path: str, variable_name: str) -> str:
+    """Combine the path of a NetCDF-4 group and the name of a variable within
+    it into the full path of that variable.
+
+    """
+    variable_path = '/'.join([group_path, variable_name])
+    return f'/{variable_path.lstrip("/")}'
+
+
+def is_netcdf4_group_open(group: Dataset | Group) -> bool:
+    """Whether the NetCDF-4 file containing the group is still open. The
+    `isopen` method of a `netCDF4.Group` is always false, so this checks the
+    root group of the file.
+
+    """
+    while group.parent is not None:
+        group = group.parent
+
+    return group.isopen()
+
+
+def parse_netcdf4_subtrees(
+    file_path: str | PathLike,
+    group_paths: list[str],
+    cf_config: CFConfig,
+    namespace: str | None,
+    group_filter: GroupFilter | None = None,
+) -> list[GroupFromNetCDF4 | VariableFromNetCDF4]:
+    """Open a NetCDF-4 file, and parse all groups and variables in the
+    subtrees beginning at each of the specified groups, subject to the
+    optional `GroupFilter`. This is run in a separate process by
+    `VarInfoFromNetCDF4` when parsing top-level groups in parallel, so the
+    file is opened with a handle specific to that process.
+
+    """
+    with Dataset(file_path, 'r') as dataset:
+        return [
+            container
+            for group_path in group_paths
+            for container in get_netcdf4_containers(
+                dataset[group_path], cf_config, namespace, group_filter=group_filter
+            )
+        ]
+
+
+class VarInfoFromZarr(VarInfoBase):
+    """A child class that inherits from `VarInfoBase` and implements functions
+    to retrieve a dataset from the consolidated metadata of a Zarr (version 2)
+    store, and extract the variables from the groups and arrays listed in
+    that metadata. The store itself is never listed, so the `.zmetadata`
+    object is the only part of the store that is read.
+
+    """
+
+    def __init__(
+        self,
+        file_path: ZarrSourceType,
+        short_name: str | None = None,
+        config_file: str | None = None,
+    ):
+        """The `file_path` can be the path to a Zarr store directory, or to the
+        `.zmetadata` file within it. Alternatively, the already parsed content
+        of a `.zmetadata` object, such as one retrieved from a remote store,
+        can be supplied as a dictionary.
+
+        """
+        super().__init__(file_path, short_name=short_name, config_file=config_file)
+
+    def _read_dataset(self, file_path: ZarrSourceType):
+        """Set the dataset to the consolidated metadata of the Zarr store,
+        which maps the path of every `.zgroup`, `.zarray` and `.zattrs` object
+        in the store to its parsed JSON content. The `.zmetadata` file is read
+        with a single JSON parse.
+
+        """
+        if isinstance(file_path, (str, PathLike)):
+            store_description = str(file_path)
+
+            if isdir(file_path):
+                file_path = join(file_path, '.zmetadata')
+
+            if not exists(file_path):
+                raise MissingZarrMetadataError(file_path)
+
+            with open(file_path, 'r', encoding='utf-8') as file_handler:
+                consolidated_metadata = json.load(file_handler)
+        else:
+            store_description = 'in-memory consolidated metadata'
+            consolidated_metadata = file_path
+
+        if not isinstance(consolidated_metadata.get('metadata'), dict):
+            raise MissingZarrMetadataError(store_description)
+
+        self.dataset = consolidated_metadata['metadata']
+
+    def _set_short_name(self):
+        """Iterate through all suggested locations for the collection short
+        name, as listed in the configuration file. For each location, check
+        the `.zattrs` of the corresponding group or array in the consolidated
+        metadata for that attribute and, if found, retrieve its value.
+
+        """
+        self.short_name = next(
+            (
+                short_name
+                for short_name in map(
+                    partial(get_full_path_zarr_attribute, self.dataset),
+                    self.var_info_config.get('CollectionShortNamePath', []),
+                )
+                if short_name is not None
+            ),
+            None,
+        )
+
+    def _extract_variables(self):
+        """Create an instance of the `GroupFromZarr` class for each group in
+        the consolidated metadata, and of the `VariableFromZarr` class for
+        each array. The size of each dimension is recorded from the shape of
+        the arrays referring to it.
+
+        """
+        for container in get_zarr_containers(
+            self.dataset, self.cf_config, self.namespace
+        ):
+            if isinstance(container, GroupFromZarr):
+                self.groups[container.full_name_path] = container
+            else:
+                for index, dimensions_name in enumerate(container.dimensions):
+                    self.all_dimensions_sizes[dimensions_name] = container.shape[index]
+
+                self._assign_variable(container)
+
+
+def get_zarr_containers(
+    zarr_metadata: dict[str, Any],
+    cf_config: CFConfig,
+    namespace: str | None,
+) -> Iterator[GroupFromZarr | VariableFromZarr]:
+    """Yield a `GroupFromZarr` instance for each group in the consolidated
+    metadata of a Zarr store, each followed by a `VariableFromZarr` instance
+    for every array in that group. Groups are yielded in depth-first order,
+    beginning with the root group, and arrays are sorted by name, so that the
+    order does not depend on how the store was listed when its metadata was
+    consolidated. A group containing arrays, but without its own `.zgroup`
+    object, is still included.
+
+    """
+    group_paths = {''}
+    group_arrays: dict[str, list[str]] = {}
+
+    for metadata_key in sorted(zarr_metadata):
+        node_path, _, object_name = metadata_key.rpartition('/')
+
+        if object_name == '.zgroup':
+            group_paths.add(node_path)
+        elif object_name == '.zarray':
+            group_path, _, array_name = node_path.rpartition('/')
+            group_paths.add(group_path)
+            group_arrays.setdefault(group_path, []).append(array_name)
+
+    for group_path in sorted(group_paths, key=lambda path: path.split('/')):
+        array_names = group_arrays.get(group_path, [])
+
+        yield GroupFromZarr(
+            {
+                'attributes': get_zarr_attributes(zarr_metadata, group_path),
+                'variables': array_names,
+            },
+            cf_config,
+            namespace=namespace,
+            full_name_path=f'/{group_path}',
+        )
+
+        for array_name in array_names:
+            array_path = '/'.join([group_path, array_name]).lstrip('/')
+
+            yield VariableFromZarr(
+                {
+                    'zarray': zarr_metadata[f'{array_path}/.zarray'],
+                    'attributes': get_zarr_attributes(zarr_metadata, array_path),
+                },
+                cf_config,
+                namespace=namespace,
+                full_name_path=f'/{array_path}',
+            )
+
+
+def get_zarr_attributes(zarr_metadata: dict[str, Any], node_path: str) -> dict:
+    """Retrieve the parsed `.zattrs` of a group or array from the consolidated
+    metadata of a Zarr store. A group or array without attributes may not
+    have a `.zattrs` object.
+
+    """
+    return zarr_metadata.get('/'.join([node_path, '.zattrs']).lstrip('/'), {})
+
+
+def open_netcdf4_source(file_path: NetCDF4SourceType) -> tuple[Dataset | Group, bool]:
+    """Open a NetCDF-4 source as a `netCDF4.Dataset`, returning the dataset,
+    and whether it was opened by this function, in which case the caller is
+    responsible for closing it. A path is opened directly, while a bytes-like
+    object (including a `memoryview` or an `mmap.mmap` instance) is opened
+    using the in-memory mode of `netCDF4.Dataset`. The content of a binary
+    file-like object is first read into memory. Any other source is assumed to
+    be an open `netCDF4.Dataset` or `netCDF4.Group`, and is returned as-is.
+
+    """
+    if isinstance(file_path, (str, PathLike)):
+        dataset, owns_dataset = Dataset(file_path, 'r'), True
+    elif isinstance(file_path, (bytes, bytearray, memoryview, mmap)):
+        dataset, owns_dataset = Dataset('in-memory.nc4', 'r', memory=file_path), True
+    elif is_binary_file_object(file_path):
+        dataset = Dataset('in-memory.nc4', 'r', memory=file_path.read())
+        owns_dataset = True
+    else:
+        dataset, owns_dataset = file_path, False
+
+    return dataset, owns_dataset
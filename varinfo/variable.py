@@ -1,5 +1,5 @@
 """This module contains classes designed to read information from an OPeNDAP
-DMR or NetCDF-4 file. These classes will group the input into science
+DMR, NetCDF-4 file or Zarr store. These classes will group the input into science
 variables, metadata, coordinates, dimensions and ancillary data sets.
 
 """
@@ -12,17 +12,19 @@ import re
 import xml.etree.ElementTree as ET
 
 from netCDF4 import Variable as NetCDF4Variable
+import numpy as np
 
 from varinfo.attribute_container import (
     AttributeContainerBase,
     AttributeContainerFromDmr,
     AttributeContainerFromNetCDF4,
+    AttributeContainerFromZarr,
 )
 from varinfo.cf_config import CFConfig
-from varinfo.utilities import CF_REFERENCE_ATTRIBUTES
+from varinfo.utilities import CF_REFERENCE_ATTRIBUTES, get_dmr_element_type
 
 
-InputVariableType = Union[ET.Element, NetCDF4Variable]
+InputVariableType = Union[ET.Element, NetCDF4Variable, dict]
 
 
 class VariableBase(AttributeContainerBase):
@@ -103,7 +105,7 @@ class VariableBase(AttributeContainerBase):
 
         if valid_min is None:
             valid_range = self.attributes.get('valid_range')
-            if isinstance(valid_range, list) and len(valid_range) == 2:
+            if isinstance(valid_range, (list, np.ndarray)) and len(valid_range) == 2:
                 valid_min = valid_range[0]
 
         return valid_min
@@ -122,7 +124,7 @@ class VariableBase(AttributeContainerBase):
 
         if valid_max is None:
             valid_range = self.attributes.get('valid_range')
-            if isinstance(valid_range, list) and len(valid_range) == 2:
+            if isinstance(valid_range, (list, np.ndarray)) and len(valid_range) == 2:
                 valid_max = valid_range[1]
 
         return valid_max
@@ -371,40 +373,66 @@ class VariableFromDmr(VariableBase, AttributeContainerFromDmr):
         namespace: str,
         full_name_path: str,
         all_dimensions_sizes: dict[str, int],
+        lazy_attributes: bool = True,
     ):
+        """If `lazy_attributes` is set, metadata attributes other than those
+        referring to other variables are only decoded when first requested.
+        This requires the variable element to remain unchanged after
+        instantiation.
+
+        """
         self.all_dimensions_sizes = all_dimensions_sizes
+        self.lazy_attributes = lazy_attributes
         super().__init__(element, cf_config, namespace, full_name_path)
 
     def _get_data_type(self, variable: ET.Element) -> str:
         """Extract a string representation of the variable data type."""
-        return variable.tag.lstrip(self.namespace).lower()
-
-    def _get_shape(self, variable: ET.Element) -> tuple[int]:
-        """Extract the shape of the variable data array. First explore
-        XML for - DIM child elements with a size
-        attribute - true for HDF5 files and anonymous dimensions
-        (note no name). If found (with or without names), use them. If
-        not found, use all_dimensions_sizes dictionary with matching dimension
-        names to define the variable shape. Note the all_dimensions_sizes
-        dictionary is filled when parsing xml for variables, capturing
-        dimensions names and sizes for dimension entries - as found in
-        NetCDF files with named dimensions.
-        """
+        return get_dmr_element_type(variable, self.namespace).lower()
 
-        # Retrieve the shape from the dimension size in the
-        # <Dim size=xx/> element.
-        shape = [
-            int(dim_size.attrib['size'])
-            for dim_size in variable.findall(f'.//{self.namespace}Dim[@size]')
-        ]
+    def resolve_shape(self, dimensions_element: ET.Element):
+        """Set the shape of the variable again from the `Dim` children of the
+        supplied element, using the current `all_dimensions_sizes`. This is
+        used by `VarInfoFromDmr` once all `Dimension` elements of the `.dmr`
+        have been recorded, for variables referring to a `Dimension` declared
+        later in the document than the variable itself.
+
+        """
+        self.shape = self._get_shape(dimensions_element)
+
+    def _get_shape(self, variable: ET.Element) -> list[int]:
+        """Extract the shape of the variable data array, in a single ordered
+        pass through the direct `Dim` child elements of the variable. Each
+        dimension is resolved either from the `size` attribute of the `Dim`
+        element (true for HDF5 files and anonymous dimensions), or from the
+        `all_dimensions_sizes` dictionary, using the fully qualified name of
+        the `Dim` element. The `all_dimensions_sizes` dictionary is filled
+        from the `Dimension` elements of the `.dmr`, as found in NetCDF files
+        with named dimensions. Dimensions that cannot be resolved are omitted.
 
-        # Retrieve the shape from dimension size in the
-        # <Dimension size=xx/> element
-        if len(shape) != len(self.dimensions):
-            for dim_name in self.dimensions:
-                if dim_name in self.all_dimensions_sizes:
-                    index = self.dimensions.index(dim_name)
-                    shape.insert(index, self.all_dimensions_sizes[dim_name])
+        """
+        dimensions = variable.findall(f'{self.namespace}Dim')
+        qualified_names = iter(
+            self._qualify_references(
+                [
+                    dimension.get('name')
+                    for dimension in dimensions
+                    if dimension.get('name') is not None
+                ]
+            )
+        )
+        shape = []
+
+        for dimension in dimensions:
+            dimension_size = dimension.get('size')
+
+            if dimension.get('name') is not None:
+                qualified_name = next(qualified_names)
+
+                if dimension_size is None:
+                    dimension_size = self.all_dimensions_sizes.get(qualified_name)
+
+            if dimension_size is not None:
+                shape.append(int(dimension_size))
 
         return shape
 
@@ -437,3 +465,29 @@ class VariableFromNetCDF4(VariableBase, AttributeContainerFromNetCDF4):
 
         """
         return list(variable.dimensions)
+
+
+class VariableFromZarr(VariableBase, AttributeContainerFromZarr):
+    """This child class inherits from the `VariableBase` class, and implements
+    the abstract methods assuming the variable source is an array from the
+    consolidated metadata of a Zarr store. The variable is a dictionary
+    containing the parsed `.zarray` under the "zarray" key, and the parsed
+    `.zattrs` under the "attributes" key.
+
+    """
+
+    def _get_data_type(self, variable: dict) -> str:
+        """Extract a string representation of the variable data type."""
+        return np.dtype(variable['zarray']['dtype']).name
+
+    def _get_shape(self, variable: dict) -> tuple[int]:
+        """Extract the shape of the variable data array."""
+        return tuple(variable['zarray']['shape'])
+
+    def _get_raw_dimensions(self, variable: dict) -> list[str]:
+        """Retrieve the dimension names as they are stored within the
+        "_ARRAY_DIMENSIONS" attribute of the array, which is the convention
+        used by `xarray` and other libraries writing Zarr stores.
+
+        """
+        return list(variable.get('attributes', {}).get('_ARRAY_DIMENSIONS', []))